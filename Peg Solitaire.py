@@ -11,7 +11,10 @@
 # Save - Allows you to save your moves as a text file
 # Reset - Resets the board to the starting state
 # Solve - Tries to automatically solve the game from where you left off
+# Hint - Suggests a move that keeps the game winnable
 # Undo(opt) - Undoes the last move you made
+# Redo(opt) - Makes the last move you undid again
+# Lines(opt) - Lists the moves you have tried from here to pick from
 # Help - Brings up this menu in case you forget
 # 
 # ### Moving Pegs
@@ -22,89 +25,37 @@
 
 # %%
 import sys
-import random
-from tkinter import *
-from tkinter import ttk
-from IPython.display import clear_output
+import re
 from pathlib import Path
+import threading
 import time
 import numpy as np
+from peg_solitaire import *
+from peg_solitaire import cli
 
 
-# %%
-class Peg:
-    """
-    A class that represents any of the possible coordinates on the board
-    
-    ...
-    
-    Attributes
-    ----------
-    peg_type : str
-        Describes what object is occcupying a specific coordinate.
-    form : str
-        Determines what is printed for each peg_type on the board.
-    free : bool
-        Determines whether or not a peg can land in this coordinate.
-    bin_id : int
-        Determines how are peg types represented when converted to binary.      
-    
+def clear_output(wait=False):
     """
-    def __init__(self, peg_type):
-        """
-        Constructs all attributes for the different objects a coordinate can
-        hold.
+    Clears the output of the notebook the game is running in. IPython is
+    only imported the first time this is called, and nothing is cleared
+    when it is not installed.
 
-        Parameters
-        ----------
-        peg_type : str
-            Describes what object is occcupying a specific coordinate.
-
-        Returns
-        -------
-        None.
-
-        """
-        self.peg_type = peg_type
-
-        if self.peg_type == "null" :
-            self.form = " "
-            self.free = False
-            self.bin_id = 0
-
-        elif self.peg_type == "empty":
-            self.form = "O"
-            self.free = True
-            self.bin_id = 0
-
-        elif self.peg_type =="peg":
-            self.form = "V"
-            self.free = False
-            self.bin_id = 1
-
-
-    def __repr__(self):
-        """
-        Makes the objects become represented by their form attribute.
-
-        Returns
-        -------
-        form : str
-            Determines what is printed for each peg_type on the board.
-        """
-        return self.form
+    Parameters
+    ----------
+    wait : bool, optional
+        Waits until there is new output before clearing. The default is
+        False.
 
-# %%
-#Creates objects to fill the board with.
-n = Peg("null")
-e = Peg("empty")
-p = Peg("peg")
+    Returns
+    -------
+    None.
 
-#Creates list to keep track of what cheats are on/off.
-ANY_DIST = 0
-UNDO_OPT = 1
-ALT_BOARD =2
-cheats = np.array([False,False,False])
+    """
+    try:
+        from IPython.display import clear_output as clear
+    except ImportError:
+        return
+    clear(wait=wait)
 
 # %%
 class Selected(Exception):
@@ -114,43 +65,6 @@ class Selected(Exception):
         
     """
 
-# %%
-def init_board():
-    """
-    Resets the board to  its initial state
-
-    Returns
-    -------
-    board : numpy.ndarray
-        Numpy array containing coordinates and peg classes
-
-    """
-
-    if cheats[ALT_BOARD] == True:
-        board = np.array([
-            ["  ","A", "B", "C", "D", "E", "F", "G"],
-            [ 1 ,  n ,  n ,  p ,  p ,  p ,  n ,  n ],
-            [ 2 ,  n ,  p ,  p ,  p ,  p ,  p ,  n ],
-            [ 3 ,  p ,  p ,  p ,  p ,  p ,  p ,  p ],
-            [ 4 ,  p ,  p ,  p ,  e ,  p ,  p ,  p ],
-            [ 5 ,  p ,  p ,  p ,  p ,  p ,  p ,  p ],
-            [ 6 ,  n ,  p ,  p ,  p ,  p ,  p ,  n ],
-            [ 7 ,  n ,  n ,  p ,  p ,  p ,  n ,  n ]
-            ])
-    else:
-        board = np.array([
-            ["  ","A", "B", "C", "D", "E", "F", "G"],
-            [ 1 ,  n ,  n ,  p ,  p ,  p ,  n ,  n ],
-            [ 2 ,  n ,  n ,  p ,  p ,  p ,  n ,  n ],
-            [ 3 ,  p ,  p ,  p ,  p ,  p ,  p ,  p ],
-            [ 4 ,  p ,  p ,  p ,  e ,  p ,  p ,  p ],
-            [ 5 ,  p ,  p ,  p ,  p ,  p ,  p ,  p ],
-            [ 6 ,  n ,  n ,  p ,  p ,  p ,  n ,  n ],
-            [ 7 ,  n ,  n ,  p ,  p ,  p ,  n ,  n ]
-            ])
-
-    return board
-
 # %%
 def show_board(board):
     """
@@ -166,9 +80,11 @@ def show_board(board):
     None.
 
     """
-    output = str(board[1:]).replace('[','').replace(']','').replace('"','')
-    print(*board[0],' ')
-    print('',output)
+    #Pads the row numbers so boards with more than nine rows line up.
+    width = len(str(len(board)-1))
+    print(' '*(width+1), *board[0][1:], ' ')
+    for row in board[1:]:
+        print('', str(row[0]).rjust(width), *row[1:])
 
 # %%
 def menu():
@@ -182,7 +98,7 @@ def menu():
     """
     #Resets the board,board records and kernel
     board = init_board()
-    board_rec= []
+    history = History()
 
     while True:
         clear_output()
@@ -202,19 +118,19 @@ def menu():
         print("")
 
         if menu_opt=="1":
-            play_game(board,board_rec)
+            play_game(board,history)
 
         elif menu_opt=="2":
-            load_sol(board,board_rec)
+            load_sol(board,history)
 
         elif menu_opt=="3":
             cheat_menu()
 
         elif menu_opt =="4":
-            adv_int(board,board_rec)
+            adv_int(board,history)
 
         elif menu_opt=="5":
-            auto_solve(board,board_rec)
+            auto_solve(board,history=history)
 
         elif menu_opt=="6":
             how_to(board)
@@ -228,7 +144,7 @@ choice")
             print("")
 
 # %%
-def play_game(board, board_rec, move_rec = []):
+def play_game(board, history, move_rec = []):
     """
     Initiates code that allows the user to manually play peg solitaire.
 
@@ -236,9 +152,8 @@ def play_game(board, board_rec, move_rec = []):
     ----------
     board : numpy.ndarray
         Numpy array containing coordinates and peg classes
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    history : History
+        The tree of moves made, used to undo and redo them.
 
     Returns
     -------
@@ -248,25 +163,28 @@ def play_game(board, board_rec, move_rec = []):
     clear_output(wait=True)
     show_board(board)
     time.sleep(.2)
+    layout = get_layout()
+
+    #Sets up the hints before the first one is asked for.
+    hint_cache(layout)
 
     while True:
         #Checks to see if winning condition is fulfilled.
-        if np.count_nonzero(board == p)==1 and board[4,4] == p :
+        if has_won(to_bits(board, layout), layout):
             print("Congratulations!! You won!!")
             time.sleep(.2)
             break
 
-        #Only keeps a record of previous board states if undo is on.
-        if cheats[UNDO_OPT] == True:
-            board_rec.append(np.copy(board))
-        
         #Calls functions to select pegs and move them.
         coords_to, coords_from, diff, tot_input = user_input(board,move_rec,
-                                                             board_rec)
+                                                             history)
+        before = to_bits(board, layout)
         movement(coords_to,coords_from,diff,board)
-        
-        #Keeps a record of all moves for the user to save.
+
+        #Keeps a record of all moves for the user to save, and the holes the
+        #move changed so it can be undone.
         move_rec.append(tot_input)
+        history.push(before ^ to_bits(board, layout))
 
         clear_output(wait=True)
         show_board(board)
@@ -287,14 +205,39 @@ returning to the menu? Y/N")).upper()
     if choice == "Y":
         time.sleep(1)
         save_file = input("Name save file:")
-        np.savetxt(save_file+'.txt',move_rec,fmt='%s')
-        print(f"{save_file}.txt saved")
+        save_moves(save_file, move_rec)
         menu()
     else:
         menu()
 
 
-def user_input(board, move_rec, board_rec):
+def save_moves(save_file, move_rec):
+    """
+    Saves the moves made, either as a text file with one move per line or,
+    if the name ends in .pga, as a game added to a binary archive.
+
+    Parameters
+    ----------
+    save_file : str
+        The name to save under.
+    move_rec : list
+        A list that keeps contains the coordinates of all successful moves
+        taken.
+
+    Returns
+    -------
+    None.
+
+    """
+    if save_file.endswith(".pga"):
+        game = save_game(save_file, move_rec)
+        print(f"Saved as game {game+1} of {save_file}")
+    else:
+        np.savetxt(save_file+'.txt',move_rec,fmt='%s')
+        print(f"{save_file}.txt saved")
+
+
+def user_input(board, move_rec, history):
     """
     Provides interface for user to input coordinates and calls the necessary
     functions to check the input is allowed.
@@ -306,9 +249,8 @@ def user_input(board, move_rec, board_rec):
     move_rec : list
         A list that keeps contains the coordinates of all successful moves
         taken.
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    history : History
+        The tree of moves made, used to undo and redo them.
 
     Returns
     -------
@@ -316,8 +258,8 @@ def user_input(board, move_rec, board_rec):
         An array containing the selected destination coordinates for a peg.
     coords_from : numpy.ndarray
         Array containing the coordinates for the selected peg to move
-    diff : list
-        Contains the distance between coords_from and coords_to.
+    diff : numpy.ndarray
+        The (row, column) distance between coords_from and coords_to.
     tot_input : str
         Provides the string coordinates inputted by the user to be recorded 
         for saving.
@@ -337,7 +279,7 @@ def user_input(board, move_rec, board_rec):
                             input_from = str(
                             input("What peg do you want to move?")).upper()
                             text_opts(input_from, False,board,
-                                      move_rec, board_rec)
+                                      move_rec, history)
                     except Selected:
                         print(f"{input_from} selected")
 
@@ -345,17 +287,14 @@ def user_input(board, move_rec, board_rec):
                     #user input is valid again.
                     input_to = str(
                         input("Where do you want to move the peg?")).upper()
-                    text_opts(input_to,True,board,move_rec,board_rec)
+                    text_opts(input_to,True,board,move_rec,history)
             except Selected:
                 #Converts the string coords into integers for indexing.
-                coords_from = np.array([
-                    np.where(board == int(input_from[1]))[0][0],
-                    np.where(board == input_from[0])[1][0]])
-                coords_to = np.array([
-                    np.where(board == int(input_to[1]))[0][0],
-                    np.where(board == input_to[0])[1][0]])
-
-            diff = (coords_to-coords_from)[coords_to-coords_from != 0]
+                layout = get_layout()
+                coords_from = np.array(layout.parse_hole(input_from))
+                coords_to = np.array(layout.parse_hole(input_to))
+
+            diff = coords_to-coords_from
             move_check(diff)
     except Selected:
         tot_input = input_from+input_to
@@ -363,7 +302,7 @@ def user_input(board, move_rec, board_rec):
     return coords_to, coords_from, diff, tot_input
 
 # %%
-def load_sol(board,board_rec):
+def load_sol(board,history):
     """
     Allows user to input a solution text file and carry out the moves provided.
     Once the moves have been undertaken, control is given to the user to keep
@@ -373,9 +312,8 @@ def load_sol(board,board_rec):
     ----------
     board : numpy.ndarray
         Numpy array containing coordinates and peg classes.
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    history : History
+        The tree of moves made, used to undo and redo them.
 
     Returns
     -------
@@ -384,7 +322,9 @@ def load_sol(board,board_rec):
     """
     file = input("What is the name of the soultion file?")
     try:
-        solution_arr = np.array([np.loadtxt(f'C:/Users/User/{file}.txt',
+        #Solution files are looked for next to the game.
+        base_dir = Path(__file__).resolve().parent
+        solution_arr = np.array([np.loadtxt(base_dir/f'{file}.txt',
                                            dtype = 'str', delimiter=',')])
     except:
         print(f"{file}.txt was not found")
@@ -400,12 +340,11 @@ def load_sol(board,board_rec):
         clear_output(wait=True)
         show_board(board)
         time.sleep(.2)
-        #Only keeps a record of previous board states if undo is on.
-        if cheats[UNDO_OPT] == True:
-            board_rec.append(np.copy(board))
 
         #Checks that each step has a pair of moves
-        if len(solution[i])!=4:
+        step = re.fullmatch(r"([A-Z][0-9]+)([A-Z][0-9]+)",
+                            solution[i].strip().upper())
+        if step is None:
             print(f"Step {i+1} was invalid")
             menu()
             print("")
@@ -414,8 +353,7 @@ def load_sol(board,board_rec):
             print("")
 
         
-        peg_from = (solution[i][0]+solution[i][1]).upper()
-        peg_to = (solution[i][2]+solution[i][3]).upper()
+        peg_from, peg_to = step.groups()
 
         #This block runs the to and from coordinates through the
         #peg check function, to verify inputs are correct.
@@ -442,13 +380,10 @@ def load_sol(board,board_rec):
                 pass
 
         #Converts the string coords into integers for indexing.
-        coords_from = np.array([
-            np.where(board == int(peg_from[1]))[0][0],
-            np.where(board == peg_from[0])[1][0]])
-        coords_to = np.array([
-            np.where(board == int(peg_to[1]))[0][0],
-            np.where(board == peg_to[0])[1][0]])
-        diff = (coords_to-coords_from)[coords_to-coords_from != 0]
+        layout = get_layout()
+        coords_from = np.array(layout.parse_hole(peg_from))
+        coords_to = np.array(layout.parse_hole(peg_to))
+        diff = coords_to-coords_from
         
         #Checks the movement between coordinates follows the rules.
         try:
@@ -461,10 +396,12 @@ def load_sol(board,board_rec):
                 menu()
 
         except Selected:
+            before = to_bits(board, layout)
             movement(coords_to,coords_from,diff, board)
+            history.push(before ^ to_bits(board, layout))
 
     #Allows the user to play from where the file ended.
-    play_game(board,board_rec,solution.tolist())
+    play_game(board,history,solution.tolist())
 
 # %%
 def cheat_menu():
@@ -476,7 +413,6 @@ def cheat_menu():
     None.
 
     """
-    
     while True:
         clear_output()
         print("||Cheat Menu||")
@@ -485,12 +421,20 @@ def cheat_menu():
         print(f"2-Undo - {cheats[UNDO_OPT]}")
         print(f"3-Alternate Board - {cheats[ALT_BOARD]}")
         print("4-Change what the pegs looks like")
-        print("5-Return to Main Menu")
+        print(f"5-Choose board - {selected_board()}")
+        print("6-Return to Main Menu")
         print("")
         cheat_opt = int(input("Select an option here:"))
 
-        if cheat_opt ==5:
+        if cheat_opt ==6:
             menu()
+        elif cheat_opt ==5:
+            print(*BOARDS, sep=", ")
+            choice = input("Which board do you want to play on? ").lower()
+            if choice in BOARDS:
+                select_board(choice)
+            else:
+                print(f"There is no board called {choice}")
         elif cheat_opt ==4:
             p.form = input("What character do you want the\
 peg to be displayed as? ")
@@ -500,14 +444,168 @@ peg to be displayed as? ")
             cheats[cheat_opt-1] = not cheats[cheat_opt-1]
             clear_output()
         else:
-            print("Invalid choice: please input a number from 1-5")
+            print("Invalid choice: please input a number from 1-6")
+
+# %%
+class Cell:
+    """
+    A class that keeps what a hole of the advanced interface is showing, so
+    Tk is only asked to change the holes that are actually different.
+
+    ...
+
+    Attributes
+    ----------
+    widget : ttk.Button
+        The button drawn for the hole.
+    shown : dict
+        The options the hole is currently drawn with, e.g. its image and
+        state.
+
+    """
+    def __init__(self, widget, **shown):
+        """
+        Wraps the widget of a hole, which is already drawn with the options
+        given.
+
+        Parameters
+        ----------
+        widget : ttk.Button
+            The button drawn for the hole.
+        **shown
+            The options the widget was made with.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.widget = widget
+        self.shown = shown
+
+    def config(self, **options):
+        """
+        Changes how the hole is drawn, passing on only the options that are
+        different to what it already shows.
+
+        Parameters
+        ----------
+        **options
+            The image and state to show, as for ttk.Button.config.
+
+        Returns
+        -------
+        None.
+
+        """
+        changed = {key: value for key, value in options.items()
+                   if key not in self.shown or self.shown[key] != value}
+        if changed:
+            self.shown.update(changed)
+            self.draw(changed)
+
+    def draw(self, changed):
+        """
+        Asks Tk to redraw the hole.
+
+        Parameters
+        ----------
+        changed : dict
+            The options that are different.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.widget.config(**changed)
+
+
+class CanvasCell(Cell):
+    """
+    A hole drawn as an image on a Canvas shared by the whole board, rather
+    than as a button of its own. Disabled holes are covered by a faded
+    rectangle and ignore clicks.
+
+    ...
+
+    Attributes
+    ----------
+    canvas : tkinter.Canvas
+        The canvas the board is drawn on.
+    item : int
+        The canvas item of the image.
+    cover : int
+        The canvas item shown over the hole while it is disabled.
+    command : function
+        Called when the hole is clicked while enabled.
+
+    """
+    def __init__(self, canvas, x, y, command, image, state):
+        """
+        Draws the hole on the canvas.
+
+        Parameters
+        ----------
+        canvas : tkinter.Canvas
+            The canvas the board is drawn on.
+        x : int
+            The left edge of the hole on the canvas.
+        y : int
+            The top edge of the hole on the canvas.
+        command : function
+            Called when the hole is clicked while enabled.
+        image : tkinter.PhotoImage
+            The image the hole starts with.
+        state : str
+            "enabled" or "disabled".
+
+        Returns
+        -------
+        None.
+
+        """
+        self.canvas = canvas
+        self.command = command
+        self.item = canvas.create_image(x, y, image=image, anchor="nw")
+        self.cover = canvas.create_rectangle(
+            x, y, x+image.width(), y+image.height(), fill="white",
+            stipple="gray50", outline="",
+            state="hidden" if state == "enabled" else "normal")
+        canvas.tag_bind(self.item, "<Button-1>", self.click)
+        super().__init__(canvas, image=image, state=state)
+
+    def draw(self, changed):
+        if "image" in changed:
+            self.canvas.itemconfigure(self.item, image=changed["image"])
+        if "state" in changed:
+            self.canvas.itemconfigure(
+                self.cover,
+                state="hidden" if changed["state"] == "enabled" else "normal")
+
+    def click(self, event=None):
+        """
+        Runs the command of the hole, unless it is disabled.
+
+        Parameters
+        ----------
+        event : tkinter.Event, optional
+            The click. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.shown["state"] == "enabled":
+            self.command()
 
 # %% [markdown]
 # # Preface for using GUI
 # #### To use the advanced interface it is important that the Photoimage file directories are altered for wherever you have stored the file
 
 # %%
-def adv_int(board,board_rec):
+def adv_int(board,history, canvas=None):
     """
     Constructs a graphical user interface(GUI) representation of the peg
     solitaire board.
@@ -516,15 +614,21 @@ def adv_int(board,board_rec):
     ----------
     board : numpy.ndarray
         Numpy array containing coordinates and peg classes.
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    history : History
+        The tree of moves made, used to undo and redo them.
+    canvas : bool, optional
+        Draws the board on a single Canvas instead of a button for each
+        hole. The default is None, which uses the canvas for boards with
+        more holes than the French board.
 
     Returns
     -------
     None.
 
     """
+    #Tkinter is only needed for the advanced interface.
+    from tkinter import Tk, Canvas, PhotoImage, StringVar, ttk, N, W, E, S
+
     #Creates external window
     root = Tk()
     root.title("Peg Solitaire")
@@ -537,7 +641,6 @@ def adv_int(board,board_rec):
     EMPTY_IMG = PhotoImage(file = base_dir/'sprites'/'empty.png')
     undo_img = PhotoImage(file = base_dir/'sprites'/'undo.png')
     reset_img  = PhotoImage(file = base_dir/'sprites'/'reset.png')
-    reset_img  = PhotoImage(file = base_dir/'sprites'/'reset.png')
     menu_img  = PhotoImage(file = base_dir/'sprites'/'menu.png')
 
     #Creates a frame and grid for buttons to be placed into.
@@ -547,54 +650,79 @@ def adv_int(board,board_rec):
     root.rowconfigure(0, weight=1)
     root.iconphoto(False,PEG_IMG)
 
-    buttons = [[],[],[],[],[],[],[]]
-    coords = []
     board = init_board()
-    board_rec.append(np.copy(board))
-
-    #Runs through the board and adds a button for each peg/empty in it.
-    #The buttons are all appended to the list 'Buttons' so they can be
-    #modified later on.
-    for i in range(7):
-        for j in range(7):
-            try:
-                if board[i+1,j+1] == p:
-                    space = ttk.Button(mainframe, image = PEG_IMG,
-                                       command=lambda i=i,j=j:
-                                           select(i,j,
-                                                  board,board_rec,
-                                                  buttons,coords))
-
-                    space.grid(column = j, row = i)
-                    buttons[i].append(space)
-
-                elif board[i+1,j+1] == e:
-                    space = ttk.Button(mainframe, image = EMPTY_IMG,
-                                       command=lambda i=i,j=j:
-                                           select(i,j,
-                                                  board,board_rec,
-                                                  buttons,coords))
-                    space.grid(column = j, row = i)
-                    space.config(state = 'disabled')
-                    buttons[i].append(space)
-
-                else:
-                    space = 0
-                    buttons[i].append(space)
-            except:
-                pass
-
-    #Creates and places buttons for the undo, reset and menu function.
+    size = len(board) - 1
+    buttons = [[] for i in range(size)]
+    coords = []
+    history.clear()
+    if canvas is None:
+        canvas = len(get_layout().holes) > len(get_layout("french").holes)
+    if canvas:
+        cell_size = PEG_IMG.width()
+        board_canvas = Canvas(mainframe, width=size*cell_size,
+                              height=size*cell_size, highlightthickness=0)
+        board_canvas.grid(column=0, row=0, columnspan=size, rowspan=size)
+
+    #Runs through the board and adds a cell for each peg/empty in it, either
+    #a button or an image on the canvas. The cells are all appended to the
+    #list 'Buttons' so they can be modified later on.
+    for i in range(size):
+        for j in range(size):
+            if board[i+1,j+1] == n:
+                buttons[i].append(0)
+                continue
+
+            image, state = ((PEG_IMG, "enabled") if board[i+1,j+1] == p
+                            else (EMPTY_IMG, "disabled"))
+            command = lambda i=i,j=j: select(i,j, board,history,
+                                             buttons,coords)
+            if canvas:
+                space = CanvasCell(board_canvas, j*cell_size, i*cell_size,
+                                   command, image, state)
+            else:
+                widget = ttk.Button(mainframe, image = image,
+                                    command=command)
+                widget.grid(column = j, row = i)
+                widget.config(state = state)
+                space = Cell(widget, image = image, state = state)
+            buttons[i].append(space)
+
+    #Creates and places buttons for the undo, redo, reset and menu function.
     undo_butt = ttk.Button(mainframe, image = undo_img, command=lambda:
-                           undo(board,coords,board_rec, buttons , vis =True))
-    undo_butt.grid(column = 7,row= 0, rowspan = 2)
+                           undo(board,coords,history, buttons , vis =True))
+    undo_butt.grid(column = size,row= 0, rowspan = 2)
 
     reset_butt = ttk.Button(mainframe, image = reset_img, command=lambda:
-                            reset_vis(board, board_rec,buttons,coords))
-    reset_butt.grid(column = 7,row= 2, rowspan = 2)
-
-    menu_butt = ttk.Button(mainframe, image = menu_img, command=root.destroy)
-    menu_butt.grid(column = 7,row=4, rowspan = 2)
+                            reset_vis(board, history,buttons,coords))
+    reset_butt.grid(column = size,row= 2, rowspan = 2)
+
+    #Solve and Hint run the solver in the background, with a line of text
+    #below the board to show how it is going.
+    controls = {"status": StringVar(root), "task": None, "after": None}
+    controls["solve"] = ttk.Button(mainframe, text = "Solve", command=lambda:
+                                   gui_solve(root, board, history, buttons,
+                                             coords, controls))
+    controls["solve"].grid(column = size, row = 7)
+    controls["hint"] = ttk.Button(mainframe, text = "Hint", command=lambda:
+                                  gui_solve(root, board, history, buttons,
+                                            coords, controls, hint=True))
+    controls["hint"].grid(column = size, row = 8)
+    status = ttk.Label(mainframe, textvariable = controls["status"])
+    status.grid(column = 0, row = max(size, 9), columnspan = size+1,
+                sticky = W)
+
+    def close():
+        stop_solve(root, board, buttons, controls)
+        root.destroy()
+
+    menu_butt = ttk.Button(mainframe, image = menu_img, command=close)
+    menu_butt.grid(column = size,row=4, rowspan = 2)
+    root.protocol("WM_DELETE_WINDOW", close)
+
+    redo_butt = ttk.Button(mainframe, text = "Redo", command=lambda:
+                           redo(board,coords,history, buttons , vis =True))
+    redo_butt.grid(column = size,row= 6)
+    controls["locked"] = [undo_butt, reset_butt, redo_butt, controls["hint"]]
 
     #Keeps the window active
     root.mainloop()
@@ -603,7 +731,7 @@ def adv_int(board,board_rec):
     menu()
 
 
-def select(i,j ,board, board_rec, buttons, coords):
+def select(i,j ,board, history, buttons, coords):
     """
     When a button is pressed this function highlights any potential moves,
     disables any immovable positions and returns the new board once pegs 
@@ -617,9 +745,8 @@ def select(i,j ,board, board_rec, buttons, coords):
         Index of column on the board.
     board : numpy.ndarray
         Numpy array containing coordinates and peg classes.
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    history : History
+        The tree of moves made, used to undo and redo them.
     buttons : list
         A list containing the identification and location of all buttons made.
     coords : list
@@ -638,14 +765,7 @@ def select(i,j ,board, board_rec, buttons, coords):
     # to deselect it and remove it from the move records.
     if len(coords)%2 == 0:
         if coords[-1] == coords[-2]:
-            for i in range(len(board)):
-                for j in range(len(board[i])):
-                    if board[i,j] == e:
-                        buttons[i-1][j-1].config(image = EMPTY_IMG,
-                                                 state="disabled")
-                    elif board[i,j] == p:
-                        buttons[i-1][j-1].config(image = PEG_IMG,
-                                                 state="enabled")
+            refresh_buttons(board, buttons)
             coords[:] = coords[:-2]
 
             return
@@ -656,48 +776,33 @@ def select(i,j ,board, board_rec, buttons, coords):
         coords_from = np.asarray(coords[-2])
         coords_to = np.asarray(coords[-1])
 
-        diff = (coords_to-coords_from)[coords_to-coords_from != 0]
+        diff = coords_to-coords_from
+        layout = get_layout()
+        before = to_bits(board, layout)
         movement(coords_to,coords_from,diff,board, buttons)
-        board_rec.append(np.copy(board))
-
-        #Enables all buttons on the board.
-        for butt_row in buttons:
-            for button in butt_row:
-                if button !=0:
-                    button.config(state="enabled")
+        history.push(before ^ to_bits(board, layout))
 
-        #Disables any buttons where there is no peg.
-        for i in range(len(board)):
-            for j in range(len(board[i])):
-                if board[i,j] == e:
-                    buttons[i-1][j-1].config(state="disabled")
+        #Enables the buttons of the pegs and disables the empty holes.
+        refresh_buttons(board, buttons)
 
     #Runs when a peg has been selected.
     else:
-        pos_moves = moves_left(board, find_move=True)
-
-        #Creates a list of all buttons which the selected peg can move to.
-        buttons_on = []
-        buttons_on.append(buttons[i][j])
-        for as_button in pos_moves:
-            button_from = buttons[as_button[0][0]-1][as_button[0][1]-1]
-            if button_from == buttons[i][j]:
-                buttons_on.append(buttons[as_button[1][0]-1]\
-                                  [as_button[1][1]-1])
-
-        #Enables only these locations and disables all other buttons.
-        for butt_row in buttons:
-            for button in butt_row:
-                if button in buttons_on:
-                    button.config(state="enabled")
-                elif button == 0:
-                    pass
-                else:
-
-                    button.config(state="disabled")
-
-
-def reset_vis(board, board_rec,buttons,coords):
+        layout = get_layout()
+        find = ray_moves_from if cheats[ANY_DIST] else moves_from
+        pos_moves = find(to_bits(board, layout), layout.bits[(i+1, j+1)],
+                         layout)
+
+        #Enables only the selected peg and the holes it can move to, and
+        #disables all other buttons.
+        holes_on = {(i+1, j+1)}
+        for move in pos_moves:
+            holes_on.add(layout.coords[move[-1]])
+        for row, col in layout.coords.values():
+            buttons[row-1][col-1].config(
+                state="enabled" if (row, col) in holes_on else "disabled")
+
+
+def reset_vis(board, history,buttons,coords):
     """
     Resets the visual element of the board for the advanced user interface.
 
@@ -705,9 +810,8 @@ def reset_vis(board, board_rec,buttons,coords):
     ----------
     board : numpy.ndarray
         Numpy array containing coordinates and peg classes.
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    history : History
+        The tree of moves made, used to undo and redo them.
     buttons : list
         A list containing the identification and location of all buttons made.
     coords : list
@@ -719,127 +823,373 @@ def reset_vis(board, board_rec,buttons,coords):
 
     """
     board[:,:] = init_board()
-    board_rec[:] = []
+    history.clear()
     coords[:] = []
     
     #Resets the buttons to their original state.
-    for i in range(len(board)):
-        for j in range(len(board[i])):
-            if board[i,j] == e:
-                buttons[i-1][j-1].config(image = EMPTY_IMG, state="disabled")
-            elif board[i,j] == p:
-
-                buttons[i-1][j-1].config(image = PEG_IMG, state="enabled")
+    refresh_buttons(board, buttons)
 
 # %%
-def auto_solve(board, move_rec =[]):
+class SolveTask:
+    """
+    A class that runs the solver in a worker thread for the advanced
+    interface, so the window keeps responding during long searches. The
+    thread only stores its progress and result, which the window reads by
+    polling with root.after, as Tk can only be used from its own thread.
+
+    ...
+
+    Attributes
+    ----------
+    bits : int
+        Integer representing the position being solved.
+    layout : Layout
+        The bit mapping for the board.
+    progress : dict
+        The counters of the search the last time it reported, or None.
+    result : tuple
+        The status, moves and counters returned by dfs_solve once the search
+        has finished, or None.
+    cancelled : threading.Event
+        Set to stop the search.
+    thread : threading.Thread
+        The thread the search runs in.
+
+    """
+    def __init__(self, bits, layout):
+        """
+        Sets up a search from a position, without starting it.
+
+        Parameters
+        ----------
+        bits : int
+            Integer representing the position to solve.
+        layout : Layout
+            The bit mapping for the board.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.bits = bits
+        self.layout = layout
+        self.progress = None
+        self.result = None
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        """
+        Searches for a solution, stopping as soon as the search is cancelled.
+
+        Returns
+        -------
+        None.
+
+        """
+        def progress(stats):
+            self.progress = dict(stats)
+            return self.cancelled.is_set()
+
+        #The oracle and pruning only know positions reached by normal jumps.
+        any_dist = cheats[ANY_DIST]
+        oracle = None if any_dist else load_oracle(self.layout)
+        self.result = dfs_solve(self.bits, self.layout, order=MoveOrder(),
+                                oracle=oracle, prune=not any_dist,
+                                progress=progress, every=2048,
+                                any_dist=any_dist)
+
+    def start(self):
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def done(self):
+        return self.result is not None
+
+
+def gui_solve(root, board, history, buttons, coords, controls, hint=False):
     """
-    Runs through all potential moves, blacklisting any moves that lead to dead-
-    ends or boards that are symmetrically congruent to other deadends.
+    Starts a search from the board shown in the advanced interface, or
+    cancels the search or solution playback already running.
 
     Parameters
     ----------
+    root : tkinter.Tk
+        The window of the advanced interface.
     board : numpy.ndarray
-        A 2D array that stores information on each space on the boards status
-    move_rec : list, optional.
-        A list that keeps contains the coordinates of all successful moves
-        taken. The default is [].
+        Numpy array containing coordinates and peg classes.
+    history : History
+        The tree of moves made, used to undo and redo them.
+    buttons : list
+        A list containing the identification and location of all buttons made.
+    coords : list
+        A list of the coordinates of all successful moves.
+    controls : dict
+        The status text, the Solve and Hint buttons, the buttons locked while
+        solving, the running task and the playback timer of the window.
+    hint : bool, optional
+        Only shows the next move of the solution instead of playing it all.
+        The default is False.
 
     Returns
     -------
     None.
 
     """
-    #Creates an empty lists to store blacklisted moves and binary identifiers
-    #for deadend boards.
-    bad_moves = []
-    dead_ends = []
+    if stop_solve(root, board, buttons, controls):
+        return
 
-    #Empty list to store all successful board states and appends the starting
-    #board.
-    board_rec = []
-    board_rec.append(np.copy(board))
+    #A half chosen move is forgotten, and the board is locked while the
+    #search runs so the position cannot change under it.
+    if len(coords)%2 == 1:
+        coords[:] = coords[:-1]
+    layout = get_layout()
+    for row, col in layout.coords.values():
+        buttons[row-1][col-1].config(state="disabled")
+
+    task = SolveTask(to_bits(board, layout), layout)
+    controls["task"] = task
+    controls["solve"].config(text="Cancel")
+    for button in controls["locked"]:
+        button.config(state="disabled")
+    controls["status"].set("Searching...")
+    task.start()
+    root.after(100, poll_solve, root, board, history, buttons, coords,
+               controls, hint)
+
+
+def stop_solve(root, board, buttons, controls):
+    """
+    Cancels the search or solution playback of the advanced interface, if
+    one is running, and unlocks the board.
 
-    while True:
-        #Checks first if the boards has satisfied winning conditions.
-        if np.count_nonzero(board == p)==1 and board[4,4] == p :
-            for i in range(len(board_rec)):
-                clear_output(wait = True)
-                print("Solution found:")
-                show_board(board_rec[i])
-                time.sleep(.5)
-            break
+    Parameters
+    ----------
+    root : tkinter.Tk
+        The window of the advanced interface.
+    board : numpy.ndarray
+        Numpy array containing coordinates and peg classes.
+    buttons : list
+        A list containing the identification and location of all buttons made.
+    controls : dict
+        The status text, the Solve and Hint buttons, the buttons locked while
+        solving, the running task and the playback timer of the window.
 
-        #This block converts the board into a binary sequence for each
-        #potential orientation and reflection to account for all symmetrical
-        # boards which would also lead to deadends.
-        bin_boards = gen_boards(board)
-        for binary in range(len(bin_boards)):
-            if bin_boards[binary] in dead_ends:
-                bad_moves.append([len(board_rec)-1,move_rec[-1]])
-                undo(board,move_rec,board_rec)
-
-        #This block sorts through the list of bad_moves and removes any moves
-        #that are now inaccessible due to an earlier board being blacklisted.
-        if len(bad_moves)>1:
-            board_num=[]
-
-            for i in bad_moves:
-                board_num.append(i[0])
-            while board_num != sorted(board_num):
-                board_num=[]
-                before = [0]
-                for i in bad_moves:
-                    board_num.append(i[0])
-                    if before[0]>i[0]:
-                        bad_moves.remove(before)
-                    before = i
-
-        pos_moves = moves_left(board,find_move = True)#Finds all potential moves.
-
-        #This block removes any moves from the possible moves generated that
-        #have already been blacklisted by bad_moves.
-        to_remove = []
-        for move in range(len(pos_moves)):
-            if [len(board_rec),pos_moves[move]] in bad_moves:
-                to_remove.append(pos_moves[move])
-        for remove in to_remove:
-            pos_moves.remove(remove)
-
-        #If there are still moves that can be made, the code will then execute
-        #necessary functions to modify the board accordingly and recorde the
-        #new state of the board
-        if len(pos_moves) !=0:
-
-            next_move = random.choice(pos_moves)
-            move_rec.append(next_move)
-            coords_from  =np.asarray(next_move[0])
-            coords_to = np.asarray(next_move[1])
-
-            diff = (coords_to-coords_from)[coords_to-coords_from != 0]
-            movement(coords_to,coords_from,diff,board)
-            board_rec.append(np.copy(board))
-
-        #If there are no moves left at all then the program tells the user so.
-        #This is used for if auto_solve() is called mid game as there will be
-        #solutions otherwise.
-        elif len(pos_moves) ==0 and len(board_rec)<2:
-            print("No possible solution")
-            break
-        #If there are no possible moves for this board state, the move to reach
-        #this board and the boards binary identifier are blacklisted and the
-        #board is reverted to the previous step.
-        else:
-            bad_moves.append([len(board_rec)-1,move_rec[-1]])
-            undo(board,move_rec,board_rec)
-            dead_ends.append(min(bin_boards))
-    play_game(board, board_rec, move_rec)
+    Returns
+    -------
+    stopped : bool
+        True if something was running.
+
+    """
+    stopped = False
+    if controls["task"] is not None:
+        controls["task"].cancel()
+        controls["task"] = None
+        stopped = True
+    if controls["after"] is not None:
+        root.after_cancel(controls["after"])
+        controls["after"] = None
+        stopped = True
+    if stopped:
+        controls["status"].set("Search stopped")
+        finish_solve(board, buttons, controls)
+    return stopped
+
+
+def finish_solve(board, buttons, controls):
+    """
+    Puts the controls of the advanced interface back once a search or
+    playback is over.
+
+    Parameters
+    ----------
+    board : numpy.ndarray
+        Numpy array containing coordinates and peg classes.
+    buttons : list
+        A list containing the identification and location of all buttons made.
+    controls : dict
+        The status text, the Solve and Hint buttons, the buttons locked while
+        solving, the running task and the playback timer of the window.
+
+    Returns
+    -------
+    None.
+
+    """
+    controls["solve"].config(text="Solve")
+    for button in controls["locked"]:
+        button.config(state="enabled")
+    refresh_buttons(board, buttons)
+
+
+def poll_solve(root, board, history, buttons, coords, controls, hint):
+    """
+    Checks on the search running in the worker thread, showing how it is
+    going until it finishes, then shows the hint or plays the solution.
+
+    Parameters
+    ----------
+    root : tkinter.Tk
+        The window of the advanced interface.
+    board : numpy.ndarray
+        Numpy array containing coordinates and peg classes.
+    history : History
+        The tree of moves made, used to undo and redo them.
+    buttons : list
+        A list containing the identification and location of all buttons made.
+    coords : list
+        A list of the coordinates of all successful moves.
+    controls : dict
+        The status text, the Solve and Hint buttons, the buttons locked while
+        solving, the running task and the playback timer of the window.
+    hint : bool
+        Only shows the next move of the solution.
+
+    Returns
+    -------
+    None.
+
+    """
+    task = controls["task"]
+    #The search was cancelled, or replaced by a new one.
+    if task is None:
+        return
+    if not task.done():
+        if task.progress is not None:
+            controls["status"].set(
+                f"Searched {task.progress['nodes']:,} positions, "
+                f"{task.progress['nps']:,.0f} per second")
+        root.after(100, poll_solve, root, board, history, buttons, coords,
+                   controls, hint)
+        return
+
+    controls["task"] = None
+    status, moves, stats = task.result
+    if status != "solved":
+        controls["status"].set("No possible solution from here")
+        finish_solve(board, buttons, controls)
+    elif not moves:
+        controls["status"].set("The game is already won")
+        finish_solve(board, buttons, controls)
+    elif hint:
+        #Highlights only the peg to move and where it goes.
+        frm, to = moves[0][0], moves[0][-1]
+        controls["status"].set(
+            f"Hint: {move_text(moves[0], task.layout).upper()}")
+        finish_solve(board, buttons, controls)
+        for bit, (row, col) in task.layout.coords.items():
+            buttons[row-1][col-1].config(
+                state="enabled" if bit in (frm, to) else "disabled")
+    else:
+        controls["status"].set(f"Solution found, {len(moves)} moves")
+        play_solution(root, board, history, buttons, coords, controls,
+                      moves, task.layout)
+
+
+def play_solution(root, board, history, buttons, coords, controls, moves,
+                  layout, delay=300):
+    """
+    Animates a solution one move at a time, leaving the window responsive
+    between moves.
+
+    Parameters
+    ----------
+    root : tkinter.Tk
+        The window of the advanced interface.
+    board : numpy.ndarray
+        Numpy array containing coordinates and peg classes.
+    history : History
+        The tree of moves made, which the moves are added to.
+    buttons : list
+        A list containing the identification and location of all buttons made.
+    coords : list
+        A list of the coordinates of all successful moves.
+    controls : dict
+        The status text, the Solve and Hint buttons, the buttons locked while
+        solving, the running task and the playback timer of the window.
+    moves : list
+        The bit indexes of the moves left to play, starting hole first and
+        landing hole last.
+    layout : Layout
+        The bit mapping for the board.
+    delay : int, optional
+        Milliseconds between moves. The default is 300.
+
+    Returns
+    -------
+    None.
+
+    """
+    if not moves:
+        controls["after"] = None
+        finish_solve(board, buttons, controls)
+        return
+
+    coords_from = np.asarray(layout.coords[moves[0][0]])
+    coords_to = np.asarray(layout.coords[moves[0][-1]])
+    before = to_bits(board, layout)
+    movement(coords_to, coords_from, coords_to-coords_from, board, buttons)
+    record_move(before, apply_ray(0, moves[0]), layout, coords, vis = True)
+    history.push(apply_ray(0, moves[0]))
+    controls["after"] = root.after(delay, play_solution, root, board,
+                                   history, buttons, coords, controls,
+                                   moves[1:], layout, delay)
+
+# %%
+#What hints without an oracle have found, kept for each board and setting
+#of the any distance cheat so later hints are quicker: the dead-ends, the
+#positions on solutions found, the move ordering tables and the positions
+#with few pegs that can be won.
+HINT_TABLES = {}
 
 
-def gen_boards(board):
+def hint_cache(layout):
     """
-    Generates a lsit of eight binary strings representing the current board
-    from all possible rotations and reflections.
+    Finds what earlier hints found on the current board and setting of the
+    any distance cheat, setting it up the first time so the first hint does
+    not have to build the tables its searches use.
+
+    Parameters
+    ----------
+    layout : Layout
+        The bit mapping for the current board.
+
+    Returns
+    -------
+    cache : dict
+        The dead-end table, move ordering, positions known to be winnable
+        and frontier of positions with few pegs that move_hints is given.
+
+    """
+    key = (selected_board(), cheats[ANY_DIST])
+    if key not in HINT_TABLES:
+        order = MoveOrder()
+        order.tables(layout)
+
+        #The frontier only holds the peg counts that are quick to find, and
+        #is not needed if the oracle answers everything.
+        frontier = None
+        if not cheats[ANY_DIST]:
+            prune_rules(layout)
+            if max(layout.holes) < 64 and load_oracle(layout) is None:
+                frontier = GoalFrontier(layout, max_states=2**13)
+                frontier.extend(len(layout.holes))
+        HINT_TABLES[key] = {"table": TransTable(8), "order": order,
+                            "wins": set(), "frontier": frontier}
+    return HINT_TABLES[key]
+
+
+def hint(board):
+    """
+    Suggests a move that keeps the game winnable, or says the game is lost,
+    and lists whether every legal move keeps the game winnable. With the
+    oracle it also says how many of the moves after it keep the game
+    winnable. Without it, moves are looked up among what earlier hints found
+    and the positions with few pegs found back from the goal, and are
+    otherwise searched briefly, so early in a game most are unknown.
 
     Parameters
     ----------
@@ -848,32 +1198,135 @@ def gen_boards(board):
 
     Returns
     -------
-    binary : list
-        A list containing binary strings representing the board from all
-        rotations and reflections.
+    None.
 
     """
-    binary = []#Create empty list to store all the binary identifiers.
-    boards = [board[1:,1:]]#Creates list to store all versions of the board.
+    layout = get_layout()
+    bits = to_bits(board, layout)
+
+    #The oracle only knows positions reached by normal jumps.
+    oracle = None if cheats[ANY_DIST] else load_oracle(layout)
+    cache = hint_cache(layout)
+    hints = move_hints(bits, layout, oracle, cache["table"],
+                       any_dist=cheats[ANY_DIST], order=cache["order"],
+                       wins=cache["wins"], frontier=cache["frontier"])
+
+    if not hints:
+        print("There are no moves left")
+        return
+    if hints[0]["winnable"] == True:
+        print(f"Hint: {move_text(hints[0]['move'], layout).upper()}")
+    elif hints[0]["winnable"] == False:
+        print("This position can no longer be won")
+    else:
+        print("It is unknown which moves win, as none was found in time")
+
+    for entry in hints:
+        text = move_text(entry["move"], layout).upper()
+        if entry["winnable"] == False:
+            print(f"{text} - loses")
+        elif entry["winnable"] is None:
+            print(f"{text} - unknown, not searched to the end in time")
+        elif entry["continuations"] is None:
+            print(f"{text} - winnable")
+        else:
+            print(f"{text} - winnable, {entry['continuations']} winning "
+                  f"moves after it")
 
-    #This loop appends numpy arrays of the same board in different rotations
-    #and reflections
-    for i in range(6):
-        if i ==3:
-            boards.append(np.flip(boards[0], axis=1))
-        boards.append(np.rot90(boards[-1]))
+# %%
+def auto_solve(board, move_rec =[], table=None, history=None, beam=None,
+               weights=None, progress=None, every=50000):
+    """
+    Searches the most promising moves first with dfs_solve, blacklisting any
+    boards that lead to dead-ends or are symmetrically congruent to other
+    deadends, then replays the solution found.
+
+    Parameters
+    ----------
+    board : numpy.ndarray
+        A 2D array that stores information on each space on the boards status
+    move_rec : list, optional.
+        A list that keeps contains the coordinates of all successful moves
+        taken. The default is [].
+    table : TransTable, optional
+        Table used to store dead-ends. The default is None, which creates a
+        new table.
+    history : History, optional
+        The tree of moves made, which the moves of the solution are added to.
+        The default is None, which starts a new one.
+    beam : int, optional
+        If given, searches with beam_solve keeping this many positions at
+        each depth instead, which is quicker but can miss a solution. It is
+        not used with the any distance cheat. The default is None.
+    weights : dict, optional
+        Weights of the move scores, see MoveOrder. The default is None.
+    progress : function, optional
+        Called as progress(stats) every so many positions searched, and
+        stops the search if it returns True. The default is None, which
+        prints how the search is going.
+    every : int, optional
+        Number of positions searched between calls to progress. The default
+        is 50000.
+
+    Returns
+    -------
+    None.
 
-    #This loop converts each of the boards into binary by accessing each pegs
-    #attribute labelling it in binary.
-    for board in boards:
-        new_bin = []
-        list_board = np.concatenate((board))
-        for i in list_board:
-            new_bin.append(str(getattr(i,"bin_id")))
-        new_bin = "".join(new_bin)
-        binary.append(new_bin)
+    """
+    if history is None:
+        history = History()
+    layout = get_layout()
+    bits = to_bits(board, layout)
+    if progress is None:
+        def progress(stats):
+            print(f"Searched {stats['nodes']} positions, depth "
+                  f"{stats['depth']} (deepest {stats['max_depth']}), "
+                  f"{stats['nps']:,.0f} per second")
+
+    #The oracle and pruning only know positions reached by normal jumps,
+    #and the beam search only makes normal jumps.
+    any_dist = cheats[ANY_DIST]
+    oracle = None if any_dist else load_oracle(layout)
+    order = MoveOrder(weights)
+    if beam is not None and not any_dist:
+        status, moves, stats = beam_solve(bits, layout, width=beam,
+                                          order=order)
+    else:
+        status, moves, stats = dfs_solve(bits, layout, order=order,
+                                         table=table, oracle=oracle,
+                                         prune=not any_dist,
+                                         progress=progress, every=every,
+                                         any_dist=any_dist)
+
+    #If the search ran out of moves to try, there is no solution from here.
+    #A beam search only gives up on the positions it kept.
+    if status != "solved":
+        print({"limit": "No solution found",
+               "stopped": "Search stopped"}.get(status,
+                                                "No possible solution"))
+        print(format_stats(stats))
+        time.sleep(1)
+        play_game(board, history, move_rec)
+        return
 
-    return binary
+    #Replays the solution one board at a time, recording each move so it can
+    #be undone afterwards.
+    for move in moves:
+        clear_output(wait = True)
+        print("Solution found:")
+        show_board(board)
+        time.sleep(.5)
+        move_rec.append(move_text(move, layout).upper())
+        history.push(apply_ray(0, move))
+        flip_cells(board, apply_ray(0, move), layout)
+    clear_output(wait = True)
+    print("Solution found:")
+    show_board(board)
+    print(format_stats(stats))
+    time.sleep(1)
+
+    #Hands the final position back to the array based game.
+    play_game(board, history, move_rec)
 
 # %%
 def how_to(board):
@@ -891,22 +1344,14 @@ def how_to(board):
 
     """
     clear_output()
-    goal = np.array([
-                ["  ","A", "B", "C", "D", "E", "F", "G"],
-                [ 1 ,  n ,  n ,  e ,  e ,  e ,  n ,  n ],
-                [ 2 ,  n ,  n ,  e ,  e ,  e ,  n ,  n ],
-                [ 3 ,  e ,  e ,  e ,  e ,  e ,  e ,  e ],
-                [ 4 ,  e ,  e ,  e ,  p ,  e ,  e ,  e ],
-                [ 5 ,  e ,  e ,  e ,  e ,  e ,  e ,  e ],
-                [ 6 ,  n ,  n ,  e ,  e ,  e ,  n ,  n ],
-                [ 7 ,  n ,  n ,  e ,  e ,  e ,  n ,  n ]
-                ])
+    layout = get_layout()
+    goal = to_board(layout.goal, layout)
     print("==================RULES==================")
 
     print(f"In peg solitaire the goal is to move the pegs, {p.form}")
     print("around the board:")
     show_board(board)
-    print("Until there is one peg left in the middle:")
+    print("Until there is one peg left in the goal hole:")
     show_board(goal)
     print("Pegs can only be moved by jumping over another peg and")
     print(f"into an empty space, {e.form}. The peg that is jumped over is")
@@ -937,12 +1382,15 @@ def help_menu():
     print("Save - Allows you to save your moves as a text file")
     print("Reset - Resets the board to the starting state")
     print("Solve - Tries to automatically solve the game from where you left off")
+    print("Hint - Suggests a move and says which moves can still win")
     print("Undo(opt) - Undoes the last move you made")
+    print("Redo(opt) - Makes the last move you undid again")
+    print("Lines(opt) - Lists the moves you have tried from here to pick from")
     print("Help - Brings up this menu in case you forget")
     print("")
 
 # %%
-def text_opts(text,destination,board,move_rec, board_rec=[]):
+def text_opts(text,destination,board,move_rec, history=None):
     """
     Checks users input for any of the text based options available.
 
@@ -958,9 +1406,8 @@ def text_opts(text,destination,board,move_rec, board_rec=[]):
     move_rec : list
         A list that keeps contains the coordinates of all successful moves
         taken.
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    history : History
+        The tree of moves made, used to undo and redo them.
 
     Returns
     -------
@@ -973,21 +1420,43 @@ def text_opts(text,destination,board,move_rec, board_rec=[]):
     elif text == "SAVE":
         print("hey")
         save_file = input("Name save file:")
-        np.savetxt(save_file+'.txt',move_rec,fmt='%s')
-        print(f"{save_file}.txt saved")
+        save_moves(save_file, move_rec)
         return
 
     elif text == "RESET":
         board[:,:] = init_board()
+        if history is not None:
+            history.clear()
+        move_rec.clear()
         show_board(board)
         return
 
     elif text == "SOLVE":
-        auto_solve(board, move_rec)
+        auto_solve(board, move_rec, history=history)
+
+    elif text == "HINT":
+        hint(board)
+        return
 
     elif text == "UNDO":
         if cheats[UNDO_OPT] == True:
-            undo(board,move_rec,board_rec)
+            undo(board,move_rec,history)
+            show_board(board)
+            return
+
+        print("Undo is disabled, enable it via the cheats menu")
+
+    elif text == "REDO":
+        if cheats[UNDO_OPT] == True:
+            redo(board,move_rec,history)
+            show_board(board)
+            return
+
+        print("Undo is disabled, enable it via the cheats menu")
+
+    elif text == "LINES":
+        if cheats[UNDO_OPT] == True:
+            lines(board,move_rec,history)
             show_board(board)
             return
 
@@ -1026,23 +1495,23 @@ def peg_check(peg,destination,board):
     None.
 
     """
-    if len(peg)>2 or len(peg)<=1 :
-        print("Input must be 2 characters long. eg. A3,F6...")
+    size = len(board) - 1
+    if re.fullmatch(r"[A-Z][0-9]+", peg) is None:
+        print("Input must be a letter followed by a number. eg. A3,F6...")
         print("")
         return True
 
-    if ord(peg[0]) < 65 or 71 < ord(peg[0]):
-        print("First coordinate must be from A-G")
+    if ord(peg[0]) < 65 or 64+size < ord(peg[0]):
+        print(f"First coordinate must be from A-{chr(64+size)}")
         print("")
         return True
 
-    if ord(peg[1]) < 49 or 56 < ord(peg[1]):
-        print("Second coordinate must be between 1-7")
+    if int(peg[1:]) < 1 or size < int(peg[1:]):
+        print(f"Second coordinate must be between 1-{size}")
         print("")
         return  True
 
-    peg_obj = board[np.where(board == int(peg[1]))[0][0],
-                    np.where(board == peg[0])[1][0]]
+    peg_obj = board[int(peg[1:]), ord(peg[0])-64]
 
     #Checks to see if the peg check is for the start or end spot.
     if destination == True:
@@ -1068,8 +1537,8 @@ def move_check(diff):
 
     Parameters
     ----------
-    diff : list
-        Contains the distance between coords_from and coords_to.        
+    diff : numpy.ndarray
+        The (row, column) distance between coords_from and coords_to.
 
     Raises
     ------
@@ -1081,20 +1550,26 @@ def move_check(diff):
     None.
 
     """
-    #Makes sure the vector is 1-dimensional.
-    if len(diff) != 1: 
-        print("Pegs cannot move diagonally")
+    #Makes sure the peg moves along a line of holes.
+    length = max(abs(diff[0]), abs(diff[1]))
+    step = (diff[0]//length, diff[1]//length) if length else (0, 0)
+    if (step not in get_layout().steps or
+            (step[0]*length, step[1]*length) != tuple(diff)):
+        if get_layout().lattice == "square":
+            print("Pegs cannot move diagonally")
+        else:
+            print("Pegs must move along a line of holes")
         print("")
         return
 
 
     if cheats[ANY_DIST] == False:
 
-        if abs(diff[0]) > 2:
+        if length > 2:
             print("The peg can only jump over 1 peg at a time")
             return
 
-        if abs(diff[0]) < 2:
+        if length < 2:
             print("Pegs must jump over a peg to be moved")
             return
 
@@ -1114,8 +1589,8 @@ def movement(coords_to,coords_from,diff,board, buttons = 0):
         An array containing the selected destination coordinates for a peg.
     coords_from : numpy.ndarray
         Array containing the coordinates for the selected peg to move.
-    diff : list
-        Contains the distance between coords_from and coords_to. 
+    diff : numpy.ndarray
+        The (row, column) distance between coords_from and coords_to.
     board : numpy.ndarray
         Numpy array containing coordinates and peg classes.
     buttons : list, optional
@@ -1126,159 +1601,226 @@ def movement(coords_to,coords_from,diff,board, buttons = 0):
     None.
 
     """
-    row = 0
-    col = 1
+    cells = move_board(coords_to, coords_from, diff, board)
 
-    #Changes the end spot to a peg for the base and advanced interface.
-    board[coords_to[row],coords_to[col]] = p
+    #Updates the buttons of every hole that changed.
     if isinstance(buttons, list):
-        buttons[coords_to[row]-1][coords_to[col]-1].config(image = PEG_IMG)
+        for row, col in cells:
+            image = PEG_IMG if board[row, col] == p else EMPTY_IMG
+            buttons[row-1][col-1].config(image = image)
 
-    #Deteremines if the vector is positive or negative.
-    step = diff[0]/abs(diff[0])
+# %%
+def undo(board,move_rec,history,buttons = 0, vis = False):
+    """
+    Undoes the previous move by flipping back the holes it changed and
+    removing the last recorded move. The move stays in the history so it can
+    be redone.
 
-    #Removes any pegs that are jumped over if the peg was moved horizontally.
-    if coords_from[row] == coords_to[row]:
-        for i in range(abs(diff[0])):
-            board[coords_from[row],coords_from[col]+int((i*step))] = e
-            if isinstance(buttons, list):
-                buttons[coords_from[row]-1]\
-                [coords_from[col]-1+int((i*step))].config(image = EMPTY_IMG)
+    Parameters
+    ----------
+    board : numpy.ndarray
+        A 2D array that stores information on each space on the boards status.
+    move_rec : list
+        A list that keeps contains the coordinates of all successful moves
+        taken.
+    history : History
+        The tree of moves made, used to undo and redo them.
+    buttons : list, optional
+        A list containing the identification and location of all buttons made.
+    vis : bool, optional
+        True if the advanced interface needs changing too. The default is
+        False.
+
+    Returns
+    -------
+    None.
 
-    #Removes any pegs that are jumped over if the peg was moved vertically.
+    """
+    #Reverses the last move, if there is one.
+    delta = history.undo()
+    if delta == 0:
+        return
+    layout = get_layout()
+    flip_cells(board, delta, layout, buttons)
+
+    #Changes the advanced interface accordingly.
+    if vis == True:
+        move_rec[:] = move_rec[:-2]
+        refresh_buttons(board, buttons)
     else:
-        for i in range(abs(diff[0])):
-            board[coords_from[row]+int((i*step)),coords_from[col]] = e
-            if isinstance(buttons, list):
-                buttons[coords_from[row]-1+int((i*step))]\
-                [coords_from[col]-1].config(image = EMPTY_IMG)
+        move_rec[:] = move_rec[:-1]
 
-# %%
-def moves_left(board, find_move=False):
+
+def redo(board,move_rec,history,buttons = 0, vis = False):
     """
-    Calculates all possible moves that can be maode on the current board.
+    Makes the last undone move again, following the line that was played
+    most recently from this position.
 
     Parameters
     ----------
     board : numpy.ndarray
         A 2D array that stores information on each space on the boards status.
-    find_move : boolean, optional
-        Provides an alternative part to the funciton that returns what moves
-        can be made, not just how many. The default is False.
+    move_rec : list
+        A list that keeps contains the coordinates of all successful moves
+        taken.
+    history : History
+        The tree of moves made, used to undo and redo them.
+    buttons : list, optional
+        A list containing the identification and location of all buttons made.
+    vis : bool, optional
+        True if the advanced interface needs changing too. The default is
+        False.
 
     Returns
     -------
-    pos_moves: list
-        A list containg the start and end coordinates for any potential moves
-        for the current board.
-    move_count: int
-        An integer value of how many potential moves for the current board are
-        available.
+    None.
 
     """
-    row = 0
-    col = 1
+    layout = get_layout()
+    before = to_bits(board, layout)
+    delta = history.redo()
+    if delta == 0:
+        return
+    flip_cells(board, delta, layout, buttons)
+    record_move(before, delta, layout, move_rec, vis)
+    if vis == True:
+        refresh_buttons(board, buttons)
 
-    move_count = 0#Sets counter to zero.
-    pos_moves = []#Creates list to store all possible moves.
 
-    #This loop works through each row of the board
-    for row in range(len(board[:])):
-        #This loop works through each peg of the row selected
-        for col in range(len(board[:,:])):
+def lines(board,move_rec,history):
+    """
+    Lists every move that has been tried from the current position and lets
+    the user pick which one to follow.
 
-            #This block identifies any pegs on the board and trys to create
-            #a numpy array of any pegs it can jump over. The exceptions account
-            #for any pegs on the board that might exceed the index limit, such
-            #as pegs in row 7 or column G.
-            if board[row,col] == p:
-                try:
+    Parameters
+    ----------
+    board : numpy.ndarray
+        A 2D array that stores information on each space on the boards status.
+    move_rec : list
+        A list that keeps contains the coordinates of all successful moves
+        taken.
+    history : History
+        The tree of moves made, used to undo and redo them.
 
-                    around_peg = np.array([board[row+1,col],
-                                           board[row-1,col],
-                                           board[row,col+1],
-                                           board[row,col-1]])
+    Returns
+    -------
+    None.
 
+    """
+    layout = get_layout()
+    before = to_bits(board, layout)
+    variations = history.variations()
+    if not variations:
+        print("No other moves have been tried from here")
+        return
 
-                except:
+    for count, (node, delta) in enumerate(variations, 1):
+        print(f"{count}-{delta_text(before, delta, layout).upper()}")
+    choice = input("Which line do you want to follow?")
+    if not choice.isdigit() or not 0 < int(choice) <= len(variations):
+        print("Invalid choice")
+        return
 
-                    try:
+    delta = history.follow(variations[int(choice)-1][0])
+    flip_cells(board, delta, layout)
+    record_move(before, delta, layout, move_rec)
 
-                        around_peg = np.array([board[row+1,col],
-                                               board[row-1,col],
-                                               0,
-                                               board[row,col-1]])
 
-                    except:
+def record_move(before, delta, layout, move_rec, vis = False):
+    """
+    Adds a redone move to the record of moves, in the same form the
+    interface being used records them.
 
+    Parameters
+    ----------
+    before : int
+        Integer representing the position before the move.
+    delta : int
+        Integer with the bit of every hole the move changed set.
+    layout : Layout
+        The bit mapping for the board.
+    move_rec : list
+        A list that keeps contains the coordinates of all successful moves
+        taken.
+    vis : bool, optional
+        True if the move is for the advanced interface, which records the
+        coordinates of both clicks. The default is False.
 
-                        around_peg = np.array([0,
-                                               board[row-1,col],
-                                               board[row,col+1],
-                                               board[row,col-1]])
+    Returns
+    -------
+    None.
 
-                #This block identifies any directions in which a peg can jump
-                #over a peg and if there is an empty space for the peg to land.
-                for count, peg_here in enumerate(around_peg==p):
-                    dist = [(row+2,col),(row-2,col),(row,col+2),(row,col-2)]
-                    if peg_here == True:
-                        try:
-                            if board[dist[count]] == e:
-                                move_count +=1
-                                if find_move == True:
-                                    pos_moves.append([(row,col),dist[count]])
-                        except:
-                            pass
+    """
+    if vis == True:
+        for bit in delta_move(before, delta, layout):
+            move_rec.append(list(layout.coords[bit]))
+    else:
+        move_rec.append(delta_text(before, delta, layout).upper())
 
-    if find_move == True:
-        return pos_moves
-    return move_count
 
-# %%
-def undo(board,move_rec,board_rec,buttons = 0, vis = False):
+def flip_cells(board, delta, layout, buttons = 0):
     """
-    Undoes the previous move by removing the last recorded board and move and 
-    returning the board to its stae before the last move was made.
+    Swaps pegs and empty holes for every hole a move changed.
 
     Parameters
     ----------
     board : numpy.ndarray
         A 2D array that stores information on each space on the boards status.
-    move_rec : list
-        A list that keeps contains the coordinates of all successful moves
-        taken.
-    board_rec : list
-        A list that stores all states of the board chronologically, excluding
-        any boards that have been undone.
+    delta : int
+        Integer with the bit of every hole the move changed set.
+    layout : Layout
+        The bit mapping for the board.
+    buttons : list, optional
+        A list containing the identification and location of all buttons made.
 
     Returns
     -------
     None.
 
     """
-    #Reverses the last move, if there is one.
-    if len(board_rec)>1:
-        board_rec[:] = board_rec[:-1]
-        board[:,:] = board_rec[-1]
+    while delta:
+        low = delta & -delta
+        delta ^= low
+        row, col = layout.coords[low.bit_length()-1]
+        board[row, col] = e if board[row, col] == p else p
+        if isinstance(buttons, list):
+            buttons[row-1][col-1].config(
+                image = PEG_IMG if board[row, col] == p else EMPTY_IMG)
 
-    #Changes the advanced interface accordingly.
-    if vis == True:
-        move_rec[:] = move_rec[:-2]
-        for i in range(len(board)):
-            for j in range(len(board[i])):
-                if board[i,j] == e:
-                    buttons[i-1][j-1].config(image = EMPTY_IMG, state="disabled")
-                elif board[i,j] == p:
-                    buttons[i-1][j-1].config(image = PEG_IMG, state="enabled")
-    else:
-        move_rec[:] = move_rec[:-1]
 
-# %%
-time.sleep(.2)
-menu()
+def refresh_buttons(board, buttons):
+    """
+    Enables the button of every peg and disables every empty hole.
 
-# %%
+    Parameters
+    ----------
+    board : numpy.ndarray
+        A 2D array that stores information on each space on the boards status.
+    buttons : list
+        A list containing the identification and location of all buttons made.
 
+    Returns
+    -------
+    None.
+
+    """
+    #Only the holes that show something different are redrawn.
+    layout = get_layout()
+    for row, col in layout.coords.values():
+        if board[row, col] == p:
+            buttons[row-1][col-1].config(image = PEG_IMG, state="enabled")
+        else:
+            buttons[row-1][col-1].config(image = EMPTY_IMG, state="disabled")
+
+# %%
+if __name__ == "__main__":
+    #Runs a command without the menu, the same as python -m peg_solitaire,
+    #e.g. python "Peg Solitaire.py" verify full_solution.txt
+    if sys.argv[1:2] and sys.argv[1] in cli.COMMANDS:
+        sys.exit(cli.main())
+    else:
+        time.sleep(.2)
+        menu()
 
 # %%
 
@@ -1286,4 +1828,5 @@ menu()
 # %%
 
 
+# %%
 
@@ -0,0 +1,95 @@
+"""
+The peg solitaire engine, without any of the interfaces.
+
+The board model, move history, solvers and batch solving are imported
+straight away and only need the standard library. The parallel solver,
+archive verifier, vectorised move generation, binary game archives,
+solution counting, bidirectional search, endgame oracle and benchmarks are
+imported the first time one of their names is used, as they pull in
+multiprocessing, sqlite and numpy.
+
+"""
+from importlib import import_module
+
+from .boards import (ALT_BOARD, ANY_DIST, BOARDS, LAYOUTS, UNDO_OPT, Layout,
+                     Peg, apply_move, apply_ray, board_rows, canonical,
+                     cheats, count_moves, e, format_board, format_position,
+                     gen_boards, gen_moves, get_layout, has_won, init_board,
+                     jump_sources, move_board, move_text, moves_from,
+                     moves_left, n, p, parse_moves, parse_position,
+                     ray_moves, ray_moves_from, select_board, selected_board,
+                     to_bits, to_board, undo_move)
+from .history import History, delta_move, delta_text
+from .solver import (MOVE_WEIGHTS, PRUNE_RULES, SLOT_BYTES, MoveOrder,
+                     TransTable, beam_solve, dfs_solve, format_stats,
+                     move_hints, profile_solve, prune_reason, prune_rules,
+                     solve_stats)
+from .batch import batch_file, batch_solve
+
+#Names from the modules that are only imported when first used.
+LAZY = {
+    "parallel": ["SharedDeadEnds", "SharedTable", "init_worker",
+                 "solve_subtree", "split_tree", "parallel_solve",
+                 "parallel_speedup"],
+    "vector": ["to_array", "from_array", "batch_moves"],
+    "verify": ["verify_game", "verify_lines", "verify_stream",
+               "verdict_text", "verify_file"],
+    "archive": ["ARCHIVE_MAGIC", "RESULTS", "position_bytes", "encode_game",
+                "decode_game", "ArchiveWriter", "Archive", "pack_text",
+                "unpack_text", "save_game"],
+    "count": ["MEMO_BYTES", "CountMemo", "count_solutions", "format_count"],
+    "bidir": ["parents_array", "GoalFrontier", "FRONTIERS", "bidir_solve"],
+    "oracle": ["ORACLE_MAGIC", "ORACLE_FILE", "LOW_BITS", "pack_tables",
+               "canonical_array", "children_array", "build_oracle",
+               "Oracle", "ORACLES", "load_oracle"],
+    "bench": ["BENCH_SEED", "BENCH_BOARDS", "bench_corpus", "time_ops",
+              "bench_ops", "bench_solver", "bench_bidir", "run_benchmarks",
+              "compare_benchmarks"],
+    }
+LAZY_NAMES = {name: module for module, names in LAZY.items()
+              for name in names}
+
+
+def __getattr__(name):
+    """
+    Imports the module a lazily loaded name belongs to the first time it is
+    asked for.
+
+    Parameters
+    ----------
+    name : str
+        The attribute being looked up on the package.
+
+    Raises
+    ------
+    AttributeError
+        The name is not part of the package.
+
+    Returns
+    -------
+    object
+        The attribute from the module that defines it.
+
+    """
+    if name not in LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{LAZY_NAMES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "Peg", "n", "e", "p", "ANY_DIST", "UNDO_OPT", "ALT_BOARD", "cheats",
+    "BOARDS", "selected_board", "select_board", "board_rows", "init_board",
+    "Layout", "LAYOUTS", "get_layout", "to_bits", "to_board",
+    "jump_sources", "count_moves", "gen_moves", "moves_from", "apply_move",
+    "ray_moves_from", "ray_moves", "apply_ray", "undo_move", "has_won",
+    "gen_boards", "canonical", "move_text",
+    "parse_moves", "parse_position", "format_position", "format_board",
+    "moves_left", "move_board",
+    "History", "delta_move", "delta_text",
+    "SLOT_BYTES", "TransTable", "dfs_solve", "solve_stats", "format_stats",
+    "profile_solve", "PRUNE_RULES", "prune_rules", "prune_reason",
+    "MOVE_WEIGHTS", "MoveOrder", "beam_solve", "move_hints",
+    "batch_solve", "batch_file",
+    ] + list(LAZY_NAMES)
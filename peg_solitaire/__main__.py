@@ -0,0 +1,10 @@
+"""
+Runs the command line interface, e.g. python -m peg_solitaire solve.
+
+"""
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
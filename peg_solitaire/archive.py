@@ -0,0 +1,457 @@
+"""
+A compact binary file of many games, with one byte per move, and a reader
+that memory-maps it.
+
+An archive starts with the magic number and three uint64: the number of
+games, where the index starts and the length of the list of boards. Each
+game is then written as:
+
+    board   uint8   index into the list of boards
+    result  uint8   index into RESULTS
+    moves   uint16  number of moves
+    start   the starting position, in the fewest whole bytes that hold
+            every hole of the board, least significant byte first
+    jumps   one uint8 per move, indexing the jump table of the board
+
+followed by the index, a uint64 offset for every game, and the names of the
+boards separated by commas. Adding games to an archive writes them and a new
+index after the old index, which is left unused. Every number is little
+endian.
+
+"""
+import sys
+from array import array
+
+import numpy as np
+
+from .boards import get_layout, selected_board
+from .verify import verify_game
+
+
+#Marks the start of an archive file.
+ARCHIVE_MAGIC = b"PEGARC01"
+#The verdicts a game can be stored with, see verify_game.
+RESULTS = ("valid", "incomplete", "invalid")
+
+
+def position_bytes(layout):
+    """
+    Finds the number of bytes a position of the board is stored in.
+
+    Parameters
+    ----------
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    size : int
+        The fewest whole bytes that hold every hole.
+
+    """
+    return max(layout.holes)//8 + 1
+
+
+def encode_game(text, layout, bits=None):
+    """
+    Converts a game written as in the solution files into one byte per move.
+    A game with an invalid move keeps the moves made before it.
+
+    Parameters
+    ----------
+    text : str
+        The comma separated moves of the game, e.g. b4d4,c6c4.
+    layout : Layout
+        The bit mapping for the board.
+    bits : int, optional
+        Position the game starts from. The default is None, which uses the
+        starting position.
+
+    Returns
+    -------
+    jumps : bytes
+        The index of each move in the jump table of the board.
+    result : str
+        The verdict of the game, one of RESULTS.
+
+    """
+    verdict = verify_game(text, layout, bits)
+    words = [word for word in map(str.strip, text.lower().split(","))
+             if word]
+    jumps = bytes(layout.jump_names[word]
+                  for word in words[:verdict["moves"]])
+    return jumps, verdict["verdict"]
+
+
+def decode_game(jumps, layout):
+    """
+    Writes the moves of a stored game in the notation of the solution files,
+    the reverse of encode_game.
+
+    Parameters
+    ----------
+    jumps : bytes
+        The index of each move in the jump table of the board, or a view of
+        them.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    text : str
+        The comma separated moves, e.g. b4d4,c6c4.
+
+    """
+    #The names are kept in the order of the jump table.
+    names = list(layout.jump_names)
+    return ",".join(names[index] for index in bytes(jumps))
+
+
+class ArchiveWriter:
+    """
+    A class that writes games to an archive one at a time. The index and the
+    list of boards are only written when it is closed, so it should be used
+    in a with statement. Until then the header still points at the games
+    the archive held when it was opened.
+
+    ...
+
+    Attributes
+    ----------
+    file : file
+        The archive, open for writing.
+    offsets : array.array
+        Where each game starts in the file.
+    boards : list
+        Names of the boards the games are played on, in the order first
+        used.
+
+    """
+    def __init__(self, path, append=False):
+        """
+        Opens an archive, either new or to add more games to the end.
+
+        Parameters
+        ----------
+        path : str
+            The archive file.
+        append : bool, optional
+            Keeps the games already in the file. The default is False.
+
+        Raises
+        ------
+        ValueError
+            Raised if the file being added to is not an archive.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.offsets = array("Q")
+        self.boards = []
+        try:
+            self.file = open(path, "r+b" if append else "wb")
+        except FileNotFoundError:
+            self.file = open(path, "wb")
+            append = False
+
+        if append:
+            #Reads the index and boards back in. New games are written after
+            #them, so the header still points at a whole archive until
+            #close writes the new index.
+            try:
+                if self.file.read(8) != ARCHIVE_MAGIC:
+                    raise ValueError(f"{path} is not a game archive")
+                count, index_at, names = np.frombuffer(self.file.read(24),
+                                                       dtype="<u8").tolist()
+                self.file.seek(index_at)
+                self.offsets.frombytes(self.file.read(8*count))
+                if sys.byteorder == "big":
+                    self.offsets.byteswap()
+                names = self.file.read(names).decode()
+            except Exception:
+                self.file.close()
+                raise
+            self.boards = names.split(",") if names else []
+            self.file.seek(0, 2)
+        else:
+            self.file.write(ARCHIVE_MAGIC + bytes(24))
+
+    def add(self, jumps, board=None, bits=None, result="incomplete"):
+        """
+        Writes a game to the end of the archive.
+
+        Parameters
+        ----------
+        jumps : bytes
+            The index of each move in the jump table of the board, as made
+            by encode_game.
+        board : str, optional
+            Key of BOARDS the game is played on. The default is None, which
+            uses the current board.
+        bits : int, optional
+            Position the game starts from. The default is None, which uses
+            the starting position.
+        result : str, optional
+            The verdict of the game, one of RESULTS. The default is
+            "incomplete".
+
+        Raises
+        ------
+        ValueError
+            Raised if the board has too many jumps to fit a byte, or the game
+            has too many moves.
+
+        Returns
+        -------
+        index : int
+            The number of the game in the archive.
+
+        """
+        board = board or selected_board()
+        layout = get_layout(board)
+        if len(layout.jumps) > 256:
+            raise ValueError(f"The {board} board has too many jumps to store "
+                             "one per byte")
+        if len(jumps) > 0xFFFF:
+            raise ValueError("A game can have at most 65535 moves")
+        if board not in self.boards:
+            self.boards.append(board)
+        if bits is None:
+            bits = layout.start
+
+        self.offsets.append(self.file.tell())
+        self.file.write(bytes([self.boards.index(board),
+                               RESULTS.index(result)]) +
+                        len(jumps).to_bytes(2, "little") +
+                        bits.to_bytes(position_bytes(layout), "little") +
+                        bytes(jumps))
+        return len(self.offsets) - 1
+
+    def close(self):
+        """
+        Writes the index and the list of boards, then the header pointing to
+        them, and closes the file.
+
+        Returns
+        -------
+        None.
+
+        """
+        #Lines the index up on 8 bytes so it can be viewed as uint64.
+        self.file.write(bytes(-self.file.tell() % 8))
+        index_at = self.file.tell()
+        self.file.write(np.asarray(self.offsets, dtype="<u8").tobytes())
+        names = ",".join(self.boards).encode()
+        self.file.write(names)
+        #Makes sure the index is written before the header points at it.
+        self.file.flush()
+        self.file.seek(8)
+        self.file.write(np.array([len(self.offsets), index_at, len(names)],
+                                 dtype="<u8").tobytes())
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Archive:
+    """
+    A class that reads the games of an archive. The file is memory-mapped,
+    so only the pages holding the games looked at are read from disk, and
+    the moves of a game are a view into the file rather than a copy.
+
+    ...
+
+    Attributes
+    ----------
+    data : numpy.memmap
+        Every byte of the file.
+    view : memoryview
+        The same bytes, which are quicker to slice a few at a time.
+    offsets : numpy.ndarray
+        Where each game starts in the file, as a view of the index.
+    boards : list
+        Names of the boards the games are played on.
+    layouts : list
+        The layout of each board.
+
+    """
+    def __init__(self, path):
+        """
+        Maps the file into memory and reads its index.
+
+        Parameters
+        ----------
+        path : str
+            The archive file.
+
+        Raises
+        ------
+        ValueError
+            Raised if the file is not an archive.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self.data[:8]) != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} is not a game archive")
+        count, index_at, names = self.data[8:32].view("<u8").tolist()
+        self.view = memoryview(self.data)
+        self.offsets = self.data[index_at:index_at+8*count].view("<u8")
+        names_at = index_at + 8*count
+        self.boards = bytes(self.data[names_at:names_at+names]).decode()
+        self.boards = self.boards.split(",") if self.boards else []
+        self.layouts = [get_layout(board) for board in self.boards]
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        """
+        Reads the header of a game and finds its moves.
+
+        Parameters
+        ----------
+        index : int
+            The number of the game in the archive.
+
+        Returns
+        -------
+        game : dict
+            The board, starting position and result of the game, and its
+            moves as a memoryview of the file.
+
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("game index out of range")
+        at = int(self.offsets[index])
+        board, result, low, high = self.view[at:at+4]
+        start = at + 4 + position_bytes(self.layouts[board])
+        return {"board": self.boards[board],
+                "start": int.from_bytes(self.view[at+4:start], "little"),
+                "result": RESULTS[result],
+                "moves": self.view[start:start + (low | high << 8)]}
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def text(self, index):
+        """
+        Writes the moves of a game in the notation of the solution files.
+
+        Parameters
+        ----------
+        index : int
+            The number of the game in the archive.
+
+        Returns
+        -------
+        text : str
+            The comma separated moves, e.g. b4d4,c6c4.
+
+        """
+        game = self[index]
+        return decode_game(game["moves"],
+                           self.layouts[self.boards.index(game["board"])])
+
+
+def pack_text(source, path, board=None, append=False):
+    """
+    Converts a text archive, one comma separated game per line as in
+    full_solution.txt, into a binary archive. Every game is checked on the
+    way, so its result is stored with it.
+
+    Parameters
+    ----------
+    source : str
+        The text archive, or "-" to read standard input.
+    path : str
+        The binary archive to write.
+    board : str, optional
+        Key of BOARDS the games are played on. The default is None, which
+        uses the current board.
+    append : bool, optional
+        Adds the games to an existing archive. The default is False.
+
+    Returns
+    -------
+    count : int
+        Number of games written.
+
+    """
+    board = board or selected_board()
+    layout = get_layout(board)
+    lines = sys.stdin if source == "-" else open(source)
+    count = 0
+    try:
+        with ArchiveWriter(path, append) as writer:
+            for text in lines:
+                if text.strip():
+                    jumps, result = encode_game(text, layout)
+                    writer.add(jumps, board, result=result)
+                    count += 1
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    return count
+
+
+def unpack_text(path, out=None):
+    """
+    Writes every game of a binary archive as a line of comma separated
+    moves, the reverse of pack_text.
+
+    Parameters
+    ----------
+    path : str
+        The binary archive.
+    out : file, optional
+        Where the games are written. The default is None, which uses
+        standard output.
+
+    Returns
+    -------
+    count : int
+        Number of games written.
+
+    """
+    out = out or sys.stdout
+    archive = Archive(path)
+    for index in range(len(archive)):
+        out.write(archive.text(index) + "\n")
+    return len(archive)
+
+
+def save_game(path, moves, board=None):
+    """
+    Adds one game to an archive, creating it if needed.
+
+    Parameters
+    ----------
+    path : str
+        The archive file.
+    moves : list
+        The moves of the game as text, e.g. ["B4D4", "C6C4"].
+    board : str, optional
+        Key of BOARDS the game is played on. The default is None, which
+        uses the current board.
+
+    Returns
+    -------
+    index : int
+        The number of the game in the archive.
+
+    """
+    board = board or selected_board()
+    jumps, result = encode_game(",".join(moves), get_layout(board))
+    with ArchiveWriter(path, append=True) as writer:
+        return writer.add(jumps, board, result=result)
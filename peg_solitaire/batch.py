@@ -0,0 +1,105 @@
+"""
+Solving many positions from a file, one result per line.
+
+"""
+import json
+import sys
+import time
+
+from .boards import format_position, get_layout, move_text, parse_position
+from .solver import MoveOrder, TransTable, dfs_solve
+
+
+def batch_solve(positions, layout, table=None, order=None, prune=True,
+                **kwargs):
+    """
+    Solves positions one at a time, yielding each result as soon as it is
+    found. The same transposition table and move ordering are used for every
+    position, so dead-ends found early on are skipped in later solves.
+
+    Parameters
+    ----------
+    positions : iterable
+        Positions in any form read by parse_position, e.g. the lines of a
+        file. Blank lines are skipped.
+    layout : Layout
+        The bit mapping for the board.
+    table : TransTable, optional
+        Table shared by all the solves. The default is None, which creates a
+        new table.
+    order : MoveOrder, optional
+        Move ordering shared by all the solves. The default is None, which
+        creates a new one, as the solve command does.
+    prune : bool, optional
+        Whether to skip positions the rules of prune_rules show cannot be
+        won. The default is True.
+    **kwargs
+        Passed on to dfs_solve, e.g. max_nodes or oracle.
+
+    Yields
+    ------
+    result : dict
+        The line number, position, status, solution moves, number of
+        positions searched, time taken and every counter of the solve, or
+        the error if the position could not be read.
+
+    """
+    if table is None:
+        table = TransTable()
+    if order is None:
+        order = MoveOrder()
+    for line, text in enumerate(positions, 1):
+        if not text.strip():
+            continue
+        try:
+            bits = parse_position(text, layout)
+        except ValueError as error:
+            yield {"line": line, "error": str(error)}
+            continue
+
+        start = time.perf_counter()
+        status, moves, stats = dfs_solve(bits, layout, order=order,
+                                         table=table, prune=prune, **kwargs)
+        yield {"line": line,
+               "position": format_position(bits, layout),
+               "status": status,
+               "moves": None if moves is None else
+                        ",".join(move_text(move, layout) for move in moves),
+               "nodes": stats["nodes"],
+               "seconds": round(time.perf_counter() - start, 6),
+               "stats": stats}
+
+
+def batch_file(path, out=None, layout=None, **kwargs):
+    """
+    Solves every position in a file, one per line, writing each result to
+    the output as a line of JSON as soon as it is found.
+
+    Parameters
+    ----------
+    path : str
+        The file of positions, or "-" to read standard input.
+    out : file, optional
+        Where the results are written. The default is None, which uses
+        standard output.
+    layout : Layout, optional
+        The bit mapping for the board. The default is None, which uses the
+        current board.
+    **kwargs
+        Passed on to batch_solve.
+
+    Returns
+    -------
+    None.
+
+    """
+    out = out or sys.stdout
+    layout = layout or get_layout()
+    lines = sys.stdin if path == "-" else open(path)
+    try:
+        for result in batch_solve(lines, layout, **kwargs):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
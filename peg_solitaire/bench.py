@@ -0,0 +1,461 @@
+"""
+Benchmarks of the engine and solver on a fixed set of positions.
+
+"""
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .boards import (apply_move, canonical, format_position, gen_boards,
+                     gen_moves, get_layout, move_board, moves_left,
+                     parse_moves, select_board, selected_board, to_board)
+from .solver import MoveOrder, dfs_solve
+
+
+#Seed of the random positions used by the benchmarks, so every run times the
+#same positions, and the boards they are run on.
+BENCH_SEED = 2024
+BENCH_BOARDS = ("english", "french")
+
+
+def bench_corpus(seed=BENCH_SEED, boards=BENCH_BOARDS, count=4, pegs=None):
+    """
+    Builds the positions the benchmarks are timed on: the start of each
+    board, the positions reached along partial_solution.txt on the English
+    board and positions part way through random games.
+
+    Parameters
+    ----------
+    seed : int, optional
+        Seed of the random games. The default is BENCH_SEED.
+    boards : tuple, optional
+        Keys of BOARDS to build positions for. The default is BENCH_BOARDS.
+    count : int, optional
+        Number of random positions for each board. The default is 4.
+    pegs : int, optional
+        Number of pegs left in the random positions. The default is None,
+        which leaves half the holes of each board, rounded up.
+
+    Returns
+    -------
+    corpus : list
+        A dict for each position with its name, board and integer.
+
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for name in boards:
+        layout = get_layout(name)
+        corpus.append({"name": f"{name}/start", "board": name,
+                       "bits": layout.start})
+
+        #Takes every fourth position along the partial solution.
+        if name == "english":
+            text = (Path(__file__).resolve().parent.parent/
+                    "partial_solution.txt").read_text()
+            moves = parse_moves(text, layout)[0]
+            for step in range(4, len(moves)+1, 4):
+                bits = layout.start
+                for move in moves[:step]:
+                    bits = apply_move(bits, move)
+                corpus.append({"name": f"{name}/partial{step}",
+                               "board": name, "bits": bits})
+
+        #Plays random moves until the number of pegs is reached, starting
+        #again whenever a game gets stuck first.
+        left = (len(layout.holes)+1)//2 if pegs is None else pegs
+        for number in range(count):
+            bits = layout.start
+            while bits.bit_count() > left:
+                moves = gen_moves(bits, layout)
+                bits = (apply_move(bits, rng.choice(moves)) if moves else
+                        layout.start)
+            corpus.append({"name": f"{name}/random{number}", "board": name,
+                           "bits": bits})
+    return corpus
+
+
+def time_ops(func, items, min_time=0.2):
+    """
+    Calls a function on every item, over and over until enough time has
+    passed to give a steady rate.
+
+    Parameters
+    ----------
+    func : function
+        Called with each item.
+    items : list
+        Arguments of each call.
+    min_time : float, optional
+        Least number of seconds to keep calling for. The default is 0.2.
+
+    Returns
+    -------
+    rate : float
+        Calls made per second.
+
+    """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for item in items:
+            func(item)
+        calls += len(items)
+        seconds = time.perf_counter() - start
+        if seconds >= min_time:
+            return calls / seconds
+
+
+def bench_ops(corpus, min_time=0.2):
+    """
+    Times the basic operations of the engine on the positions of a corpus,
+    both on integers and on board arrays.
+
+    Parameters
+    ----------
+    corpus : list
+        Positions made by bench_corpus.
+    min_time : float, optional
+        Least number of seconds to time each operation for. The default is
+        0.2.
+
+    Returns
+    -------
+    rates : dict
+        For each board, the calls per second of each operation.
+
+    """
+    chosen = selected_board()
+    rates = {}
+    try:
+        for name in dict.fromkeys(entry["board"] for entry in corpus):
+            layout = get_layout(name)
+            positions = [entry["bits"] for entry in corpus
+                         if entry["board"] == name]
+            made = [(bits, move) for bits in positions
+                    for move in gen_moves(bits, layout)]
+            boards = [to_board(bits, layout) for bits in positions]
+            moved = [(board, np.array(layout.coords[move[-1]]),
+                      np.array(layout.coords[move[0]]))
+                     for board, (bits, move) in
+                     zip([to_board(bits, layout) for bits, move in made],
+                         made)]
+
+            #The board array functions work on the board of the cheat menu.
+            select_board(name)
+            rates[name] = {
+                "gen_moves": time_ops(
+                    lambda bits: gen_moves(bits, layout), positions,
+                    min_time),
+                "apply_move": time_ops(
+                    lambda made: apply_move(*made), made, min_time),
+                "canonical": time_ops(
+                    lambda bits: canonical(bits, layout), positions,
+                    min_time),
+                "gen_boards": time_ops(
+                    lambda bits: gen_boards(bits, layout), positions,
+                    min_time),
+                "moves_left": time_ops(
+                    lambda board: moves_left(board, True), boards,
+                    min_time),
+                #Each call copies the board first so it can be moved again.
+                "movement": time_ops(
+                    lambda moved: move_board(moved[1], moved[2],
+                                             moved[1]-moved[2],
+                                             np.copy(moved[0])),
+                    moved, min_time),
+                }
+    finally:
+        select_board(chosen)
+    return rates
+
+
+def bench_solver(corpus, max_nodes=50000, prune=(True, False)):
+    """
+    Times dfs_solve on every position of a corpus, with the move ordering
+    used by auto_solve but without the oracle, so the timings do not depend
+    on what files are present. Each position is solved with and without
+    pruning, as pruning proves most positions of the French board lost
+    without searching them.
+
+    Parameters
+    ----------
+    corpus : list
+        Positions made by bench_corpus.
+    max_nodes : int, optional
+        Number of positions to search before giving up on one. The default
+        is 50000.
+    prune : tuple, optional
+        The prune settings to solve each position with. The default is
+        (True, False).
+
+    Returns
+    -------
+    results : list
+        A dict for each position and prune setting with the status, the
+        positions searched, the time taken and the positions searched per
+        second.
+
+    """
+    results = []
+    for entry in corpus:
+        layout = get_layout(entry["board"])
+        for setting in prune:
+            start = time.perf_counter()
+            status, moves, stats = dfs_solve(entry["bits"], layout,
+                                             order=MoveOrder(),
+                                             prune=setting,
+                                             max_nodes=max_nodes)
+            seconds = time.perf_counter() - start
+            results.append({"name": entry["name"], "prune": setting,
+                            "status": status, "nodes": stats["nodes"],
+                            "seconds": seconds,
+                            "nodes_per_sec": stats["nodes"] / seconds})
+    return results
+
+
+def bench_bidir(corpus, max_nodes=50000):
+    """
+    Times bidir_solve against the forward search of bench_solver, with
+    pruning, on the positions of a corpus part way through a game. The
+    frontier of each board is built once before the solves are timed, and
+    the time it took is given separately.
+
+    Parameters
+    ----------
+    corpus : list
+        Positions made by bench_corpus. The starting positions are skipped.
+    max_nodes : int, optional
+        Number of positions to search before giving up on one. The default
+        is 50000.
+
+    Returns
+    -------
+    results : dict
+        The frontier built for each board, with the pegs it reaches, its
+        size and the time it took, and a dict for each position with the
+        status, positions searched and time taken by both searches.
+
+    """
+    from .bidir import GoalFrontier, bidir_solve
+
+    results = {"frontiers": {}, "solves": []}
+    positions = [entry for entry in corpus
+                 if not entry["name"].endswith("/start")]
+    for name in dict.fromkeys(entry["board"] for entry in positions):
+        layout = get_layout(name)
+        frontier = GoalFrontier(layout)
+        frontier.extend(max((entry["bits"].bit_count()+1)//2
+                            for entry in positions
+                            if entry["board"] == name))
+        stats = frontier.stats()
+        results["frontiers"][name] = {"pegs": stats["pegs"],
+                                      "states": sum(stats["sizes"]),
+                                      "seconds": stats["seconds"]}
+
+        for entry in positions:
+            if entry["board"] != name:
+                continue
+            result = {"name": entry["name"]}
+            for label, solve, kwargs in (
+                    ("forward", dfs_solve, {}),
+                    ("bidir", bidir_solve, {"frontier": frontier})):
+                start = time.perf_counter()
+                status, moves, stats = solve(entry["bits"], layout,
+                                             order=MoveOrder(), prune=True,
+                                             max_nodes=max_nodes, **kwargs)
+                result[label] = {"status": status, "nodes": stats["nodes"],
+                                 "seconds": time.perf_counter() - start}
+            results["solves"].append(result)
+    return results
+
+
+def bench_parallel(corpus, workers):
+    """
+    Times parallel_solve on the starting positions of a corpus with one
+    worker and then doubling up to the given number, with pruning but without
+    the oracle, and finds the speedup of each over one worker.
+
+    Parameters
+    ----------
+    corpus : list
+        Positions made by bench_corpus. Only the starting positions are
+        used.
+    workers : int
+        The most worker processes to time.
+
+    Returns
+    -------
+    results : list
+        A dict for each starting position and number of workers with the
+        status, the positions searched, the time taken and the speedup.
+
+    """
+    from .parallel import parallel_speedup
+
+    counts = [1]
+    while counts[-1]*2 < workers:
+        counts.append(counts[-1]*2)
+    if workers > 1:
+        counts.append(workers)
+    results = []
+    for entry in corpus:
+        if entry["name"].endswith("/start"):
+            for result in parallel_speedup(entry["bits"],
+                                           get_layout(entry["board"]),
+                                           counts, show=False):
+                results.append({"name": entry["name"], **result})
+    return results
+
+
+def run_benchmarks(path=None, seed=BENCH_SEED, min_time=0.2,
+                   max_nodes=50000, boards=BENCH_BOARDS, show=True,
+                   bidir=False, workers=None):
+    """
+    Runs every benchmark, prints the results and saves them as JSON so runs
+    on different commits can be compared with compare_benchmarks.
+
+    Parameters
+    ----------
+    path : str, optional
+        Where to save the results. The default is None, which does not save
+        them.
+    seed : int, optional
+        Seed of the random positions. The default is BENCH_SEED.
+    min_time : float, optional
+        Least number of seconds to time each operation for. The default is
+        0.2.
+    max_nodes : int, optional
+        Number of positions the solver searches before giving up on one. The
+        default is 50000.
+    boards : tuple, optional
+        Keys of BOARDS to run the benchmarks on. The default is BENCH_BOARDS.
+    show : bool, optional
+        Prints the results as they are found. The default is True.
+    bidir : bool, optional
+        Also runs bench_bidir, which builds a frontier of up to a few
+        million positions for each board. The default is False.
+    workers : int, optional
+        Also runs bench_parallel up to this many workers. The default is
+        None, which does not.
+
+    Returns
+    -------
+    results : dict
+        The settings used, the operation rates and the solver results, and
+        the bidirectional and parallel results if asked for.
+
+    """
+    corpus = bench_corpus(seed, boards)
+    results = {"seed": seed, "python": sys.version.split()[0],
+               "numpy": np.__version__, "date": time.strftime("%Y-%m-%d"),
+               "positions": [{"name": entry["name"],
+                              "position": format_position(
+                                  entry["bits"], get_layout(entry["board"]))}
+                             for entry in corpus],
+               "ops": bench_ops(corpus, min_time),
+               "solver": bench_solver(corpus, max_nodes)}
+    if bidir:
+        results["bidir"] = bench_bidir(corpus, max_nodes)
+    if workers is not None:
+        results["parallel"] = bench_parallel(corpus, workers)
+
+    if show:
+        for name, rates in results["ops"].items():
+            for op, rate in rates.items():
+                print(f"{name:8} {op:12} {rate:12,.0f} ops/sec")
+        for result in results["solver"]:
+            print(f"{result['name']:18} "
+                  f"{'pruned' if result['prune'] else '':6} "
+                  f"{result['status']:10} {result['nodes']:8} nodes "
+                  f"{result['seconds']:8.3f}s "
+                  f"{result['nodes_per_sec']:10,.0f} nodes/sec")
+        if bidir:
+            for name, built in results["bidir"]["frontiers"].items():
+                print(f"{name:8} frontier to {built['pegs']} pegs, "
+                      f"{built['states']:,} positions in "
+                      f"{built['seconds']:.2f}s")
+            for result in results["bidir"]["solves"]:
+                forward, both = result["forward"], result["bidir"]
+                print(f"{result['name']:18} {forward['status']:10} "
+                      f"forward {forward['nodes']:6} nodes "
+                      f"{forward['seconds']:7.3f}s, bidir "
+                      f"{both['nodes']:6} nodes {both['seconds']:7.3f}s")
+        for result in results.get("parallel", []):
+            print(f"{result['name']:18} {result['workers']:3} workers "
+                  f"{result['status']:10} {result['nodes']:8} nodes "
+                  f"{result['seconds']:8.3f}s "
+                  f"speedup {result['speedup']:5.2f}x")
+
+    if path is not None:
+        with open(path, "w") as file:
+            json.dump(results, file, indent=1)
+    return results
+
+
+def compare_benchmarks(old_path, new_path, show=True):
+    """
+    Prints how many times faster each operation and solve of one run is
+    than an earlier one.
+
+    Parameters
+    ----------
+    old_path : str or dict
+        File saved by run_benchmarks before a change, or the results it
+        returned.
+    new_path : str or dict
+        File saved by run_benchmarks after it, or the results it returned.
+    show : bool, optional
+        Prints the ratios. The default is True.
+
+    Returns
+    -------
+    ratios : dict
+        The new rate over the old rate for each operation, and the old time
+        over the new time for each solve.
+
+    """
+    old, new = old_path, new_path
+    if not isinstance(old, dict):
+        with open(old_path) as file:
+            old = json.load(file)
+    if not isinstance(new, dict):
+        with open(new_path) as file:
+            new = json.load(file)
+    if old["seed"] != new["seed"] and show:
+        print("Warning: the runs used different seeds")
+
+    ratios = {}
+    for name, rates in new["ops"].items():
+        for op, rate in rates.items():
+            if op in old["ops"].get(name, {}):
+                ratios[f"{name}/{op}"] = rate / old["ops"][name][op]
+    solves = {(result["name"], result["prune"]): result
+              for result in old["solver"]}
+    for result in new["solver"]:
+        key = (result["name"], result["prune"])
+        if key in solves:
+            name = result["name"] + ("/pruned" if result["prune"] else "")
+            ratios[name] = solves[key]["seconds"] / result["seconds"]
+    solves = {result["name"]: result
+              for result in old.get("bidir", {}).get("solves", [])}
+    for result in new.get("bidir", {}).get("solves", []):
+        if result["name"] in solves:
+            ratios[result["name"] + "/bidir"] = (
+                solves[result["name"]]["bidir"]["seconds"] /
+                result["bidir"]["seconds"])
+    solves = {(result["name"], result["workers"]): result
+              for result in old.get("parallel", [])}
+    for result in new.get("parallel", []):
+        key = (result["name"], result["workers"])
+        if key in solves:
+            ratios[f"{result['name']}/{result['workers']}workers"] = (
+                solves[key]["seconds"] / result["seconds"])
+    if show:
+        for name, ratio in ratios.items():
+            print(f"{name:22} {ratio:6.2f}x")
+    return ratios
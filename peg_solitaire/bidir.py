@@ -0,0 +1,249 @@
+"""
+Bidirectional search: every position that can still be won is found
+backwards from the goal, one peg count at a time, and the depth-first search
+forwards from a position stops as soon as it reaches one of those peg counts.
+
+"""
+import time
+
+import numpy as np
+
+from .boards import canonical
+from .oracle import canonical_array
+from .solver import dfs_solve
+
+
+def parents_array(keys, layout):
+    """
+    Takes back every move that could have led to many positions at once,
+    the reverse of children_array.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        Positions as an array of uint64.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    parents : numpy.ndarray
+        The position before every move that ends in one of the positions,
+        as uint64.
+
+    """
+    parents = []
+    for from_over, to_bit in layout.jump_checks:
+        from_over = np.uint64(from_over)
+        to_bit = np.uint64(to_bit)
+        rows = np.nonzero(((keys & to_bit) == to_bit) &
+                          ((keys & from_over) == 0))[0]
+        parents.append(keys[rows] ^ (from_over | to_bit))
+    return np.concatenate(parents)
+
+
+class GoalFrontier:
+    """
+    A class that holds every position with a few pegs that can still be
+    won, found by taking moves back from the goal. Each peg count is kept as
+    a sorted array of canonical integers, and a peg count is only added if
+    it fits in the number of positions allowed, so the answers for the peg
+    counts held are always exact.
+
+    Oracle keeps every peg count of the English board in a file, while a
+    frontier only keeps the peg counts that fit in memory, so it can be
+    built for any board.
+
+    ...
+
+    Attributes
+    ----------
+    layout : Layout
+        The bit mapping for the board.
+    levels : list
+        The canonical integers of the winnable positions with each number of
+        pegs, starting from the goal at index 1.
+    max_states : int
+        Most positions kept for one peg count.
+    full : bool
+        True once a peg count was too big to keep, so no more are added.
+    seconds : float
+        Time spent building the peg counts held.
+
+    """
+    def __init__(self, layout, max_states=2**21):
+        """
+        Constructs a frontier holding only the goal.
+
+        Parameters
+        ----------
+        layout : Layout
+            The bit mapping for the board, which must fit in 64 bits.
+        max_states : int, optional
+            Most positions kept for one peg count. The default is 2**21,
+            which is 16 MB of keys.
+
+        Raises
+        ------
+        ValueError
+            Raised if the board does not fit in 64 bits.
+
+        Returns
+        -------
+        None.
+
+        """
+        if max(layout.holes) >= 64:
+            raise ValueError("Bidirectional search only works on boards that "
+                             "fit in 64 bits")
+        self.layout = layout
+        self.levels = [np.zeros(0, dtype=np.uint64),
+                       np.array([canonical(layout.goal, layout)],
+                                dtype=np.uint64)]
+        self.max_states = max_states
+        self.full = False
+        self.seconds = 0.0
+
+    @property
+    def pegs(self):
+        """
+        The most pegs a position held can have.
+
+        """
+        return len(self.levels) - 1
+
+    def extend(self, pegs, batch=2**16):
+        """
+        Takes moves back from the positions with the most pegs held until
+        the number of pegs given is reached, or the next peg count would not
+        fit.
+
+        Parameters
+        ----------
+        pegs : int
+            The number of pegs to reach.
+        batch : int, optional
+            Number of positions whose moves are taken back at a time, to
+            limit memory use. The default is 2**16.
+
+        Returns
+        -------
+        pegs : int
+            The most pegs a position held can have.
+
+        """
+        start = time.perf_counter()
+        while self.pegs < pegs and not self.full:
+            #Removes repeats a batch at a time, so the positions of a whole
+            #level are never held more than a few times over.
+            level = self.levels[-1]
+            parts = [np.unique(canonical_array(
+                        parents_array(level[first:first+batch], self.layout),
+                        self.layout))
+                     for first in range(0, len(level), batch)]
+            level = np.unique(np.concatenate(parts))
+            if len(level) > self.max_states:
+                self.full = True
+            else:
+                self.levels.append(level)
+        self.seconds += time.perf_counter() - start
+        return self.pegs
+
+    def winnable(self, bits):
+        """
+        Looks up whether the goal can still be reached from a position. A
+        position with more pegs than are held is not known to be lost, so is
+        taken to be winnable.
+
+        Parameters
+        ----------
+        bits : int
+            Integer representing the position of the pegs.
+
+        Returns
+        -------
+        winnable : bool
+            False if the position is known to be lost.
+
+        """
+        count = bits.bit_count()
+        if count > self.pegs:
+            return True
+        keys = self.levels[count]
+        key = canonical(bits, self.layout)
+        index = int(np.searchsorted(keys, np.uint64(key)))
+        return index < len(keys) and int(keys[index]) == key
+
+    def stats(self):
+        """
+        Counts the positions held.
+
+        Returns
+        -------
+        stats : dict
+            The most pegs held, the number of positions for each peg count,
+            the MB they use and the time taken to build them.
+
+        """
+        return {"pegs": self.pegs,
+                "sizes": [len(level) for level in self.levels[1:]],
+                "mb": sum(level.nbytes for level in self.levels) / 2**20,
+                "seconds": self.seconds}
+
+
+#Stores each frontier once it has been built, so later solves on the same
+#board can reuse it.
+FRONTIERS = {}
+
+
+def bidir_solve(bits, layout, meet=None, max_states=2**21, frontier=None,
+                **kwargs):
+    """
+    Searches for a solution from both ends. Every winnable position with up
+    to the meeting number of pegs is found backwards from the goal, then
+    dfs_solve searches forwards, looking up each position it reaches with
+    that few pegs instead of searching on from it. Every position it finds
+    there is known to be winnable, so the rest of the solution is found
+    without going back.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    meet : int, optional
+        The number of pegs the two searches meet at. The default is None,
+        which uses half the pegs of the position. Fewer are used if the
+        positions with that many pegs would not fit in max_states.
+    max_states : int, optional
+        Most positions kept for one peg count of a new frontier. The default
+        is 2**21.
+    frontier : GoalFrontier, optional
+        The positions found backwards from the goal. The default is None,
+        which uses the one kept for the board in FRONTIERS.
+    **kwargs
+        Passed on to dfs_solve, apart from oracle, which is the frontier.
+
+    Returns
+    -------
+    status : str
+        See dfs_solve.
+    moves : list
+        The (from, over, to) bit indexes of each move of the solution, or None
+        if no solution was found.
+    stats : dict
+        The counters of dfs_solve, with "oracle_cuts" counting the positions
+        not found in the frontier, and "frontier" holding its stats.
+
+    """
+    if frontier is None:
+        if layout not in FRONTIERS:
+            FRONTIERS[layout] = GoalFrontier(layout, max_states)
+        frontier = FRONTIERS[layout]
+    if meet is None:
+        meet = (bits.bit_count()+1) // 2
+    frontier.extend(meet)
+    status, moves, stats = dfs_solve(bits, layout, oracle=frontier, **kwargs)
+    stats["frontier"] = frontier.stats()
+    return status, moves, stats
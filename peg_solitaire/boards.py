@@ -0,0 +1,1135 @@
+"""
+The board model of the game: the boards that can be played, the bit layout
+of their holes, the moves between positions and the notation they are
+written in.
+
+"""
+import re
+
+
+class Peg:
+    """
+    A class that represents any of the possible coordinates on the board
+    
+    ...
+    
+    Attributes
+    ----------
+    peg_type : str
+        Describes what object is occcupying a specific coordinate.
+    form : str
+        Determines what is printed for each peg_type on the board.
+    free : bool
+        Determines whether or not a peg can land in this coordinate.
+    bin_id : int
+        Determines how are peg types represented when converted to binary.      
+    
+    """
+    def __init__(self, peg_type):
+        """
+        Constructs all attributes for the different objects a coordinate can
+        hold.
+
+        Parameters
+        ----------
+        peg_type : str
+            Describes what object is occcupying a specific coordinate.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.peg_type = peg_type
+
+        if self.peg_type == "null" :
+            self.form = " "
+            self.free = False
+            self.bin_id = 0
+
+        elif self.peg_type == "empty":
+            self.form = "O"
+            self.free = True
+            self.bin_id = 0
+
+        elif self.peg_type =="peg":
+            self.form = "V"
+            self.free = False
+            self.bin_id = 1
+
+
+    def __repr__(self):
+        """
+        Makes the objects become represented by their form attribute.
+
+        Returns
+        -------
+        form : str
+            Determines what is printed for each peg_type on the board.
+        """
+        return self.form
+
+
+#Creates objects to fill the board with.
+n = Peg("null")
+e = Peg("empty")
+p = Peg("peg")
+
+#Creates list to keep track of what cheats are on/off.
+ANY_DIST = 0
+UNDO_OPT = 1
+ALT_BOARD =2
+cheats = [False,False,False]
+
+
+#Each board is drawn row by row with "o" for a hole holding a peg, "." for
+#an empty hole and a space where there is no hole. Square boards jump along
+#rows and columns, triangular ones also along the diagonal of each row, with
+#row n holding the first n holes. The goal is the (row, column) of the hole
+#the last peg has to finish in.
+BOARDS = {
+    "english": {"lattice": "square", "goal": (4, 4), "rows": [
+        "  ooo  ",
+        "  ooo  ",
+        "ooooooo",
+        "ooo.ooo",
+        "ooooooo",
+        "  ooo  ",
+        "  ooo  "]},
+    "french": {"lattice": "square", "goal": (4, 4), "rows": [
+        "  ooo  ",
+        " ooooo ",
+        "ooooooo",
+        "ooo.ooo",
+        "ooooooo",
+        " ooooo ",
+        "  ooo  "]},
+    "triangle": {"lattice": "triangle", "goal": (1, 1), "rows": [
+        ".",
+        "oo",
+        "ooo",
+        "oooo",
+        "ooooo"]},
+    "diamond": {"lattice": "square", "goal": (5, 5), "rows": [
+        "    o    ",
+        "   ooo   ",
+        "  ooooo  ",
+        " ooooooo ",
+        "oooo.oooo",
+        " ooooooo ",
+        "  ooooo  ",
+        "   ooo   ",
+        "    o    "]},
+    "cross9": {"lattice": "square", "goal": (5, 5), "rows": [
+        "   ooo   ",
+        "   ooo   ",
+        "   ooo   ",
+        "ooooooooo",
+        "oooo.oooo",
+        "ooooooooo",
+        "   ooo   ",
+        "   ooo   ",
+        "   ooo   "]},
+    "cross11": {"lattice": "square", "goal": (6, 6), "rows": [
+        "    ooo    ",
+        "    ooo    ",
+        "    ooo    ",
+        "    ooo    ",
+        "ooooooooooo",
+        "ooooo.ooooo",
+        "ooooooooooo",
+        "    ooo    ",
+        "    ooo    ",
+        "    ooo    ",
+        "    ooo    "]},
+    "cross13": {"lattice": "square", "goal": (7, 7), "rows": [
+        "     ooo     ",
+        "     ooo     ",
+        "     ooo     ",
+        "     ooo     ",
+        "     ooo     ",
+        "ooooooooooooo",
+        "oooooo.oooooo",
+        "ooooooooooooo",
+        "     ooo     ",
+        "     ooo     ",
+        "     ooo     ",
+        "     ooo     ",
+        "     ooo     "]},
+    }
+
+
+#The board picked in the cheat menu. The alternate board cheat swaps the
+#English board for the French one.
+board_type = "english"
+
+
+def selected_board():
+    """
+    Finds the name of the board currently selected in the cheat menu.
+
+    Returns
+    -------
+    name : str
+        A key of BOARDS.
+
+    """
+    if cheats[ALT_BOARD] == True and board_type == "english":
+        return "french"
+    return board_type
+
+
+def select_board(name):
+    """
+    Picks the board played on, turning the alternate board cheat off.
+
+    Parameters
+    ----------
+    name : str
+        A key of BOARDS.
+
+    Raises
+    ------
+    ValueError
+        Raised if there is no board with that name.
+
+    Returns
+    -------
+    None.
+
+    """
+    global board_type
+    if name not in BOARDS:
+        raise ValueError(f"There is no board called {name}")
+    board_type = name
+    cheats[ALT_BOARD] = False
+
+
+def board_rows(name=None):
+    """
+    Builds the rows of a board as lists, without needing numpy.
+
+    Parameters
+    ----------
+    name : str, optional
+        Key of BOARDS to build. The default is None, which uses the board
+        selected in the cheat menu.
+
+    Returns
+    -------
+    board : list
+        A list for each row, the first holding the column letters and the
+        rest starting with their row number followed by peg classes.
+
+    """
+    rows = BOARDS[name or selected_board()]["rows"]
+    size = max(len(rows), *map(len, rows))
+
+    #Labels the columns with letters and the rows with numbers, then fills
+    #in the holes drawn in the board definition.
+    board = [["  "] + [chr(65+col) for col in range(size)]]
+    for row in range(size):
+        board.append([row+1] + [n]*size)
+        if row < len(rows):
+            for col, cell in enumerate(rows[row]):
+                if cell == "o":
+                    board[row+1][col+1] = p
+                elif cell == ".":
+                    board[row+1][col+1] = e
+    return board
+
+
+def init_board(name=None):
+    """
+    Resets the board to  its initial state
+
+    Parameters
+    ----------
+    name : str, optional
+        Key of BOARDS to build. The default is None, which uses the board
+        selected in the cheat menu.
+
+    Returns
+    -------
+    board : numpy.ndarray
+        Numpy array containing coordinates and peg classes
+
+    """
+    import numpy as np
+
+    return np.array(board_rows(name), dtype=object)
+
+
+class Layout:
+    """
+    A class that maps every hole of a board onto one bit of an integer, so a
+    whole position can be stored, moved and compared using shifts and masks.
+
+    ...
+
+    Attributes
+    ----------
+    width : int
+        Number of columns in the grid the holes are placed on.
+    holes : list
+        Bit index of every hole, in the order they appear on the board.
+    coords : dict
+        Maps the bit index of a hole onto its (row, column) in the board array.
+    bits : dict
+        Maps a (row, column) of the board array onto the bit index of a hole.
+    mask : int
+        Integer with the bit of every hole set.
+    start : int
+        Integer with the bit of every hole holding a peg at the start set.
+    goal : int
+        Integer with only the bit of the hole the last peg has to finish in
+        set.
+    lattice : str
+        "square" if pegs jump along rows and columns, or "triangle" if they
+        also jump along the diagonal of each row.
+    steps : list
+        The (row, column) step of each direction a peg can jump in.
+    words : int
+        Number of 64 bit words needed to store a position.
+    dirs : list
+        A (shift, from_mask) pair for every direction a peg can jump in, where
+        from_mask has the bit of every hole a jump in that direction can start
+        from set.
+    template : list
+        Copy of the rows of the board used to convert integers back into
+        boards.
+    jumps : list
+        The (from, over, to) bit indexes of every jump the board allows.
+    jump_checks : list
+        A (from_over, to) pair of masks for each jump, used to test if it can
+        be made.
+    jump_names : dict
+        Maps each jump written as in the solution files, e.g. b4d4, onto its
+        index.
+    jumps_from : dict
+        Maps each hole onto the indexes of the jumps starting there.
+    jumps_over : dict
+        Maps each hole onto the indexes of the jumps passing over it.
+    jumps_to : dict
+        Maps each hole onto the indexes of the jumps landing there.
+    rays : dict
+        Maps each hole onto a tuple for each direction of the holes in a
+        line from it, nearest first, up to the edge of the board, used to
+        find the moves of the any distance cheat.
+    hole_jumps : list
+        The jump table as a (from, over, to) list of hole numbers for each
+        jump, counting the holes in the order of holes, for working on many
+        positions at once.
+    symmetries : list
+        Every rotation and reflection of the board that keeps the holes and
+        the goal hole in place, as a dict mapping each bit onto its image.
+    sym_tables : list
+        A (shift, table) pair for each byte of the position, where the table
+        gives the images of every possible value of that byte under all of
+        the symmetries.
+
+    """
+    def __init__(self, board, lattice="square", goal=None):
+        """
+        Constructs the bit mapping for the holes of the board given.
+
+        Parameters
+        ----------
+        board : numpy.ndarray
+            Numpy array containing coordinates and peg classes, or the rows
+            made by board_rows.
+        lattice : str, optional
+            "square" or "triangle", see BOARDS. The default is "square".
+        goal : tuple, optional
+            The (row, column) of the hole the last peg has to finish in. The
+            default is None, which uses the middle of the board.
+
+        Raises
+        ------
+        ValueError
+            Raised if the lattice is unknown or the goal is not a hole.
+
+        Returns
+        -------
+        None.
+
+        """
+        if lattice not in ("square", "triangle"):
+            raise ValueError(f"Unknown lattice {lattice}")
+        self.lattice = lattice
+        self.width = len(board[0]) - 1
+        self.holes = []
+        self.coords = {}
+        self.bits = {}
+        self.mask = 0
+        self.start = 0
+        self.template = [list(row) for row in board]
+
+        #Gives every hole on the board a bit, numbered row by row.
+        for row in range(1, len(board)):
+            for col in range(1, len(board[row])):
+                if board[row][col] == n:
+                    continue
+                bit = (row-1)*self.width + col-1
+                self.holes.append(bit)
+                self.coords[bit] = (row, col)
+                self.bits[(row, col)] = bit
+                self.mask |= 1 << bit
+                if board[row][col] == p:
+                    self.start |= 1 << bit
+
+        size = len(board) - 1
+        if goal is None:
+            goal = ((size+1)//2, (size+1)//2)
+        if goal not in self.bits:
+            raise ValueError(f"The goal {goal} is not a hole")
+        self.goal = 1 << self.bits[goal]
+        self.words = -(-(max(self.holes)+1)//64)
+
+        #Works out which holes can start a jump in each direction, so that
+        #shifting never wraps a jump around the edge of a row.
+        self.steps = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        if lattice == "triangle":
+            self.steps += [(1, 1), (-1, -1)]
+        self.dirs = []
+        for d_row, d_col in self.steps:
+            from_mask = 0
+            for bit, (row, col) in self.coords.items():
+                if ((row+d_row, col+d_col) in self.bits and
+                        (row+2*d_row, col+2*d_col) in self.bits):
+                    from_mask |= 1 << bit
+            self.dirs.append((d_row*self.width + d_col, from_mask))
+
+        #Lists every jump once so moves can be found by scanning the table,
+        #with indexes of the jumps touching each hole.
+        self.jumps = []
+        self.jumps_from = {bit: [] for bit in self.holes}
+        self.jumps_over = {bit: [] for bit in self.holes}
+        self.jumps_to = {bit: [] for bit in self.holes}
+        for shift, from_mask in self.dirs:
+            for frm in self.holes:
+                if from_mask >> frm & 1:
+                    self.jumps_from[frm].append(len(self.jumps))
+                    self.jumps_over[frm+shift].append(len(self.jumps))
+                    self.jumps_to[frm+2*shift].append(len(self.jumps))
+                    self.jumps.append((frm, frm+shift, frm+2*shift))
+        self.jump_checks = [(1 << frm | 1 << over, 1 << to)
+                            for frm, over, to in self.jumps]
+        self.jump_names = {}
+        for index, (frm, over, to) in enumerate(self.jumps):
+            (row_from, col_from), (row_to, col_to) = (self.coords[frm],
+                                                      self.coords[to])
+            name = f"{chr(96+col_from)}{row_from}{chr(96+col_to)}{row_to}"
+            self.jump_names[name] = index
+        number = {bit: count for count, bit in enumerate(self.holes)}
+        self.hole_jumps = [[number[bit] for bit in jump]
+                           for jump in self.jumps]
+
+        #Follows each direction from every hole until it leaves the board,
+        #leaving out directions with no hole next to the peg.
+        self.rays = {}
+        for bit, (row, col) in self.coords.items():
+            self.rays[bit] = []
+            for d_row, d_col in self.steps:
+                ray = []
+                hole = (row+d_row, col+d_col)
+                while hole in self.bits:
+                    ray.append(self.bits[hole])
+                    hole = (hole[0]+d_row, hole[1]+d_col)
+                if ray:
+                    self.rays[bit].append(tuple(ray))
+
+        #Keeps each rotation and reflection of the grid that maps the board
+        #onto itself, without moving the hole a peg has to finish in. The
+        #turns of a triangle swap the distances of a hole from its three
+        #sides, which are c-1, r-c and size-r.
+        if lattice == "square":
+            turns = (lambda r, c: (r, c),
+                     lambda r, c: (c, size+1-r),
+                     lambda r, c: (size+1-r, size+1-c),
+                     lambda r, c: (size+1-c, r),
+                     lambda r, c: (r, size+1-c),
+                     lambda r, c: (size+1-r, c),
+                     lambda r, c: (c, r),
+                     lambda r, c: (size+1-c, size+1-r))
+        else:
+            turns = []
+            for order in ((0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0),
+                          (2, 0, 1), (2, 1, 0)):
+                def turn(r, c, order=order):
+                    sides = (c-1, r-c, size-r)
+                    return (size-sides[order[2]], sides[order[0]]+1)
+                turns.append(turn)
+        self.symmetries = []
+        for turn in turns:
+            images = [turn(*self.coords[bit]) for bit in self.holes]
+            if (all(image in self.bits for image in images) and
+                    turn(*goal) == goal):
+                self.symmetries.append(
+                    {bit: self.bits[image]
+                     for bit, image in zip(self.holes, images)})
+
+        #Splits the symmetries into byte sized lookup tables, so the images
+        #of a position are found with one lookup per byte.
+        self.sym_tables = []
+        for shift in range(0, max(self.holes)+1, 8):
+            table = []
+            for value in range(256):
+                table.append(tuple(
+                    sum(1 << sym[shift+bit] for bit in range(8)
+                        if value >> bit & 1 and shift+bit in sym)
+                    for sym in self.symmetries))
+            self.sym_tables.append((shift, table))
+
+    def parse_hole(self, text):
+        """
+        Reads the coordinates of a hole written as a letter followed by a
+        number, e.g. D4 or k10.
+
+        Parameters
+        ----------
+        text : str
+            The coordinates of the hole.
+
+        Raises
+        ------
+        ValueError
+            Raised if the coordinates are badly written or there is no hole
+            there.
+
+        Returns
+        -------
+        hole : tuple
+            The (row, column) of the hole in the board array.
+
+        """
+        found = re.fullmatch(r"([A-Za-z])([0-9]+)", text.strip())
+        if found is None:
+            raise ValueError(f"{text} is not a letter followed by a number")
+        hole = (int(found[2]), ord(found[1].upper())-64)
+        if hole not in self.bits:
+            raise ValueError(f"{text} is not a hole on this board")
+        return hole
+
+    def hole_name(self, hole):
+        """
+        Writes the coordinates of a hole as a capital letter followed by a
+        number, the reverse of parse_hole.
+
+        Parameters
+        ----------
+        hole : tuple
+            The (row, column) of the hole in the board array.
+
+        Returns
+        -------
+        text : str
+            The coordinates of the hole.
+
+        """
+        return f"{chr(64+hole[1])}{hole[0]}"
+
+
+#Stores each layout once it has been built.
+LAYOUTS = {}
+
+
+def get_layout(name=None):
+    """
+    Finds the layout for the board currently selected in the cheat menu.
+
+    Parameters
+    ----------
+    name : str, optional
+        Key of BOARDS to find the layout of. The default is None, which uses
+        the board selected in the cheat menu.
+
+    Returns
+    -------
+    layout : Layout
+        The bit mapping for the current board.
+
+    """
+    name = name or selected_board()
+    if name not in LAYOUTS:
+        LAYOUTS[name] = Layout(board_rows(name), BOARDS[name]["lattice"],
+                               BOARDS[name]["goal"])
+    return LAYOUTS[name]
+
+
+def to_bits(board, layout):
+    """
+    Converts a board array into an integer with a bit set for every peg.
+
+    Parameters
+    ----------
+    board : numpy.ndarray or list
+        Numpy array or nested list containing coordinates and peg classes
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    bits : int
+        Integer representing the position of the pegs.
+
+    """
+    bits = 0
+    for bit in layout.holes:
+        row, col = layout.coords[bit]
+        if board[row][col] == p:
+            bits |= 1 << bit
+    return bits
+
+
+def to_board(bits, layout):
+    """
+    Converts an integer position back into a board array, so it can be shown
+    or used by the interfaces.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    board : numpy.ndarray
+        Numpy array containing coordinates and peg classes
+
+    """
+    import numpy as np
+
+    board = np.array(layout.template, dtype=object)
+    for bit in layout.holes:
+        board[layout.coords[bit]] = p if bits >> bit & 1 else e
+    return board
+
+
+def jump_sources(bits, layout):
+    """
+    Finds every hole a jump can start from in each direction.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    sources : list
+        A (shift, from_bits) pair for each direction, where from_bits has the
+        bit of every peg that can jump in that direction set.
+
+    """
+    empty = layout.mask & ~bits
+    sources = []
+    for shift, from_mask in layout.dirs:
+        #Shifts the pegs and holes back onto the peg that would be jumping.
+        if shift > 0:
+            from_bits = bits & bits >> shift & empty >> 2*shift & from_mask
+        else:
+            from_bits = bits & bits << -shift & empty << -2*shift & from_mask
+        sources.append((shift, from_bits))
+    return sources
+
+
+def count_moves(bits, layout):
+    """
+    Counts the moves available using masks only.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    move_count : int
+        How many moves can be made from the position.
+
+    """
+    return sum(from_bits.bit_count()
+               for shift, from_bits in jump_sources(bits, layout))
+
+
+def gen_moves(bits, layout):
+    """
+    Lists every move available by scanning the jump table of the board.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    moves : list
+        A list of (from, over, to) bit indexes for every possible move.
+
+    """
+    return [jump for jump, (from_over, to) in zip(layout.jumps,
+                                                  layout.jump_checks)
+            if bits & from_over == from_over and not bits & to]
+
+
+def moves_from(bits, bit, layout):
+    """
+    Lists the moves available to the peg in a single hole.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    bit : int
+        Bit index of the hole holding the peg.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    moves : list
+        A list of (from, over, to) bit indexes for every possible move.
+
+    """
+    moves = []
+    for index in layout.jumps_from[bit]:
+        from_over, to = layout.jump_checks[index]
+        if bits & from_over == from_over and not bits & to:
+            moves.append(layout.jumps[index])
+    return moves
+
+
+def ray_moves_from(bits, bit, layout):
+    """
+    Lists the moves available to the peg in a single hole when the any
+    distance cheat is on. A peg can move along a line to any empty hole,
+    removing every peg it passes over, so it can also slide over empty
+    holes without removing any.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    bit : int
+        Bit index of the hole holding the peg.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    moves : list
+        A tuple for every possible move of the bit index it starts from,
+        the bit index of each peg it removes and the bit index it ends in.
+
+    """
+    moves = []
+    for ray in layout.rays[bit]:
+        over = ()
+        for hole in ray:
+            if bits >> hole & 1:
+                over += (hole,)
+            else:
+                moves.append((bit, *over, hole))
+    return moves
+
+
+def ray_moves(bits, layout):
+    """
+    Lists every move available when the any distance cheat is on, using the
+    ray tables of the layout.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    moves : list
+        A tuple for every possible move, see ray_moves_from.
+
+    """
+    return [move for bit in layout.holes if bits >> bit & 1
+            for move in ray_moves_from(bits, bit, layout)]
+
+
+def apply_move(bits, move):
+    """
+    Makes a move by flipping the three holes it changes.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    move : tuple
+        The (from, over, to) bit indexes of the move.
+
+    Returns
+    -------
+    bits : int
+        Integer representing the position after the move.
+
+    """
+    return bits ^ (1 << move[0] | 1 << move[1] | 1 << move[2])
+
+
+def apply_ray(bits, move):
+    """
+    Makes a move of any distance by flipping every hole it changes. Taking
+    the move back is the same as making it again. Also works on the (from,
+    over, to) moves of apply_move, but is slower.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    move : tuple
+        The bit indexes of the hole the move starts from, each peg it
+        removes and the hole it ends in.
+
+    Returns
+    -------
+    bits : int
+        Integer representing the position after the move.
+
+    """
+    for bit in move:
+        bits ^= 1 << bit
+    return bits
+
+
+def undo_move(bits, move):
+    """
+    Takes back a move made with apply_move. Flipping the same holes again
+    returns them to how they were.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position after the move.
+    move : tuple
+        The (from, over, to) bit indexes of the move.
+
+    Returns
+    -------
+    bits : int
+        Integer representing the position before the move.
+
+    """
+    return bits ^ (1 << move[0] | 1 << move[1] | 1 << move[2])
+
+
+def has_won(bits, layout):
+    """
+    Checks for a single peg left in the middle of the board.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    won : bool
+        True if the winning condition is fulfilled.
+
+    """
+    return bits == layout.goal
+
+
+def gen_boards(bits, layout):
+    """
+    Generates a list of integers representing the current board from all
+    rotations and reflections, using the byte lookup tables of the layout.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    images : list
+        A list containing an integer for the board under every symmetry.
+
+    """
+    return [sum(images) for images in
+            zip(*[table[bits >> shift & 255]
+                  for shift, table in layout.sym_tables])]
+
+
+def canonical(bits, layout):
+    """
+    Finds the key shared by a position and all its rotations and reflections,
+    which is the smallest of their integers.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    key : int
+        The canonical integer for the position.
+
+    """
+    return min(map(sum, zip(*[table[bits >> shift & 255]
+                              for shift, table in layout.sym_tables])))
+
+
+def move_text(move, layout):
+    """
+    Writes a move in the same notation as the solution files, e.g. b4d4.
+
+    Parameters
+    ----------
+    move : tuple
+        The (from, over, to) bit indexes of the move, or any move made by
+        ray_moves, which also start and end with the holes it moves between.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    text : str
+        The letter and number of the start and end hole of the move.
+
+    """
+    (row_from, col_from), (row_to, col_to) = (layout.coords[move[0]],
+                                              layout.coords[move[-1]])
+    return f"{chr(96+col_from)}{row_from}{chr(96+col_to)}{row_to}"
+
+
+def parse_moves(text, layout, bits=None):
+    """
+    Reads a comma separated list of moves, e.g. b4d4,c6c4, checking that each
+    one can be made.
+
+    Parameters
+    ----------
+    text : str
+        The moves in the notation of the solution files.
+    layout : Layout
+        The bit mapping for the board.
+    bits : int, optional
+        Position the moves are made from. The default is None, which uses the
+        starting position.
+
+    Raises
+    ------
+    ValueError
+        Raised if a move is badly written or cannot be made.
+
+    Returns
+    -------
+    moves : list
+        The (from, over, to) bit indexes of each move.
+    bits : int
+        Integer representing the position after the moves.
+
+    """
+    if bits is None:
+        bits = layout.start
+    moves = []
+    for step, word in enumerate(text.replace(" ", "").split(","), 1):
+        if not word:
+            continue
+        holes = re.fullmatch(r"([A-Za-z][0-9]+)([A-Za-z][0-9]+)", word)
+        try:
+            frm, to = (layout.bits[layout.parse_hole(hole)]
+                       for hole in holes.groups())
+        except (AttributeError, ValueError):
+            raise ValueError(f"Step {step} was invalid: {word}")
+        move = next((move for move in moves_from(bits, frm, layout)
+                     if move[-1] == to), None)
+        if move is None:
+            raise ValueError(f"Step {step} is not a legal move: {word}")
+        moves.append(move)
+        bits = apply_move(bits, move)
+    return moves, bits
+
+
+def parse_position(text, layout):
+    """
+    Reads a position written either as one 1 or 0 for each hole, in the order
+    the holes appear on the board, or as a list of moves from the start.
+
+    Parameters
+    ----------
+    text : str
+        The position.
+    layout : Layout
+        The bit mapping for the board.
+
+    Raises
+    ------
+    ValueError
+        Raised if the position cannot be read.
+
+    Returns
+    -------
+    bits : int
+        Integer representing the position of the pegs.
+
+    """
+    text = text.strip()
+    if text and set(text) <= {"0", "1"}:
+        if len(text) != len(layout.holes):
+            raise ValueError(f"Position needs {len(layout.holes)} holes, "
+                             f"got {len(text)}")
+        return sum(1 << bit for bit, peg in zip(layout.holes, text)
+                   if peg == "1")
+    return parse_moves(text, layout)[1]
+
+
+def format_position(bits, layout):
+    """
+    Writes a position as one 1 or 0 for each hole, in the order the holes
+    appear on the board.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    text : str
+        The position.
+
+    """
+    return "".join("1" if bits >> bit & 1 else "0" for bit in layout.holes)
+
+
+def format_board(bits, layout):
+    """
+    Draws a position the same way show_board prints a board array, without
+    needing numpy.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    text : str
+        The board, one line per row with the coordinates labelled.
+
+    """
+    rows = [list(row) for row in layout.template]
+    for bit in layout.holes:
+        row, col = layout.coords[bit]
+        rows[row][col] = p if bits >> bit & 1 else e
+
+    #Pads the row numbers so boards with more than nine rows line up.
+    width = len(str(len(rows)-1))
+    lines = [" ".join([" "*(width+1), *map(str, rows[0][1:]), " "])]
+    for row in rows[1:]:
+        lines.append(" ".join(["", str(row[0]).rjust(width),
+                               *map(str, row[1:])]))
+    return "\n".join(lines)
+
+
+def moves_left(board, find_move=False):
+    """
+    Calculates all possible moves that can be maode on the current board.
+
+    Parameters
+    ----------
+    board : numpy.ndarray
+        A 2D array that stores information on each space on the boards status.
+    find_move : boolean, optional
+        Provides an alternative part to the funciton that returns what moves
+        can be made, not just how many. The default is False.
+
+    Returns
+    -------
+    pos_moves: list
+        A list containg the start and end coordinates for any potential moves
+        for the current board.
+    move_count: int
+        An integer value of how many potential moves for the current board are
+        available.
+
+    """
+    layout = get_layout()
+    bits = to_bits(board, layout)
+
+    #Pegs that can move any distance are followed along the ray tables.
+    if cheats[ANY_DIST]:
+        moves = ray_moves(bits, layout)
+        if find_move == True:
+            return [[layout.coords[move[0]], layout.coords[move[-1]]]
+                    for move in moves]
+        return len(moves)
+
+    if find_move == True:
+        #Scans the jump table and converts the moves found into coordinates.
+        return [[layout.coords[frm], layout.coords[to]]
+                for frm, over, to in gen_moves(bits, layout)]
+    return count_moves(bits, layout)
+
+
+def move_board(coords_to, coords_from, diff, board):
+    """
+    Moves a peg on a board array, removing every peg it jumps over.
+
+    Parameters
+    ----------
+    coords_to : numpy.ndarray
+        An array containing the selected destination coordinates for a peg.
+    coords_from : numpy.ndarray
+        Array containing the coordinates for the selected peg to move.
+    diff : numpy.ndarray
+        The (row, column) distance between coords_from and coords_to.
+    board : numpy.ndarray
+        Numpy array containing coordinates and peg classes.
+
+    Returns
+    -------
+    cells : list
+        The (row, column) of every cell that was changed.
+
+    """
+    row = 0
+    col = 1
+
+    #Changes the end spot to a peg.
+    board[coords_to[row],coords_to[col]] = p
+    cells = [(coords_to[row], coords_to[col])]
+
+    #Deteremines the direction of the move, which is along a row, a column
+    #or the diagonal of a triangular board.
+    length = max(abs(diff[row]), abs(diff[col]))
+    step = (int(diff[row]//length), int(diff[col]//length))
+
+    #Removes the moved peg and any pegs that are jumped over.
+    for i in range(length):
+        cell_row = coords_from[row] + i*step[row]
+        cell_col = coords_from[col] + i*step[col]
+        board[cell_row, cell_col] = e
+        cells.append((cell_row, cell_col))
+    return cells
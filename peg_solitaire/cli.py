@@ -0,0 +1,575 @@
+"""
+The command line interface, for solving, checking and replaying games in
+scripts and pipelines without the menus, e.g.
+
+    python -m peg_solitaire solve "d2d4,f3d3" --format json
+    python -m peg_solitaire verify full_solution.txt
+    python -m peg_solitaire replay partial_solution.txt --board english
+
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from .batch import batch_file
+from .boards import (BOARDS, format_board, format_position, get_layout,
+                     has_won, move_text, parse_moves, parse_position)
+from .solver import MoveOrder, beam_solve, dfs_solve
+from .verify import verdict_text, verify_file, verify_lines
+
+
+#The subcommands, so the game script knows when to hand over to main.
+COMMANDS = ("solve", "verify", "replay", "bench", "batch", "oracle", "pack",
+            "unpack", "count")
+#Matches moves written on the command line, e.g. b4d4,c6c4.
+MOVES_PATTERN = re.compile(r"\s*[a-z]\d+[a-z]\d+(\s*,\s*[a-z]\d+[a-z]\d+)*"
+                           r"\s*,?\s*", re.IGNORECASE)
+
+
+def read_moves(source):
+    """
+    Reads a list of moves from a file, standard input or the command line.
+    Moves may be split over several lines.
+
+    Parameters
+    ----------
+    source : str
+        A file of moves, "-" for standard input, or the moves themselves.
+
+    Returns
+    -------
+    text : str
+        The moves as one comma separated list.
+
+    """
+    if source == "-":
+        text = sys.stdin.read()
+    elif Path(source).is_file():
+        text = Path(source).read_text()
+    else:
+        text = source
+    return ",".join(line.strip() for line in text.splitlines())
+
+
+def write_result(result, form, text):
+    """
+    Prints the result of a command either as JSON or as plain text.
+
+    Parameters
+    ----------
+    result : dict
+        Everything the command found.
+    form : str
+        "json" or "text".
+    text : str
+        What is printed for the text format.
+
+    Returns
+    -------
+    None.
+
+    """
+    if form == "json":
+        print(json.dumps(result))
+    else:
+        print(text)
+
+
+def solve_command(args):
+    """
+    Solves each position given and prints the moves of the solution.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        0 if every position was solved, 1 if any was not and 2 if any could
+        not be read.
+
+    """
+    layout = get_layout(args.board)
+    order = MoveOrder()
+    oracle = None
+    if not args.no_oracle and not args.any_dist:
+        from .oracle import load_oracle
+        oracle = load_oracle(layout)
+    frontier = None
+    if args.bidir:
+        from .bidir import GoalFrontier
+        try:
+            frontier = GoalFrontier(layout)
+        except ValueError as error:
+            write_result({"error": str(error)}, args.format, f"{error}")
+            return 2
+
+    positions = ((line for line in sys.stdin if line.strip())
+                 if args.position == "-" else [read_moves(args.position)])
+    code = 0
+    for text in positions:
+        try:
+            bits = parse_position(text, layout)
+        except ValueError as error:
+            write_result({"error": str(error)}, args.format, f"{error}")
+            code = 2
+            continue
+
+        start = time.perf_counter()
+        if args.any_dist:
+            #The oracle and pruning only know normal jumps.
+            status, moves, stats = dfs_solve(bits, layout, order=order,
+                                             max_nodes=args.max_nodes,
+                                             any_dist=True)
+        elif args.beam is not None:
+            status, moves, stats = beam_solve(bits, layout, width=args.beam,
+                                              order=order)
+        elif frontier is not None:
+            from .bidir import bidir_solve
+            status, moves, stats = bidir_solve(bits, layout,
+                                               frontier=frontier,
+                                               order=order,
+                                               max_nodes=args.max_nodes,
+                                               prune=True)
+        elif args.workers is not None:
+            from .parallel import parallel_solve
+            status, moves, stats = parallel_solve(bits, layout,
+                                                  workers=args.workers,
+                                                  order=order, prune=True,
+                                                  oracle=oracle)
+        else:
+            status, moves, stats = dfs_solve(bits, layout, order=order,
+                                             max_nodes=args.max_nodes,
+                                             oracle=oracle, prune=True)
+        moves = (None if moves is None else
+                 ",".join(move_text(move, layout) for move in moves))
+        write_result({"position": format_position(bits, layout),
+                      "status": status, "moves": moves,
+                      "nodes": stats["nodes"],
+                      "seconds": round(time.perf_counter() - start, 6)},
+                     args.format,
+                     moves if status == "solved" else f"No solution: {status}")
+        if status != "solved":
+            code = max(code, 1)
+    return code
+
+
+def verify_command(args):
+    """
+    Checks every game of a solution archive, one game per line, printing a
+    verdict for each.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        0 if every game wins, 1 if any has legal moves that do not win and
+        2 if any has an invalid move or the start cannot be read.
+
+    """
+    layout = get_layout(args.board)
+    try:
+        bits = parse_position(args.start, layout) if args.start else None
+    except ValueError as error:
+        write_result({"error": str(error)}, args.format, f"{error}")
+        return 2
+
+    #Moves given on the command line, or a file saved one move per line, are
+    #checked as a single game.
+    found = args.solution == "-" or Path(args.solution).is_file()
+    if not found and not MOVES_PATTERN.fullmatch(args.solution):
+        error = f"{args.solution} is not a file or a list of moves"
+        write_result({"error": error}, args.format, error)
+        return 2
+    if args.one_game or not found:
+        counts = {"valid": 0, "incomplete": 0, "invalid": 0}
+        for result in verify_lines([read_moves(args.solution)], layout,
+                                   bits):
+            counts[result["verdict"]] += 1
+            write_result(result, args.format, verdict_text(result))
+    else:
+        counts = verify_file(args.solution, layout=layout, bits=bits,
+                             form=args.format, workers=args.workers)
+    if counts["invalid"]:
+        return 2
+    return 1 if counts["incomplete"] else 0
+
+
+def replay_command(args):
+    """
+    Makes a list of moves and prints the board they finish on.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        0 if every move could be made and 2 otherwise.
+
+    """
+    layout = get_layout(args.board)
+    try:
+        bits = parse_position(args.start, layout) if args.start else None
+        moves, bits = parse_moves(read_moves(args.moves), layout, bits)
+    except (OSError, ValueError) as error:
+        write_result({"error": str(error)}, args.format, f"{error}")
+        return 2
+
+    write_result({"position": format_position(bits, layout),
+                  "moves": len(moves), "pegs": bits.bit_count(),
+                  "won": has_won(bits, layout)}, args.format,
+                 format_board(bits, layout))
+    return 0
+
+
+def bench_command(args):
+    """
+    Runs the benchmarks, and compares them with an earlier run if asked.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        Always 0.
+
+    """
+    from .bench import (BENCH_BOARDS, BENCH_SEED, compare_benchmarks,
+                        run_benchmarks)
+
+    show = args.format == "text"
+    seed = BENCH_SEED if args.seed is None else args.seed
+    results = run_benchmarks(args.out, seed=seed,
+                             max_nodes=args.max_nodes,
+                             boards=args.board or BENCH_BOARDS, show=show,
+                             bidir=args.bidir, workers=args.workers)
+    if args.compare is not None:
+        results = {"results": results,
+                   "ratios": compare_benchmarks(args.compare, results,
+                                                show=show)}
+    if not show:
+        print(json.dumps(results))
+    return 0
+
+
+def batch_command(args):
+    """
+    Solves a file of positions, writing each result as a line of JSON.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        Always 0.
+
+    """
+    layout = get_layout(args.board)
+    oracle = None
+    if not args.no_oracle:
+        from .oracle import load_oracle
+        oracle = load_oracle(layout)
+    batch_file(args.positions, layout=layout, max_nodes=args.max_nodes,
+               oracle=oracle)
+    return 0
+
+
+def oracle_command(args):
+    """
+    Builds the solvability oracle for the English board.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        Always 0.
+
+    """
+    from .oracle import build_oracle
+
+    build_oracle(args.path)
+    return 0
+
+
+def pack_command(args):
+    """
+    Converts a text archive of games into a binary one.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        Always 0.
+
+    """
+    from .archive import pack_text
+
+    count = pack_text(args.games, args.archive, args.board, args.append)
+    write_result({"games": count}, args.format,
+                 f"{count} games written to {args.archive}")
+    return 0
+
+
+def unpack_command(args):
+    """
+    Writes every game of a binary archive as a line of text.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        Always 0.
+
+    """
+    from .archive import unpack_text
+
+    if args.games is None:
+        unpack_text(args.archive)
+    else:
+        with open(args.games, "w") as out:
+            unpack_text(args.archive, out)
+    return 0
+
+
+def count_command(args):
+    """
+    Counts every winning sequence of moves from a position, reporting how
+    the count is going on standard error.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        The parsed command line.
+
+    Returns
+    -------
+    code : int
+        0 once counted and 2 if the position could not be read or the board
+        is too big to count on.
+
+    """
+    from .count import CountMemo, count_solutions, format_count
+
+    layout = get_layout(args.board)
+    try:
+        bits = parse_position(args.position, layout)
+    except ValueError as error:
+        write_result({"error": str(error)}, args.format, f"{error}")
+        return 2
+    oracle = None
+    if not args.no_oracle:
+        from .oracle import load_oracle
+        oracle = load_oracle(layout)
+
+    memo = CountMemo(args.memo_mb, args.spill)
+    try:
+        count, stats = count_solutions(
+            bits, layout, memo, oracle,
+            progress=lambda stats: print(format_count(stats),
+                                         file=sys.stderr),
+            every=args.every)
+    except ValueError as error:
+        write_result({"error": str(error)}, args.format, f"{error}")
+        return 2
+    finally:
+        memo.close()
+    write_result({"position": format_position(bits, layout),
+                  "solutions": str(count), "stats": stats}, args.format,
+                 f"{count:,} solutions\n{format_count(stats)}")
+    return 0
+
+
+def build_parser():
+    """
+    Describes every subcommand and its options.
+
+    Returns
+    -------
+    parser : argparse.ArgumentParser
+        Parser of the command line.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="peg_solitaire",
+        description="Solve, check and replay games of peg solitaire.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    #Options shared by the subcommands.
+    form = argparse.ArgumentParser(add_help=False)
+    form.add_argument("--format", choices=("text", "json"), default="text",
+                      help="output format")
+    common = argparse.ArgumentParser(add_help=False, parents=[form])
+    common.add_argument("--board", choices=BOARDS, default="english",
+                        help="board to play on (default: english)")
+
+    solve = commands.add_parser(
+        "solve", parents=[common], help="print the moves that solve a "
+        "position")
+    solve.add_argument("position", nargs="?", default="",
+                       help="moves from the start or a 1 or 0 for each "
+                       "hole, or a file of them; - reads one position per "
+                       "line from standard input (default: the start)")
+    solve.add_argument("--max-nodes", type=int, default=None,
+                       help="positions to search before giving up")
+    search = solve.add_mutually_exclusive_group()
+    search.add_argument("--beam", type=int, default=None, metavar="WIDTH",
+                        help="use a beam search keeping WIDTH positions")
+    search.add_argument("--bidir", action="store_true",
+                        help="search back from the goal as well, meeting "
+                        "at half the pegs")
+    search.add_argument("--any-dist", action="store_true",
+                        help="let pegs move any distance, as the cheat does")
+    search.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="split the search over N processes, searching "
+                        "without a --max-nodes limit")
+    solve.add_argument("--no-oracle", action="store_true",
+                       help="do not skip the positions the endgame oracle "
+                       "knows are lost")
+    solve.set_defaults(run=solve_command)
+
+    verify = commands.add_parser(
+        "verify", parents=[common], help="check that solutions win, "
+        "setting the exit code")
+    verify.add_argument("solution", help="file of games, one per line, - "
+                        "for standard input, or the moves of one game")
+    verify.add_argument("--start", default=None,
+                        help="position the moves are made from")
+    verify.add_argument("--workers", type=int, default=1,
+                        help="processes to check games in (default: 1)")
+    verify.add_argument("--one-game", action="store_true",
+                        help="read the whole file as one game, as saved "
+                        "by the game one move per line")
+    verify.set_defaults(run=verify_command)
+
+    replay = commands.add_parser(
+        "replay", parents=[common], help="make some moves and print the "
+        "board")
+    replay.add_argument("moves", help="file of moves, - for standard input, "
+                        "or the moves themselves")
+    replay.add_argument("--start", default=None,
+                        help="position the moves are made from")
+    replay.set_defaults(run=replay_command)
+
+    bench = commands.add_parser(
+        "bench", parents=[form], help="time the engine and solver")
+    bench.add_argument("out", nargs="?", default=None,
+                       help="file the results are saved to")
+    bench.add_argument("--board", choices=BOARDS, action="append",
+                       help="board to run on, may be repeated (default: "
+                       "english and french)")
+    bench.add_argument("--compare", default=None, metavar="OLD",
+                       help="earlier results to compare the new ones with")
+    bench.add_argument("--seed", type=int, default=None,
+                       help="seed of the random positions (default: 2024)")
+    bench.add_argument("--max-nodes", type=int, default=50000,
+                       help="positions to search before giving up")
+    bench.add_argument("--bidir", action="store_true",
+                       help="also compare the bidirectional search with the "
+                       "forward one")
+    bench.add_argument("--workers", type=int, default=None, metavar="N",
+                       help="also time the parallel solve of each start with "
+                       "up to N processes")
+    bench.set_defaults(run=bench_command)
+
+    batch = commands.add_parser(
+        "batch", parents=[common], help="solve a file of positions, "
+        "writing JSON lines")
+    batch.add_argument("positions", help="file of positions, or - for "
+                       "standard input")
+    batch.add_argument("--max-nodes", type=int, default=None,
+                       help="positions to search before giving up")
+    batch.add_argument("--no-oracle", action="store_true",
+                       help="do not skip the positions the endgame oracle "
+                       "knows are lost")
+    batch.set_defaults(run=batch_command)
+
+    oracle = commands.add_parser(
+        "oracle", help="build the endgame oracle for the English board")
+    oracle.add_argument("path", nargs="?", default=None,
+                        help="where to save it")
+    oracle.set_defaults(run=oracle_command)
+
+    pack = commands.add_parser(
+        "pack", parents=[common], help="convert games, one per line, into "
+        "a binary archive")
+    pack.add_argument("games", help="file of games, or - for standard input")
+    pack.add_argument("archive", help="binary archive to write")
+    pack.add_argument("--append", action="store_true",
+                      help="add the games to an existing archive")
+    pack.set_defaults(run=pack_command)
+
+    unpack = commands.add_parser(
+        "unpack", help="write the games of a binary archive one per line")
+    unpack.add_argument("archive", help="binary archive to read")
+    unpack.add_argument("games", nargs="?", default=None,
+                        help="file to write (default: standard output)")
+    unpack.set_defaults(run=unpack_command)
+
+    count = commands.add_parser(
+        "count", parents=[common], help="count every winning sequence of "
+        "moves from a position")
+    count.add_argument("position", nargs="?", default="",
+                       help="moves from the start or a 1 or 0 for each "
+                       "hole (default: the start)")
+    count.add_argument("--memo-mb", type=float, default=256,
+                       help="memory for remembered counts (default: 256)")
+    count.add_argument("--spill", default=None, metavar="PATH",
+                       help="sqlite file to move counts to once memory is "
+                       "full, instead of forgetting them")
+    count.add_argument("--every", type=int, default=100000,
+                       help="positions between progress reports")
+    count.add_argument("--no-oracle", action="store_true",
+                       help="do not skip the positions the endgame oracle "
+                       "knows are lost")
+    count.set_defaults(run=count_command)
+    return parser
+
+
+def main(argv=None):
+    """
+    Runs the subcommand given on the command line.
+
+    Parameters
+    ----------
+    argv : list, optional
+        The arguments after the program name. The default is None, which
+        uses sys.argv.
+
+    Returns
+    -------
+    code : int
+        The exit code of the subcommand.
+
+    """
+    args = build_parser().parse_args(argv)
+    return args.run(args)
@@ -0,0 +1,293 @@
+"""
+Counting every winning sequence of moves from a position, remembering the
+count of each position so it is only worked out once.
+
+"""
+import sqlite3
+import sys
+import time
+
+from .boards import apply_move, canonical, gen_moves, has_won
+from .solver import prune_reason, prune_rules
+
+
+#Rough number of bytes each remembered count takes up, counting the dict
+#entry and the two integers it holds.
+MEMO_BYTES = 120
+
+
+class CountMemo:
+    """
+    A class that remembers the number of solutions from positions, keyed by
+    their canonical integer. Once more positions are held than fit in the
+    memory given, the oldest half are moved into an sqlite file and looked
+    up there when needed again, or forgotten if there is no file, so they
+    are counted again if they come up.
+
+    ...
+
+    Attributes
+    ----------
+    counts : dict
+        The counts held in memory.
+    max_entries : int
+        Number of counts held in memory before some are moved to disk.
+    path : str
+        The sqlite file counts are moved to, or None to forget them.
+    db : sqlite3.Connection
+        The open sqlite file, once anything has been moved to it.
+    spilled : int
+        Number of counts moved to disk.
+    evicted : int
+        Number of counts forgotten.
+    disk_hits : int
+        Number of counts found on disk.
+
+    """
+    def __init__(self, max_mb=256, path=None):
+        """
+        Constructs an empty memo.
+
+        Parameters
+        ----------
+        max_mb : float, optional
+            Memory the counts kept in memory may use. The default is 256.
+        path : str, optional
+            The sqlite file counts are moved to when memory is full. The
+            default is None, which forgets them instead.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.counts = {}
+        self.max_entries = max(int(max_mb * 2**20 / MEMO_BYTES), 2)
+        self.path = path
+        self.db = None
+        self.spilled = 0
+        self.evicted = 0
+        self.disk_hits = 0
+
+    def get(self, key):
+        """
+        Looks up the count of a position.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of the position.
+
+        Returns
+        -------
+        count : int
+            The number of solutions, or None if it is not known yet.
+
+        """
+        count = self.counts.get(key)
+        if count is None and self.db is not None:
+            row = self.db.execute("SELECT count FROM counts WHERE key = ?",
+                                  (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                count = int.from_bytes(row[0], "little")
+        return count
+
+    def put(self, key, count):
+        """
+        Remembers the count of a position, moving older counts to disk, or
+        forgetting them, if memory is full.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of the position.
+        count : int
+            The number of solutions.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.counts[key] = count
+        if len(self.counts) > self.max_entries:
+            if self.path is not None:
+                self.spill()
+            else:
+                self.evict()
+
+    def spill(self):
+        """
+        Moves the oldest half of the counts in memory into the sqlite file.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.db is None:
+            self.db = sqlite3.connect(self.path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS counts "
+                            "(key INTEGER PRIMARY KEY, count BLOB)")
+        #Dicts keep the order keys were added, so the first half is oldest.
+        keys = list(self.counts)[:len(self.counts)//2]
+        self.db.executemany(
+            "INSERT OR REPLACE INTO counts VALUES (?, ?)",
+            ((key, self.counts[key].to_bytes(
+                (self.counts[key].bit_length()+7)//8, "little"))
+             for key in keys))
+        self.db.commit()
+        for key in keys:
+            del self.counts[key]
+        self.spilled += len(keys)
+
+    def evict(self):
+        """
+        Forgets the oldest half of the counts in memory.
+
+        Returns
+        -------
+        None.
+
+        """
+        keys = list(self.counts)[:len(self.counts)//2]
+        for key in keys:
+            del self.counts[key]
+        self.evicted += len(keys)
+
+    def stats(self):
+        """
+        Counts how full the memo is.
+
+        Returns
+        -------
+        stats : dict
+            The counts held in memory, on disk and forgotten, and roughly
+            how many MB the ones in memory use.
+
+        """
+        return {"entries": len(self.counts), "spilled": self.spilled,
+                "evicted": self.evicted, "disk_hits": self.disk_hits,
+                "mb": (sys.getsizeof(self.counts) +
+                       len(self.counts) * (MEMO_BYTES - 50)) / 2**20}
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+def count_solutions(bits, layout, memo=None, oracle=None, prune=True,
+                    progress=None, every=100000):
+    """
+    Counts every sequence of moves that wins the game from a position.
+
+    The count of a position is the sum of the counts of the positions its
+    moves lead to. It is remembered under the canonical integer of the
+    position, which is safe because every symmetry of the layout keeps the
+    goal hole in place: a rotation or reflection of a position has exactly
+    as many solutions, each one the image of a solution of the original, so
+    no multiplicity needs correcting.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    memo : CountMemo, optional
+        Counts already worked out. The default is None, which creates a new
+        memo held in memory.
+    oracle : Oracle, optional
+        Used to skip any position it knows cannot be won. The default is
+        None.
+    prune : bool, optional
+        Whether to skip positions the rules of prune_rules show cannot be
+        won. The default is True.
+    progress : function, optional
+        Called as progress(stats) every so many positions. The default is
+        None.
+    every : int, optional
+        Number of positions counted between calls to progress. The default
+        is 100000.
+
+    Raises
+    ------
+    ValueError
+        Raised if the board has holes past bit 62, as the keys would not fit
+        in the sqlite file.
+
+    Returns
+    -------
+    count : int
+        The number of winning sequences of moves.
+    stats : dict
+        The positions counted, the counts found in the memo, the time taken
+        and the state of the memo, see CountMemo.stats.
+
+    """
+    if max(layout.holes) > 62:
+        raise ValueError("Solutions can only be counted on boards whose "
+                         "holes fit in 63 bits")
+    if memo is None:
+        memo = CountMemo()
+    rules = prune_rules(layout) if prune else []
+    stats = {"nodes": 0, "hits": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    def report():
+        stats["seconds"] = time.perf_counter() - start
+        stats["memo"] = memo.stats()
+        return stats
+
+    def count(bits):
+        if has_won(bits, layout):
+            return 1
+        key = canonical(bits, layout)
+        total = memo.get(key)
+        if total is not None:
+            stats["hits"] += 1
+            return total
+
+        #Positions that are known to be lost are not worth remembering, as
+        #checking them again is as quick as a lookup.
+        if oracle is not None and not oracle.winnable(bits):
+            return 0
+        if prune_reason(bits, rules) is not None:
+            return 0
+
+        total = 0
+        for move in gen_moves(bits, layout):
+            total += count(apply_move(bits, move))
+        memo.put(key, total)
+        stats["nodes"] += 1
+        if progress is not None and stats["nodes"] % every == 0:
+            progress(report())
+        return total
+
+    total = count(bits)
+    return total, report()
+
+
+def format_count(stats):
+    """
+    Writes the counters of a count as one line of text.
+
+    Parameters
+    ----------
+    stats : dict
+        The counters returned by count_solutions.
+
+    Returns
+    -------
+    text : str
+        e.g. 2,600,000 positions counted, 3,900,000 memo hits in 61.2s,
+        memo 290.1 MB with 0 on disk and 0 forgotten.
+
+    """
+    return (f"{stats['nodes']:,} positions counted, {stats['hits']:,} memo "
+            f"hits in {stats['seconds']:.1f}s, memo "
+            f"{stats['memo']['mb']:.1f} MB with "
+            f"{stats['memo']['spilled']:,} on disk and "
+            f"{stats['memo']['evicted']:,} forgotten")
@@ -0,0 +1,271 @@
+"""
+The tree of moves made in a game, used to undo and redo them.
+
+"""
+from array import array
+
+from .boards import move_text
+
+
+class History:
+    """
+    A tree of every move made, storing only which holes each move changed.
+    Undoing a move steps back to its parent and redoing steps forward to the
+    child visited last, so neither depends on the length of the game. Making
+    a different move after an undo starts a new branch, keeping the old line
+    so it can be explored again.
+
+    A jump changes three equally spaced holes, so each is stored in two bytes
+    as the lowest hole plus the spacing times 256. Moves of any distance that
+    change more holes are kept whole in a dict instead. With the four links
+    each move takes 18 bytes.
+
+    ...
+
+    Attributes
+    ----------
+    parent : array.array
+        The node each node was reached from, with -1 for the start.
+    first : array.array
+        The newest child of each node, or -1 if it has none.
+    sibling : array.array
+        The next older child of the same parent, or -1 if there is none.
+    last : array.array
+        The child of each node visited most recently, used to redo.
+    codes : array.array
+        The holes the move into each node changed, packed by pack, or 0 if
+        they are kept in wide.
+    wide : dict
+        Integer with the bit of every hole changed, for the moves that could
+        not be packed, by node.
+    node : int
+        The node of the current position.
+
+    """
+    def __init__(self):
+        """
+        Constructs a tree holding only the starting position.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.clear()
+
+    def clear(self):
+        """
+        Removes every move, leaving only the starting position.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.parent = array("i", [-1])
+        self.first = array("i", [-1])
+        self.sibling = array("i", [-1])
+        self.last = array("i", [-1])
+        self.codes = array("H", [0])
+        self.wide = {0: 0}
+        self.node = 0
+
+    @staticmethod
+    def pack(delta):
+        """
+        Packs the holes changed by a jump into two bytes.
+
+        Parameters
+        ----------
+        delta : int
+            Integer with the bit of every hole the move changed set.
+
+        Returns
+        -------
+        code : int
+            The lowest hole plus the spacing of the holes times 256, or 0 if
+            the move did not change three equally spaced holes.
+
+        """
+        low = (delta & -delta).bit_length() - 1
+        step = (delta.bit_length() - 1 - low) // 2
+        if (0 <= low < 256 and 0 < step < 256 and
+                delta == (1 << low) * (1 | 1 << step | 1 << 2*step)):
+            return low | step << 8
+        return 0
+
+    def delta(self, node):
+        """
+        Unpacks the holes changed by the move into a node.
+
+        Parameters
+        ----------
+        node : int
+            The node of the move.
+
+        Returns
+        -------
+        delta : int
+            Integer with the bit of every hole the move changed set.
+
+        """
+        code = self.codes[node]
+        if code == 0:
+            return self.wide[node]
+        step = code >> 8
+        return (1 | 1 << step | 1 << 2*step) << (code & 255)
+
+    def push(self, delta):
+        """
+        Records a move from the current position, reusing the branch if the
+        same move has been made from here before.
+
+        Parameters
+        ----------
+        delta : int
+            Integer with the bit of every hole the move changed set.
+
+        Returns
+        -------
+        None.
+
+        """
+        child = self.first[self.node]
+        while child != -1:
+            if self.delta(child) == delta:
+                break
+            child = self.sibling[child]
+        else:
+            child = len(self.codes)
+            code = self.pack(delta)
+            if code == 0:
+                self.wide[child] = delta
+            self.parent.append(self.node)
+            self.first.append(-1)
+            self.sibling.append(self.first[self.node])
+            self.last.append(-1)
+            self.codes.append(code)
+            self.first[self.node] = child
+
+        self.last[self.node] = child
+        self.node = child
+
+    def undo(self):
+        """
+        Steps back to the position before the last move.
+
+        Returns
+        -------
+        delta : int
+            The holes the undone move changed, or 0 at the start.
+
+        """
+        if self.node == 0:
+            return 0
+        delta = self.delta(self.node)
+        self.node = self.parent[self.node]
+        return delta
+
+    def redo(self):
+        """
+        Steps forward along the line visited most recently.
+
+        Returns
+        -------
+        delta : int
+            The holes the redone move changed, or 0 if there is nothing to
+            redo.
+
+        """
+        child = self.last[self.node]
+        if child == -1:
+            return 0
+        self.node = child
+        return self.delta(child)
+
+    def variations(self):
+        """
+        Lists every move that has been made from the current position.
+
+        Returns
+        -------
+        variations : list
+            A (node, delta) pair for each move, newest first.
+
+        """
+        variations = []
+        child = self.first[self.node]
+        while child != -1:
+            variations.append((child, self.delta(child)))
+            child = self.sibling[child]
+        return variations
+
+    def follow(self, child):
+        """
+        Steps forward into one of the moves listed by variations.
+
+        Parameters
+        ----------
+        child : int
+            The node of the move.
+
+        Returns
+        -------
+        delta : int
+            The holes the move changed.
+
+        """
+        self.last[self.node] = child
+        self.node = child
+        return self.delta(child)
+
+
+def delta_move(before, delta, layout):
+    """
+    Finds the move that changed a set of holes. The move lands in the one
+    hole that was empty, and starts from the changed hole furthest from it.
+
+    Parameters
+    ----------
+    before : int
+        Integer representing the position before the move.
+    delta : int
+        Integer with the bit of every hole the move changed set.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    move : tuple
+        The (from, to) bit indexes of the move.
+
+    """
+    to = (delta & ~before).bit_length() - 1
+    row, col = layout.coords[to]
+    frm = max((bit for bit in layout.holes if delta >> bit & 1),
+              key=lambda bit: abs(layout.coords[bit][0]-row) +
+                              abs(layout.coords[bit][1]-col))
+    return frm, to
+
+
+def delta_text(before, delta, layout):
+    """
+    Writes the move that changed a set of holes in the notation of the
+    solution files.
+
+    Parameters
+    ----------
+    before : int
+        Integer representing the position before the move.
+    delta : int
+        Integer with the bit of every hole the move changed set.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    text : str
+        The letter and number of the start and end hole of the move.
+
+    """
+    return move_text(delta_move(before, delta, layout), layout)
@@ -0,0 +1,309 @@
+"""
+The solvability oracle: a file of every position of the English board that
+can still be won, found by taking moves back from the goal, built once and
+then looked up.
+
+"""
+from bisect import bisect_left
+from pathlib import Path
+
+import numpy as np
+
+from .boards import canonical, get_layout
+
+
+#Marks the start of a solvability oracle file and gives the default place to
+#keep one.
+ORACLE_MAGIC = b"PEGORC03"
+ORACLE_FILE = "english_oracle.bin"
+
+#Number of low bits of each packed position stored in the file. The bits
+#above them pick the bucket the position is kept in.
+LOW_BITS = 16
+
+
+def pack_tables(layout):
+    """
+    Makes byte sized lookup tables that move the bit of every hole next to
+    each other, so a position of n holes becomes an n bit number.
+
+    Parameters
+    ----------
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    tables : list
+        A (shift, table) pair for each byte of a position, where table holds
+        the packed bits of each value of the byte.
+
+    """
+    rank = {bit: number for number, bit in enumerate(layout.holes)}
+    tables = []
+    for shift in range(0, max(layout.holes)+1, 8):
+        tables.append((shift, [sum(1 << rank[shift+bit] for bit in range(8)
+                                   if value >> bit & 1 and shift+bit in rank)
+                               for value in range(256)]))
+    return tables
+
+
+def canonical_array(keys, layout, batch=2**20):
+    """
+    Finds the canonical integer of many positions at once, using the same
+    byte lookup tables as canonical.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        Positions as an array of uint64.
+    layout : Layout
+        The bit mapping for the board.
+    batch : int, optional
+        Number of positions worked on at a time, to limit memory use. The
+        default is 2**20.
+
+    Returns
+    -------
+    canon : numpy.ndarray
+        The canonical integer of each position, as uint64.
+
+    """
+    tables = [(np.uint64(shift), np.array(table, dtype=np.uint64))
+              for shift, table in layout.sym_tables]
+    canon = np.empty(len(keys), dtype=np.uint64)
+    for start in range(0, len(keys), batch):
+        part = keys[start:start+batch]
+        images = np.zeros((len(part), len(layout.symmetries)),
+                          dtype=np.uint64)
+        for shift, table in tables:
+            images += table[(part >> shift) & np.uint64(255)]
+        canon[start:start+batch] = images.min(axis=1)
+    return canon
+
+
+def children_array(keys, layout):
+    """
+    Makes every move from many positions at once.
+
+    Parameters
+    ----------
+    keys : numpy.ndarray
+        Positions as an array of uint64.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    children : numpy.ndarray
+        The position after every legal move, as uint64.
+    parents : numpy.ndarray
+        The index in keys of the position each child was made from.
+
+    """
+    children = []
+    parents = []
+    for (frm, over, to), (from_over, to_bit) in zip(layout.jumps,
+                                                    layout.jump_checks):
+        from_over = np.uint64(from_over)
+        to_bit = np.uint64(to_bit)
+        rows = np.nonzero(((keys & from_over) == from_over) &
+                          ((keys & to_bit) == 0))[0]
+        children.append(keys[rows] ^ (from_over | to_bit))
+        parents.append(rows)
+    return np.concatenate(children), np.concatenate(parents)
+
+
+def build_oracle(path=None, layout=None, verbose=True):
+    """
+    Works out which positions of the game can still be won and saves them to
+    a file for Oracle to read. Every move is taken back from the single peg
+    in the middle, one peg count at a time, with the same GoalFrontier as the
+    bidirectional search, which finds every position the goal can be reached
+    from, whether or not it can be reached from the start.
+
+    Only those positions are saved. Each canonical integer is packed down to
+    one bit per hole, the bits above LOW_BITS pick a bucket, and each bucket
+    is kept as a sorted run of the low bits, so every position takes two
+    bytes plus a table of where each bucket starts.
+
+    Parameters
+    ----------
+    path : str, optional
+        Where to save the file. The default is None, which saves it next to
+        the game.
+    layout : Layout, optional
+        The bit mapping for the board, which must fit in 64 bits. The default
+        is None, which uses the current board.
+    verbose : bool, optional
+        Prints the size of each layer as it is built. The default is True.
+
+    Returns
+    -------
+    path : pathlib.Path
+        Where the file was saved.
+
+    """
+    from .bidir import GoalFrontier
+
+    layout = layout or get_layout()
+    if max(layout.holes) >= 64:
+        raise ValueError("The oracle only works on boards that fit in 64 bits")
+    path = Path(path or Path(__file__).resolve().parent.parent/ORACLE_FILE)
+
+    #Takes moves back from the goal, keeping every peg count, until no more
+    #pegs can be added.
+    frontier = GoalFrontier(layout, max_states=2**62)
+    while True:
+        frontier.extend(frontier.pegs+1)
+        if len(frontier.levels[-1]) == 0:
+            frontier.levels.pop()
+            break
+        if verbose:
+            print(f"{frontier.pegs} pegs: {len(frontier.levels[-1])} "
+                  f"positions")
+
+    #Packs every position down to its holes and sorts them into buckets.
+    tables = [(np.uint64(shift), np.array(table, dtype=np.uint64))
+              for shift, table in pack_tables(layout)]
+    packed = np.zeros(sum(map(len, frontier.levels)), dtype=np.uint64)
+    done = 0
+    for level in frontier.levels:
+        for shift, table in tables:
+            packed[done:done+len(level)] += table[(level >> shift) &
+                                                  np.uint64(255)]
+        done += len(level)
+    del frontier
+    packed.sort()
+    buckets = 1 << max(len(layout.holes)-LOW_BITS, 0)
+    starts = np.searchsorted(packed >> np.uint64(LOW_BITS),
+                             np.arange(buckets+1, dtype=np.uint64))
+    with open(path, "wb") as file:
+        file.write(ORACLE_MAGIC)
+        file.write(np.array([layout.mask, layout.start, len(packed)],
+                            dtype=np.uint64).tobytes())
+        file.write(starts.astype(np.uint32).tobytes())
+        file.write((packed & np.uint64(2**LOW_BITS-1)).astype(np.uint16)
+                   .tobytes())
+    if verbose:
+        print(f"{len(packed)} positions can be won, saved to {path}")
+    return path
+
+
+class Oracle:
+    """
+    A class that answers whether a position can still be won, by looking it
+    up in a file made by build_oracle. The file is memory-mapped, so only the
+    pages a lookup touches are read from disk, and searched through
+    memoryviews, so a lookup costs little more than finding the canonical
+    integer.
+
+    The file holds every position that can be won by normal jumps, so the
+    answer is exact for any position, but not if pegs can move any distance.
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+        The file the oracle was read from.
+    layout : Layout
+        The bit mapping for the board.
+    tables : list
+        The byte lookup tables that pack a position, see pack_tables.
+    starts : memoryview
+        Where the positions of each bucket start in lows, with one more entry
+        for the end of the last bucket.
+    lows : memoryview
+        The low bits of every packed position that can be won, sorted within
+        each bucket.
+
+    """
+    def __init__(self, path, layout):
+        """
+        Maps the file into memory, checking it was built for the board.
+
+        Parameters
+        ----------
+        path : str
+            The file made by build_oracle.
+        layout : Layout
+            The bit mapping for the board.
+
+        Raises
+        ------
+        ValueError
+            Raised if the file is not an oracle for this board.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path = str(path)
+        self.layout = layout
+        with open(path, "rb") as file:
+            magic = file.read(8)
+            header = np.frombuffer(file.read(24), dtype=np.uint64)
+        if (magic != ORACLE_MAGIC or int(header[0]) != layout.mask or
+                int(header[1]) != layout.start):
+            raise ValueError(f"{path} is not an oracle for this board")
+        buckets = 1 << max(len(layout.holes)-LOW_BITS, 0)
+        self.tables = pack_tables(layout)
+        self.starts = memoryview(np.memmap(path, dtype=np.uint32, mode="r",
+                                           offset=32, shape=(buckets+1,)))
+        self.lows = memoryview(np.memmap(path, dtype=np.uint16, mode="r",
+                                         offset=32 + 4*(buckets+1),
+                                         shape=(int(header[2]),)))
+
+    def winnable(self, bits):
+        """
+        Looks up whether the goal can still be reached from a position.
+
+        Parameters
+        ----------
+        bits : int
+            Integer representing the position of the pegs.
+
+        Returns
+        -------
+        winnable : bool
+            True if the position can be won.
+
+        """
+        key = canonical(bits, self.layout)
+        packed = sum(table[key >> shift & 255] for shift, table in self.tables)
+        bucket = packed >> LOW_BITS
+        low = packed & (2**LOW_BITS - 1)
+        last = self.starts[bucket+1]
+        index = bisect_left(self.lows, low, self.starts[bucket], last)
+        return index < last and self.lows[index] == low
+
+
+#Stores each oracle once it has been opened.
+ORACLES = {}
+
+
+def load_oracle(layout):
+    """
+    Opens the oracle file kept next to the game, if there is one for the
+    board.
+
+    Parameters
+    ----------
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    oracle : Oracle
+        The oracle for the board, or None if there is not one.
+
+    """
+    if layout not in ORACLES:
+        try:
+            ORACLES[layout] = Oracle(
+                Path(__file__).resolve().parent.parent/ORACLE_FILE, layout)
+        except (OSError, ValueError):
+            ORACLES[layout] = None
+    return ORACLES[layout]
@@ -0,0 +1,550 @@
+"""
+Solving on several processes at once, sharing the dead-ends found.
+
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from .boards import apply_move, canonical, gen_moves, has_won
+from .solver import MoveOrder, TransTable, dfs_solve
+
+#The largest prime below 2**64, used to make the check word of an entry.
+CHECK_PRIME = 0xFFFFFFFFFFFFFFC5
+
+
+class SharedDeadEnds:
+    """
+    A table of dead-end keys kept in shared memory, so every worker process
+    of a parallel solve can skip positions another worker has already found
+    to be dead-ends. Each key is stored plus one in an open addressed array
+    of entries made of one or more 64 bit words, where zero marks an empty
+    entry. The first entry is used as a flag telling the workers to stop.
+
+    A single word is written and read in one go, but a key spread over
+    several words could be read while another worker is half way through
+    writing it. Those entries end in a check word worked out from the key,
+    which is cleared before the key words are written and set again last,
+    so an entry is only trusted if the check word matches before and after
+    reading the key.
+
+    ...
+
+    Attributes
+    ----------
+    shm : multiprocessing.shared_memory.SharedMemory
+        The block of shared memory holding the table.
+    slots : memoryview
+        The block viewed as 64 bit unsigned integers.
+    words : int
+        Number of 64 bit words in each key.
+    width : int
+        Number of 64 bit words in each entry, one more than words if the
+        entry needs a check word.
+    size : int
+        Number of entries used for keys.
+    owner : bool
+        True for the process that created the block and has to remove it.
+
+    """
+    def __init__(self, max_mb=64, name=None, words=1):
+        """
+        Creates a new shared table, or attaches to an existing one by name.
+
+        Parameters
+        ----------
+        max_mb : float, optional
+            Size of the table in megabytes when creating it. The default is 64.
+        name : str, optional
+            Name of an existing table to attach to. The default is None.
+        words : int, optional
+            Number of 64 bit words in each entry, which has to match the
+            layout.words of the board and be the same for every process. The
+            default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.owner = name is None
+        self.words = words
+        self.width = words + (words > 1)
+        if self.owner:
+            width = 8*self.width
+            self.shm = shared_memory.SharedMemory(
+                create=True,
+                size=max(2*width, int(max_mb * 2**20)) // width * width)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.slots = self.shm.buf.cast("Q")
+        self.size = len(self.slots)//self.width - 1
+
+    def slot(self, key):
+        """
+        Finds the first entry a key is looked for in.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+
+        Returns
+        -------
+        slot : int
+            Index of the entry.
+
+        """
+        return 1 + (key * 0x9E3779B97F4A7C15 >> 17) % self.size
+
+    def read(self, index):
+        """
+        Joins the words of an entry back into one integer.
+
+        Parameters
+        ----------
+        index : int
+            Index of the entry.
+
+        Returns
+        -------
+        stored : int
+            The key plus one stored in the entry, 0 if it is empty, or None
+            if it is being written.
+
+        """
+        first = index*self.width
+        if self.words == 1:
+            return self.slots[first]
+        check = self.slots[first+self.words]
+        stored = sum(self.slots[first+word] << 64*word
+                     for word in range(self.words))
+        if check != self.slots[first+self.words]:
+            return None
+        if check == 0:
+            return None if stored else 0
+        return stored if check == stored % CHECK_PRIME | 1 else None
+
+    def write(self, index, stored):
+        """
+        Splits an integer into the words of an entry.
+
+        Parameters
+        ----------
+        index : int
+            Index of the entry.
+        stored : int
+            The key plus one to store.
+
+        Returns
+        -------
+        None.
+
+        """
+        first = index*self.width
+        if self.words == 1:
+            self.slots[first] = stored
+            return
+        #The check word is cleared first and set last, so the entry cannot
+        #be trusted while the key words are changing.
+        self.slots[first+self.words] = 0
+        for word in range(self.words):
+            self.slots[first+word] = stored >> 64*word & 0xFFFFFFFFFFFFFFFF
+        self.slots[first+self.words] = stored % CHECK_PRIME | 1
+
+    def __contains__(self, key):
+        """
+        Checks the four entries a key can be stored in. An entry being
+        written is skipped, so at worst a dead-end is searched again.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+
+        Returns
+        -------
+        found : bool
+            True if the key is stored.
+
+        """
+        slot = self.slot(key)
+        for probe in range(4):
+            stored = self.read(1 + (slot-1+probe) % self.size)
+            if stored == key+1:
+                return True
+            if stored == 0:
+                return False
+        return False
+
+    def store(self, key):
+        """
+        Adds a key to the first free of its four entries, overwriting the
+        first entry if none are free.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+
+        Returns
+        -------
+        None.
+
+        """
+        slot = self.slot(key)
+        for probe in range(4):
+            index = 1 + (slot-1+probe) % self.size
+            if self.read(index) in (0, key+1):
+                self.write(index, key+1)
+                return
+        self.write(slot, key+1)
+
+    def stop(self):
+        """
+        Tells every worker using the table to stop searching.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.slots[0] = 1
+
+    def stopped(self):
+        """
+        Checks if the workers have been told to stop.
+
+        Returns
+        -------
+        stopped : bool
+            True once stop has been called.
+
+        """
+        return self.slots[0] == 1
+
+    def close(self):
+        """
+        Detaches from the shared memory, removing it if this process made it.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.slots.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedTable(TransTable):
+    """
+    A transposition table for a worker process that also looks up and stores
+    dead-ends in the table shared between all the workers.
+
+    ...
+
+    Attributes
+    ----------
+    shared : SharedDeadEnds
+        The table shared between the workers.
+
+    """
+    def __init__(self, shared, max_mb=64, policy="depth"):
+        """
+        Constructs the local table and keeps the shared one.
+
+        Parameters
+        ----------
+        shared : SharedDeadEnds
+            The table shared between the workers.
+        max_mb : float, optional
+            Memory the local table is allowed to use, in megabytes. The
+            default is 64.
+        policy : str, optional
+            Replacement policy of the local table. The default is "depth".
+
+        Returns
+        -------
+        None.
+
+        """
+        super().__init__(max_mb, policy)
+        self.shared = shared
+
+    def __contains__(self, key):
+        """
+        Checks the local table first and then the shared one.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+
+        Returns
+        -------
+        found : bool
+            True if the position is stored in either table.
+
+        """
+        if super().__contains__(key):
+            return True
+        if key in self.shared:
+            #Counts the shared hit in place of the local miss.
+            self.misses -= 1
+            self.hits += 1
+            return True
+        return False
+
+    def store(self, key, depth):
+        """
+        Adds a position to both the local and the shared table.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+        depth : int
+            How many moves deep the search below the position went.
+
+        Returns
+        -------
+        None.
+
+        """
+        super().store(key, depth)
+        self.shared.store(key)
+
+
+#Holds the layout and shared table of a worker process once it has started.
+WORKER = {}
+
+
+def init_worker(layout, name, order, table_mb, prune=True, oracle=None):
+    """
+    Sets up a worker process of a parallel solve. The oracle is opened again
+    from its file by each worker, as its memory maps cannot be sent over.
+
+    Parameters
+    ----------
+    layout : Layout
+        The bit mapping for the board.
+    name : str
+        Name of the shared dead-end table.
+    order : function
+        Move ordering passed on to dfs_solve.
+    table_mb : float
+        Memory each worker's own table is allowed to use, in megabytes.
+    prune : bool, optional
+        Passed on to dfs_solve. The default is True.
+    oracle : str, optional
+        File of the oracle passed on to dfs_solve. The default is None,
+        which solves without one.
+
+    Returns
+    -------
+    None.
+
+    """
+    WORKER["layout"] = layout
+    WORKER["shared"] = SharedDeadEnds(name=name, words=layout.words)
+    WORKER["order"] = order
+    WORKER["table_mb"] = table_mb
+    WORKER["prune"] = prune
+    WORKER["oracle"] = None
+    if oracle is not None:
+        from .oracle import Oracle
+        WORKER["oracle"] = Oracle(oracle, layout)
+
+
+def solve_subtree(bits):
+    """
+    Searches one subtree of a parallel solve inside a worker process,
+    stopping early if another worker has found a solution.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position at the root of the subtree.
+
+    Returns
+    -------
+    status : str
+        The status returned by dfs_solve.
+    moves : list
+        The moves of the solution from the root of the subtree, or None.
+    stats : dict
+        The counters returned by dfs_solve.
+
+    """
+    shared = WORKER["shared"]
+    if shared.stopped():
+        return "stopped", None, {"nodes": 0}
+    table = SharedTable(shared, WORKER["table_mb"])
+    return dfs_solve(bits, WORKER["layout"], order=WORKER["order"],
+                     table=table, progress=lambda stats: shared.stopped(),
+                     every=1024, oracle=WORKER["oracle"],
+                     prune=WORKER["prune"])
+
+
+def split_tree(bits, layout, depth):
+    """
+    Expands the search tree a few moves deep to split it into subtrees that
+    can be searched independently. Symmetrical positions are only kept once.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    depth : int
+        Number of moves to expand before splitting.
+
+    Returns
+    -------
+    frontier : list
+        A (bits, path) pair for each subtree, where path is the list of moves
+        leading to it.
+    solution : list
+        The moves of a solution if one was found while expanding, otherwise
+        None.
+
+    """
+    frontier = [(bits, [])]
+    for level in range(depth):
+        seen = set()
+        next_frontier = []
+        for bits, path in frontier:
+            for move in gen_moves(bits, layout):
+                child = apply_move(bits, move)
+                if has_won(child, layout):
+                    return [], path + [move]
+                key = canonical(child, layout)
+                if key not in seen:
+                    seen.add(key)
+                    next_frontier.append((child, path + [move]))
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return frontier, None
+
+
+def parallel_solve(bits, layout, workers=None, split_depth=3, order=None,
+                   shared_mb=64, table_mb=64, prune=True, oracle=None):
+    """
+    Splits the search tree at a fixed depth and searches the subtrees in a
+    pool of worker processes, which share a table of dead-ends. The first
+    solution found stops all the other workers.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    workers : int, optional
+        Number of worker processes. The default is None, which uses one per
+        processor.
+    split_depth : int, optional
+        Number of moves to expand before splitting the tree. The default is 3.
+    order : function, optional
+        Move ordering passed on to dfs_solve. It has to be a module level
+        function or a MoveOrder so it can be sent to the workers. The
+        default is None, which uses a MoveOrder.
+    shared_mb : float, optional
+        Size of the shared dead-end table in megabytes. The default is 64.
+    table_mb : float, optional
+        Memory each worker's own table is allowed to use, in megabytes. The
+        default is 64.
+    prune : bool, optional
+        Passed on to dfs_solve in each worker. The default is True.
+    oracle : Oracle, optional
+        Oracle each worker opens from the same file and passes on to
+        dfs_solve. The default is None.
+
+    Returns
+    -------
+    status : str
+        "solved" or "unsolvable".
+    moves : list
+        The moves of the solution, or None if there is no solution.
+    stats : dict
+        Number of positions searched by all workers, number of subtrees and
+        number of workers used.
+
+    """
+    workers = workers or os.cpu_count() or 1
+    order = MoveOrder() if order is None else order
+    frontier, solution = split_tree(bits, layout, split_depth)
+    stats = {"nodes": 0, "subtrees": len(frontier), "workers": workers}
+    if solution is not None or has_won(bits, layout):
+        return "solved", solution or [], stats
+
+    oracle_path = None if oracle is None else oracle.path
+    shared = SharedDeadEnds(shared_mb, words=layout.words)
+    status, moves = "unsolvable", None
+    try:
+        with ProcessPoolExecutor(workers, initializer=init_worker,
+                                 initargs=(layout, shared.shm.name, order,
+                                           table_mb, prune,
+                                           oracle_path)) as pool:
+            futures = {pool.submit(solve_subtree, child): path
+                       for child, path in frontier}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                sub_status, sub_moves, sub_stats = future.result()
+                stats["nodes"] += sub_stats["nodes"]
+                if sub_status == "solved" and moves is None:
+                    #Stops the running workers and drops the queued ones.
+                    status, moves = "solved", futures[future] + sub_moves
+                    shared.stop()
+                    for other in futures:
+                        other.cancel()
+    finally:
+        shared.close()
+
+    return status, moves, stats
+
+
+def parallel_speedup(bits, layout, counts=(1, 2, 4), show=True, **kwargs):
+    """
+    Times a parallel solve with different numbers of workers and prints the
+    speedup over a single worker.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    counts : tuple, optional
+        Numbers of workers to time. The default is (1, 2, 4).
+    show : bool, optional
+        Prints the speedups as they are found. The default is True.
+    **kwargs
+        Passed on to parallel_solve.
+
+    Returns
+    -------
+    results : list
+        A dict for each worker count with the time taken, the speedup over
+        the first count and the number of positions searched.
+
+    """
+    results = []
+    for workers in counts:
+        start = time.perf_counter()
+        status, moves, stats = parallel_solve(bits, layout, workers, **kwargs)
+        seconds = time.perf_counter() - start
+        results.append({"workers": workers, "status": status,
+                        "seconds": seconds, "nodes": stats["nodes"],
+                        "speedup": results[0]["seconds"] / seconds
+                        if results else 1.0})
+        if show:
+            print(f"{workers} workers: {seconds:.2f}s, "
+                  f"speedup {results[-1]['speedup']:.2f}x")
+    return results
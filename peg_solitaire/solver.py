@@ -0,0 +1,1007 @@
+"""
+The solvers: a depth-first search with a transposition table, the rules
+used to prune it, the move ordering and a beam search.
+
+"""
+import time
+
+from .boards import (apply_move, apply_ray, canonical, gen_moves, has_won,
+                     ray_moves)
+
+
+#Rough number of bytes each slot of a transposition table takes up, counting
+#the list entries and the integer objects they point to.
+SLOT_BYTES = 48
+
+
+class TransTable:
+    """
+    A fixed size hash table of positions already found to be dead-ends, keyed
+    by their canonical integer. Once every slot is full, new entries replace
+    old ones following the chosen policy, so memory use never grows.
+
+    ...
+
+    Attributes
+    ----------
+    size : int
+        Number of buckets in the table.
+    policy : str
+        "depth" keeps one entry per bucket and only replaces it with an entry
+        searched at least as deep. "two-tier" keeps a depth preferred entry and
+        an always replaced entry in each bucket.
+    keys : list
+        The canonical integer stored in each slot, or None if it is empty.
+    depths : list
+        How many moves deep the search below each stored position went.
+    hits : int
+        Number of lookups that found their position.
+    misses : int
+        Number of lookups that did not find their position.
+    stores : int
+        Number of positions added to the table.
+    evictions : int
+        Number of stored positions that were pushed out by new ones.
+    used : int
+        Number of slots holding a position.
+
+    """
+    def __init__(self, max_mb=64, policy="depth"):
+        """
+        Constructs an empty table that fits in the memory given.
+
+        Parameters
+        ----------
+        max_mb : float, optional
+            Memory the table is allowed to use, in megabytes. The default
+            is 64.
+        policy : str, optional
+            Replacement policy, either "depth" or "two-tier". The default is
+            "depth".
+
+        Returns
+        -------
+        None.
+
+        """
+        if policy not in ("depth", "two-tier"):
+            raise ValueError(f"Unknown replacement policy {policy}")
+        self.policy = policy
+        slots = max(2, int(max_mb * 2**20) // SLOT_BYTES)
+        self.size = slots // 2 if policy == "two-tier" else slots
+        self.keys = [None]*slots
+        self.depths = [0]*slots
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.used = 0
+
+    def slot(self, key):
+        """
+        Finds the first slot of the bucket a key belongs in.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+
+        Returns
+        -------
+        slot : int
+            Index of the first slot of the bucket.
+
+        """
+        #Mixes the bits of the key so that similar positions are spread out.
+        bucket = (key * 0x9E3779B97F4A7C15 >> 17) % self.size
+        return bucket*2 if self.policy == "two-tier" else bucket
+
+    def __contains__(self, key):
+        """
+        Checks if a position is stored in the table, counting the result as a
+        hit or a miss.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+
+        Returns
+        -------
+        found : bool
+            True if the position is stored.
+
+        """
+        slot = self.slot(key)
+        if self.keys[slot] == key or (self.policy == "two-tier" and
+                                      self.keys[slot+1] == key):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def store(self, key, depth):
+        """
+        Adds a position to the table, replacing an older entry if needed.
+
+        Parameters
+        ----------
+        key : int
+            The canonical integer of a position.
+        depth : int
+            How many moves deep the search below the position went.
+
+        Returns
+        -------
+        None.
+
+        """
+        slot = self.slot(key)
+        self.stores += 1
+
+        if self.policy == "two-tier":
+            #Deep entries go in the first slot, pushing the old one into the
+            #always replaced second slot.
+            if self.keys[slot] is None or depth >= self.depths[slot]:
+                if self.keys[slot] is None:
+                    self.used += 1
+                elif self.keys[slot] != key:
+                    self.store_slot(slot+1, self.keys[slot],
+                                    self.depths[slot])
+                self.keys[slot] = key
+                self.depths[slot] = depth
+            else:
+                self.store_slot(slot+1, key, depth)
+            return
+
+        #Only replaces an entry with one searched at least as deep.
+        if self.keys[slot] is None or depth >= self.depths[slot]:
+            self.store_slot(slot, key, depth)
+
+    def store_slot(self, slot, key, depth):
+        """
+        Writes an entry into a slot, counting any entry it pushes out.
+
+        Parameters
+        ----------
+        slot : int
+            Index of the slot.
+        key : int
+            The canonical integer of a position.
+        depth : int
+            How many moves deep the search below the position went.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.keys[slot] is None:
+            self.used += 1
+        elif self.keys[slot] != key:
+            self.evictions += 1
+        self.keys[slot] = key
+        self.depths[slot] = depth
+
+    def stats(self):
+        """
+        Collects the counters of the table.
+
+        Returns
+        -------
+        stats : dict
+            The hits, misses, stores, evictions and number of slots in use.
+
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "stores": self.stores, "evictions": self.evictions,
+                "used": self.used, "slots": len(self.keys)}
+
+
+def dfs_solve(bits, layout, order=None, table=None, max_nodes=None,
+              progress=None, every=4096, oracle=None, prune=False,
+              any_dist=False):
+    """
+    Searches for a solution with a depth-first search that makes and takes
+    back moves on a single integer, keeping a stack of the moves still to be
+    tried at each depth. Positions that cannot be won are stored in a
+    transposition table so they, and their rotations and reflections, are
+    only searched once.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    order : function, optional
+        Called as order(bits, moves, layout) to sort the moves of a position
+        into the order they are tried. The default is None, which tries them
+        in the order of the jump table.
+    table : TransTable, optional
+        Table used to store dead-ends. The default is None, which creates a
+        new table.
+    max_nodes : int, optional
+        Number of positions to search before giving up. The default is None,
+        which searches until the search is complete.
+    progress : function, optional
+        Called as progress(stats) every so many positions. If it returns True
+        the search is stopped. The default is None.
+    every : int, optional
+        Number of positions searched between calls to progress. The default
+        is 4096.
+    oracle : Oracle, optional
+        Used to skip any position it knows cannot be won. The default is
+        None.
+    prune : bool, optional
+        Whether to skip positions the rules of prune_rules show cannot be
+        won. The default is False.
+    any_dist : bool, optional
+        Whether pegs can move any distance, as with the cheat, in which case
+        moves are found with ray_moves. Moves that remove no pegs can lead
+        back to a position already on the path, so those are skipped too.
+        The default is False.
+
+    Raises
+    ------
+    ValueError
+        Raised if any_dist is used with the oracle or pruning, which only
+        know normal jumps.
+
+    Returns
+    -------
+    status : str
+        "solved", "unsolvable" once every move has been tried, "limit" if
+        max_nodes was reached first or "stopped" if progress stopped it.
+    moves : list
+        The (from, over, to) bit indexes of each move of the solution, or None
+        if no solution was found. With any_dist each move holds the bit index
+        of every peg it removes, see ray_moves_from.
+    stats : dict
+        The counters of the search, see solve_stats. The "pruned" counts are
+        only there if prune is True and "oracle_cuts" only if the oracle cut
+        a position.
+
+    """
+    if any_dist and (oracle is not None or prune):
+        raise ValueError("The oracle and pruning only work with normal jumps")
+    if table is None:
+        table = TransTable()
+    stats = solve_stats(table)
+    rules = prune_rules(layout) if prune else []
+    generate = ray_moves if any_dist else gen_moves
+    make = apply_ray if any_dist else apply_move
+    if prune:
+        stats["pruned"] = {name: 0 for name, test in rules}
+    start = time.perf_counter()
+
+    def next_moves(bits):
+        moves = generate(bits, layout)
+        if order is not None:
+            moves = order(bits, moves, layout)
+        if any_dist:
+            #Tries the moves that remove the most pegs first, keeping the
+            #order among moves that remove as many.
+            moves = sorted(moves, key=len, reverse=True)
+        return iter(moves)
+
+    def report():
+        seconds = time.perf_counter() - start
+        stats["seconds"] = seconds
+        stats["nps"] = stats["nodes"] / seconds if seconds else 0.0
+        stats["depth"] = len(path)
+        stats["table"] = table.stats()
+        return stats
+
+    path = []
+    if has_won(bits, layout):
+        return "solved", [], report()
+    reason = prune_reason(bits, rules)
+    if reason is not None:
+        stats["pruned"][reason] += 1
+        return "unsolvable", None, report()
+
+    #Each level of the stack holds the moves left to try from a position,
+    #with the key of that position so it can be stored if it is a dead-end.
+    stack = [next_moves(bits)]
+    keys = [None]
+
+    #With moves of any distance, the depth of each position on the path, and
+    #for each level the shallowest depth a move below it led back to.
+    on_path = {canonical(bits, layout): 0}
+    lows = [0]
+    histogram = stats["histogram"]
+
+    while stack:
+        for move in stack[-1]:
+            child = make(bits, move)
+            if has_won(child, layout):
+                path.append(move)
+                return "solved", path, report()
+
+            key = canonical(child, layout)
+            if key in table:
+                continue
+            if any_dist and key in on_path:
+                lows[-1] = min(lows[-1], on_path[key])
+                continue
+            if oracle is not None and not oracle.winnable(child):
+                stats["oracle_cuts"] = stats.get("oracle_cuts", 0) + 1
+                continue
+            reason = prune_reason(child, rules)
+            if reason is not None:
+                stats["pruned"][reason] += 1
+                continue
+
+            stats["nodes"] += 1
+            if max_nodes is not None and stats["nodes"] > max_nodes:
+                return "limit", None, report()
+            if progress is not None and stats["nodes"] % every == 0:
+                if progress(report()):
+                    return "stopped", None, stats
+
+            #Moves down to the new position, counting how many positions
+            #are searched at each depth.
+            bits = child
+            path.append(move)
+            stack.append(next_moves(bits))
+            keys.append(key)
+            if any_dist:
+                on_path[key] = len(path)
+                lows.append(len(path))
+            if len(path) == len(histogram):
+                histogram.append(0)
+                stats["max_depth"] = len(path)
+            histogram[len(path)] += 1
+            break
+
+        else:
+            #Every move from this position has failed, so it is stored as a
+            #dead-end and the move leading to it is taken back, by making it
+            #again.
+            stack.pop()
+            key = keys.pop()
+            if path:
+                #A position that only failed because a move led back above
+                #it on the path is not stored, as it may still be won once
+                #the search has left that position.
+                low = len(path)
+                if any_dist:
+                    low = lows.pop()
+                    del on_path[key]
+                    lows[-1] = min(lows[-1], low)
+                if low >= len(path):
+                    table.store(key, bits.bit_count()-1)
+                bits = make(bits, path.pop())
+
+    return "unsolvable", None, report()
+
+
+def solve_stats(table=None):
+    """
+    Makes the counters a solve fills in as it searches.
+
+    nodes : positions searched.
+    seconds, nps : time taken so far and positions searched per second.
+    depth, max_depth : moves made from the root to the position being
+        searched, now and at most.
+    histogram : number of positions searched at each depth, counting the
+        root as depth 0.
+    table : the counters of the transposition table, see TransTable.stats.
+
+    Parameters
+    ----------
+    table : TransTable, optional
+        The table used by the solve. The default is None.
+
+    Returns
+    -------
+    stats : dict
+        The counters, all starting at zero.
+
+    """
+    return {"nodes": 0, "seconds": 0.0, "nps": 0.0, "depth": 0,
+            "max_depth": 0, "histogram": [1],
+            "table": table.stats() if table is not None else {}}
+
+
+def format_stats(stats):
+    """
+    Writes the counters of a solve as a few lines of text.
+
+    Parameters
+    ----------
+    stats : dict
+        The counters returned by a solve.
+
+    Returns
+    -------
+    text : str
+        The counters, one group to a line.
+
+    """
+    lines = [f"{stats['nodes']} positions searched in "
+             f"{stats.get('seconds', 0):.2f}s "
+             f"({stats.get('nps', 0):,.0f} per second)",
+             f"Depth {stats.get('depth', 0)}, deepest "
+             f"{stats.get('max_depth', 0)}"]
+    table = stats.get("table")
+    if table:
+        lines.append(f"Table: {table['hits']} hits, {table['misses']} "
+                     f"misses, {table['evictions']} evictions, "
+                     f"{table['used']}/{table['slots']} slots used")
+    cuts = dict(stats.get("pruned", {}))
+    if "oracle_cuts" in stats:
+        cuts["oracle"] = stats["oracle_cuts"]
+    if cuts:
+        lines.append("Cut: " + ", ".join(f"{count} by {name}"
+                                         for name, count in cuts.items()))
+    if stats.get("histogram"):
+        lines.append("Positions by depth: " +
+                     " ".join(map(str, stats["histogram"])))
+    return "\n".join(lines)
+
+
+def profile_solve(solve, *args, cpu=True, memory=False, top=15, **kwargs):
+    """
+    Runs a solve under cProfile, tracemalloc or both and prints what they
+    find. Both slow the solve down, so they are only used when asked for.
+
+    Parameters
+    ----------
+    solve : function
+        The solver to run, e.g. dfs_solve.
+    *args
+        Passed on to the solver.
+    cpu : bool, optional
+        Whether to profile where the time goes. The default is True.
+    memory : bool, optional
+        Whether to trace where memory is allocated. The default is False.
+    top : int, optional
+        Number of functions or lines to print. The default is 15.
+    **kwargs
+        Passed on to the solver.
+
+    Returns
+    -------
+    result : tuple
+        Whatever the solver returned.
+    report : dict
+        The pstats.Stats of the run if cpu is True, and the peak traced
+        memory in bytes with the tracemalloc snapshot if memory is True.
+
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    report = {}
+    profiler = cProfile.Profile() if cpu else None
+    if memory:
+        tracemalloc.start()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = solve(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        if memory:
+            report["snapshot"] = tracemalloc.take_snapshot()
+            report["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        if memory:
+            tracemalloc.stop()
+
+    if profiler is not None:
+        report["profile"] = pstats.Stats(profiler).sort_stats("cumulative")
+        report["profile"].print_stats(top)
+    if memory:
+        print(f"Peak memory traced: {report['peak_bytes']/2**20:.1f} MB")
+        for line in report["snapshot"].statistics("lineno")[:top]:
+            print(line)
+    return result, report
+
+
+#Stores the pruning rules of each layout once they have been built.
+PRUNE_RULES = {}
+
+
+def prune_rules(layout):
+    """
+    Builds the tests used to cut positions that can never be won without
+    searching them. Each one is worked out from the jump table of the layout
+    and checked against every jump, so a rule that does not hold on a board
+    is left out rather than cutting positions that could be won.
+
+    pagoda : weights that no jump can increase the total of, so a position
+        weighing less than the single peg in the middle cannot be won. One
+        set of weights falls away from the middle hole like the Fibonacci
+        numbers, the other only counts the holes a peg in the middle could
+        have come from.
+    resource : every jump empties at most one corner or edge hole, so a
+        position with more pegs in them than moves left cannot be won.
+    class : the number of pegs on each third of the diagonals changes
+        parity together on every jump, so the parities have to match those
+        of the middle peg.
+
+    Parameters
+    ----------
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    rules : list
+        A (name, test) pair for each rule, where test(bits) is True if the
+        position can be cut.
+
+    """
+    if layout in PRUNE_RULES:
+        return PRUNE_RULES[layout]
+    goal = layout.coords[layout.goal.bit_length()-1]
+    steps = layout.steps
+    rules = []
+
+    #Counts the fewest single steps from each hole to the middle.
+    dist = {goal: 0}
+    queue = [goal]
+    for row, col in queue:
+        for d_row, d_col in steps:
+            near = (row+d_row, col+d_col)
+            if near in layout.bits and near not in dist:
+                dist[near] = dist[(row, col)] + 1
+                queue.append(near)
+
+    #Weights each hole with a Fibonacci number that shrinks with the distance
+    #from the middle, so the two pegs a jump removes weigh at least as much
+    #as the one it adds.
+    fib = [1, 1]
+    while len(fib) <= max(dist.values()) + 1:
+        fib.append(fib[-1] + fib[-2])
+    top = len(fib) - 1
+    fib_weights = {layout.bits[hole]: fib[top-dist.get(hole, top)]
+                   for hole in layout.bits}
+
+    #Only holes lined up with the middle in both directions can hold the
+    #peg that finishes there.
+    lattice = {layout.bits[(row, col)]: int((row-goal[0]) % 2 == 0 and
+                                            (col-goal[1]) % 2 == 0)
+               for row, col in layout.bits}
+
+    for weights in (fib_weights, lattice):
+        if all(weights[frm] + weights[over] >= weights[to]
+               for frm, over, to in layout.jumps):
+            tables = [(shift, [sum(weights.get(shift+bit, 0)
+                                   for bit in range(8) if value >> bit & 1)
+                               for value in range(256)])
+                      for shift, table in layout.sym_tables]
+            target = weights[layout.bits[goal]]
+            rules.append(("pagoda", lambda bits, tables=tables,
+                          target=target: sum(
+                              table[bits >> shift & 255]
+                              for shift, table in tables) < target))
+
+    #Starts from every hole on the edge of the board and drops any that a
+    #jump can empty along with the hole it starts from, without filling
+    #another edge hole.
+    edge = {bit for bit, (row, col) in layout.coords.items()
+            if any((row+d_row, col+d_col) not in layout.bits
+                   for d_row, d_col in steps)}
+    changed = True
+    while changed:
+        changed = False
+        for frm, over, to in layout.jumps:
+            if frm in edge and over in edge and to not in edge:
+                edge.discard(over)
+                changed = True
+    edge_mask = sum(1 << bit for bit in edge)
+    spare = int(layout.goal & edge_mask != 0)
+    if edge_mask:
+        rules.append(("resource", lambda bits, mask=edge_mask, spare=spare:
+                      (bits & mask).bit_count() - spare >
+                      bits.bit_count() - 1))
+
+    #Splits the holes into three sets of diagonals for every direction that
+    #crosses the lines of jumps, as each jump takes a peg from every set.
+    classes = []
+    for a, b in ((1, 0), (0, 1), (1, 1), (1, 2)):
+        if all((a*d_row + b*d_col) % 3 for d_row, d_col in steps):
+            masks = [sum(1 << bit for bit, (row, col) in layout.coords.items()
+                         if (a*row + b*col) % 3 == k) for k in range(3)]
+            classes.append(masks)
+    if classes:
+        def parity(bits, classes=classes):
+            return [((bits & one).bit_count() + (bits & two).bit_count()) & 1
+                    for masks in classes
+                    for one, two in (masks[:2], masks[1:])]
+        wanted = parity(layout.goal)
+        rules.append(("class", lambda bits, wanted=wanted, parity=parity:
+                      parity(bits) != wanted))
+
+    PRUNE_RULES[layout] = rules
+    return rules
+
+
+def prune_reason(bits, rules):
+    """
+    Finds the first rule that cuts a position.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    rules : list
+        The (name, test) pairs returned by prune_rules.
+
+    Returns
+    -------
+    name : str
+        Name of the rule that cut the position, or None if it could still be
+        won.
+
+    """
+    for name, test in rules:
+        if test(bits):
+            return name
+    return None
+
+
+#How much each feature counts towards the score of a position by default.
+MOVE_WEIGHTS = {"centre": 1.0, "cluster": 1.0, "isolated": 2.0}
+
+
+class MoveOrder:
+    """
+    Scores positions on how promising they look, so the solver can try the
+    moves leading to the best ones first. A position scores higher when its
+    pegs are near the middle hole, when they sit next to each other and when
+    few of them are left with no peg beside them.
+
+    ...
+
+    Attributes
+    ----------
+    weights : dict
+        How much the "centre", "cluster" and "isolated" features count.
+    features : dict
+        The lookup tables built for each layout scored so far.
+
+    """
+    def __init__(self, weights=None):
+        """
+        Constructs a scorer with the weights given.
+
+        Parameters
+        ----------
+        weights : dict, optional
+            Weights replacing those of MOVE_WEIGHTS. The default is None,
+            which keeps MOVE_WEIGHTS.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.weights = dict(MOVE_WEIGHTS)
+        if weights:
+            unknown = set(weights) - set(MOVE_WEIGHTS)
+            if unknown:
+                raise ValueError(f"Unknown weights {sorted(unknown)}")
+            self.weights.update(weights)
+        self.features = {}
+
+    def tables(self, layout):
+        """
+        Builds the lookup tables of a layout the first time it is scored.
+
+        Parameters
+        ----------
+        layout : Layout
+            The bit mapping for the board.
+
+        Returns
+        -------
+        distance : list
+            A (shift, table) pair for each byte of the position, where the
+            table gives the total distance from the middle hole of the pegs
+            in that byte.
+        links : list
+            A (shift, mask) pair for each direction a peg can have a
+            neighbour in, where mask has the bit of every hole with a hole
+            beside it in that direction set.
+
+        """
+        if layout in self.features:
+            return self.features[layout]
+        goal = layout.coords[layout.goal.bit_length()-1]
+        far = {bit: abs(row-goal[0]) + abs(col-goal[1])
+               for bit, (row, col) in layout.coords.items()}
+        distance = [(shift, [sum(far.get(shift+bit, 0) for bit in range(8)
+                                 if value >> bit & 1)
+                             for value in range(256)])
+                    for shift, table in layout.sym_tables]
+        links = []
+        for d_row, d_col in layout.steps:
+            mask = 0
+            for bit, (row, col) in layout.coords.items():
+                if (row+d_row, col+d_col) in layout.bits:
+                    mask |= 1 << bit
+            links.append((d_row*layout.width + d_col, mask))
+        self.features[layout] = distance, links
+        return distance, links
+
+    def score(self, bits, layout):
+        """
+        Scores a position, higher being more promising.
+
+        Parameters
+        ----------
+        bits : int
+            Integer representing the position of the pegs.
+        layout : Layout
+            The bit mapping for the board.
+
+        Returns
+        -------
+        score : float
+            The weighted total of the features of the position.
+
+        """
+        distance, links = self.tables(layout)
+        spread = sum(table[bits >> shift & 255] for shift, table in distance)
+
+        #Finds the pegs with a peg beside them in each direction, counting
+        #each pair of neighbours twice.
+        pairs = 0
+        touching = 0
+        for shift, mask in links:
+            if shift > 0:
+                beside = bits & mask & (bits >> shift)
+            else:
+                beside = bits & mask & (bits << -shift)
+            pairs += beside.bit_count()
+            touching |= beside
+        alone = (bits & ~touching).bit_count()
+
+        return (-self.weights["centre"]*spread +
+                self.weights["cluster"]*pairs/2 -
+                self.weights["isolated"]*alone)
+
+    def __call__(self, bits, moves, layout):
+        """
+        Sorts the moves of a position so the one leading to the best scoring
+        position comes first, for use as the order of dfs_solve.
+
+        Parameters
+        ----------
+        bits : int
+            Integer representing the position of the pegs.
+        moves : list
+            The bit indexes of each legal move, as made by gen_moves or
+            ray_moves.
+        layout : Layout
+            The bit mapping for the board.
+
+        Returns
+        -------
+        moves : list
+            The same moves, best first.
+
+        """
+        return sorted(moves, key=lambda move:
+                      -self.score(apply_ray(bits, move), layout))
+
+
+def beam_solve(bits, layout, width=1000, order=None, prune=True):
+    """
+    Searches for a solution one move at a time, keeping only the best
+    scoring positions at each depth. Memory and time are bounded by the
+    width, but a solution can be missed if every line leading to one is
+    thrown away.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    width : int, optional
+        Most positions kept at each depth. The default is 1000.
+    order : MoveOrder, optional
+        Scorer used to rank the positions. The default is None, which uses
+        MoveOrder with the default weights.
+    prune : bool, optional
+        Whether to skip positions the rules of prune_rules show cannot be
+        won. The default is True.
+
+    Returns
+    -------
+    status : str
+        "solved", or "limit" if every position kept ran out of moves.
+    moves : list
+        The (from, over, to) bit indexes of each move of the solution, or None
+        if no solution was found.
+    stats : dict
+        The counters of the search, see solve_stats, where nodes counts the
+        positions scored and the histogram the positions kept at each depth.
+        The "pruned" counts are only there if prune is True.
+
+    """
+    if width < 1:
+        raise ValueError("Beam width must be at least 1")
+    if order is None:
+        order = MoveOrder()
+    rules = prune_rules(layout) if prune else []
+    stats = solve_stats()
+    if prune:
+        stats["pruned"] = {name: 0 for name, test in rules}
+    start = time.perf_counter()
+
+    #Each entry of a level is (position, index of its parent in the level
+    #above, move from the parent), so the solution can be traced back.
+    levels = [[(bits, None, None)]]
+    while levels[-1]:
+        for index, (bits, parent, move) in enumerate(levels[-1]):
+            if has_won(bits, layout):
+                path = []
+                for level in reversed(levels):
+                    bits, index, move = level[index]
+                    if move is not None:
+                        path.append(move)
+                stats["seconds"] = time.perf_counter() - start
+                stats["nps"] = stats["nodes"] / stats["seconds"]
+                return "solved", path[::-1], stats
+
+        #Scores every new position once, however many of its rotations and
+        #reflections are reached.
+        children = {}
+        for index, (bits, parent, move) in enumerate(levels[-1]):
+            for move in gen_moves(bits, layout):
+                child = apply_move(bits, move)
+                key = canonical(child, layout)
+                if key in children:
+                    continue
+                reason = prune_reason(child, rules)
+                if reason is not None:
+                    stats["pruned"][reason] += 1
+                    continue
+                stats["nodes"] += 1
+                children[key] = (order.score(child, layout), key,
+                                 (child, index, move))
+        best = sorted(children.values(), key=lambda entry: entry[:2],
+                      reverse=True)[:width]
+        levels.append([entry[2] for entry in best])
+        if best:
+            stats["depth"] = stats["max_depth"] = len(levels) - 1
+            stats["histogram"].append(len(best))
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["nps"] = stats["nodes"] / stats["seconds"]
+    return "limit", None, stats
+
+
+def move_hints(bits, layout, oracle=None, table=None, seconds=0.01,
+               any_dist=False, order=None, wins=None, frontier=None):
+    """
+    Rates every legal move of a position by whether the game can still be
+    won after it, and by how many of the moves after that keep it winnable.
+    With an oracle every answer is a lookup. Without one, positions already
+    known to be won or lost are looked up, and the other moves share a short
+    search, which usually runs out before it has an answer except near the
+    end of a game, so those moves are reported as unknown and their moves
+    after are not counted.
+
+    Parameters
+    ----------
+    bits : int
+        Integer representing the position of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+    oracle : Oracle, optional
+        Used to look up whether positions can be won. The default is None.
+    table : TransTable, optional
+        Dead-ends found by earlier searches, which are kept so hints get
+        quicker as the game goes on. The default is None, which creates a
+        new table.
+    seconds : float, optional
+        Time allowed for searching the moves that cannot be looked up, split
+        evenly between them. The default is 0.01.
+    any_dist : bool, optional
+        Whether pegs can move any distance, see dfs_solve. The oracle and
+        frontier are not used if so. The default is False.
+    order : MoveOrder, optional
+        Move ordering kept between hints, so its tables are only built once.
+        The default is None, which creates a new one.
+    wins : set, optional
+        Canonical integers of positions known to be winnable. Every position
+        on a solution found is added, so later hints along it are lookups.
+        The default is None, which creates a new set.
+    frontier : GoalFrontier, optional
+        The winnable positions with few pegs, found back from the goal.
+        Positions with no more pegs than it holds are looked up in it, and
+        the searches stop as soon as they reach it. The default is None.
+
+    Returns
+    -------
+    hints : list
+        A dict for each legal move with the move, whether the game can still
+        be won after it (None if that is unknown, as the search ran out of
+        time first) and the number of moves after it that keep the game
+        winnable (None without an oracle), best moves first.
+
+    """
+    if any_dist:
+        oracle = frontier = None
+    if table is None:
+        table = TransTable(1)
+    if order is None:
+        order = MoveOrder()
+    if wins is None:
+        wins = set()
+    generate = ray_moves if any_dist else gen_moves
+    make = apply_ray if any_dist else apply_move
+
+    #Builds the tables the searches use before the time starts.
+    order.tables(layout)
+    if not any_dist:
+        prune_rules(layout)
+
+    def lookup(child):
+        if has_won(child, layout):
+            return True
+        if oracle is not None:
+            return oracle.winnable(child)
+        key = canonical(child, layout)
+        if key in wins:
+            return True
+        if frontier is not None and child.bit_count() <= frontier.pegs:
+            return frontier.winnable(child)
+        if key in table:
+            return False
+        return None
+
+    def search(child, until):
+        status, moves, _ = dfs_solve(
+            child, layout, order=order, table=table,
+            progress=lambda stats: time.perf_counter() > until, every=16,
+            oracle=frontier, prune=not any_dist, any_dist=any_dist)
+        if status == "solved":
+            #Remembers every position on the solution as winnable.
+            wins.add(canonical(child, layout))
+            for move in moves:
+                child = make(child, move)
+                wins.add(canonical(child, layout))
+        return {"solved": True, "unsolvable": False}.get(status)
+
+    deadline = time.perf_counter() + seconds
+    hints = []
+    unknown = []
+    for move in generate(bits, layout):
+        child = make(bits, move)
+        won = lookup(child)
+        replies = None
+        if won and oracle is not None:
+            replies = sum(lookup(make(child, reply))
+                          for reply in generate(child, layout))
+        hints.append({"move": move, "winnable": won,
+                      "continuations": replies})
+        if won is None:
+            unknown.append((hints[-1], child))
+
+    #Each move left gets an even share of the time that is left, so a move
+    #answered quickly leaves more time for the rest.
+    for left, (entry, child) in zip(range(len(unknown), 0, -1), unknown):
+        now = time.perf_counter()
+        if now < deadline:
+            entry["winnable"] = search(child, now + (deadline-now)/left)
+    if any(entry["winnable"] for entry in hints):
+        wins.add(canonical(bits, layout))
+
+    #Winnable moves come first, then the ones not yet known, then losing
+    #ones, with the moves leaving the most ways to win first.
+    rank = {True: 0, None: 1, False: 2}
+    hints.sort(key=lambda hint: (rank[hint["winnable"]],
+                                 -(hint["continuations"] or 0)))
+    return hints
@@ -0,0 +1,112 @@
+"""
+Move generation over many positions at once with numpy.
+
+"""
+import numpy as np
+
+
+def to_array(positions, layout):
+    """
+    Converts integer positions into rows of an array, with one column per
+    hole in the order of layout.holes.
+
+    Parameters
+    ----------
+    positions : iterable
+        Integers representing positions of the pegs.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    array : numpy.ndarray
+        A (positions, holes) array of uint8, with 1 for every peg.
+
+    """
+    positions = list(positions)
+    array = np.zeros((len(positions), len(layout.holes)), dtype=np.uint8)
+    for row, bits in enumerate(positions):
+        for col, bit in enumerate(layout.holes):
+            array[row, col] = bits >> bit & 1
+    return array
+
+
+def from_array(array, layout):
+    """
+    Converts rows of an array made by to_array back into integer positions.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        A (positions, holes) array with 1 for every peg.
+    layout : Layout
+        The bit mapping for the board.
+
+    Returns
+    -------
+    positions : list
+        Integers representing the positions of the pegs.
+
+    """
+    return [sum(1 << bit for bit, peg in zip(layout.holes, row) if peg)
+            for row in array.tolist()]
+
+
+def batch_moves(positions, layout, packed=False):
+    """
+    Finds the moves of many positions at once, checking every jump of the
+    table against every position as whole columns of an array.
+
+    Parameters
+    ----------
+    positions : numpy.ndarray
+        A (positions, holes) array with 1 for every peg, with the holes in the
+        order of layout.holes, or the same array packed with numpy.packbits
+        along its rows if packed is True.
+    layout : Layout
+        The bit mapping for the board.
+    packed : bool, optional
+        True if the positions, and the successors returned, are packed eight
+        holes to a byte. The default is False.
+
+    Returns
+    -------
+    move_count : numpy.ndarray
+        Number of moves available for each position.
+    legal : numpy.ndarray
+        A (positions, jumps) array of bool, True where the jump of that
+        column of layout.hole_jumps can be made.
+    successors : numpy.ndarray
+        The position after every legal move, one per row, in the same form
+        as the positions given.
+    parents : numpy.ndarray
+        The row of positions each successor was made from.
+    jumps : numpy.ndarray
+        The row of layout.hole_jumps each successor was made with.
+
+    """
+    holes = len(layout.holes)
+    if packed:
+        positions = np.unpackbits(positions, axis=1, count=holes)
+    positions = np.asarray(positions, dtype=np.uint8)
+    frm, over, to = np.asarray(layout.hole_jumps, dtype=np.intp).reshape(
+        -1, 3).T
+
+    #A jump can be made where there is a peg to move, a peg to jump over and
+    #an empty hole to land in.
+    legal = ((positions[:, frm] & positions[:, over] & ~positions[:, to] & 1)
+             .astype(bool))
+    move_count = legal.sum(axis=1)
+
+    #Copies each parent position once per legal move and flips the three
+    #holes of the move.
+    parents, jumps = np.nonzero(legal)
+    successors = positions[parents]
+    rows = np.arange(len(parents))
+    successors[rows, frm[jumps]] = 0
+    successors[rows, over[jumps]] = 0
+    successors[rows, to[jumps]] = 1
+
+    if packed:
+        successors = np.packbits(successors, axis=1)
+    return move_count, legal, successors, parents, jumps
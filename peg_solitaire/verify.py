@@ -0,0 +1,265 @@
+"""
+Checking archives of solutions, one game per line, without holding more
+than a few thousand games in memory at once.
+
+"""
+import json
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .boards import get_layout, has_won
+
+
+#The layout and starting position of the games a verifying worker checks.
+VERIFIER = {}
+
+
+def verify_game(text, layout, bits=None):
+    """
+    Replays one game on the integer engine, stopping at the first move that
+    cannot be made.
+
+    Parameters
+    ----------
+    text : str
+        The comma separated moves of the game, e.g. b4d4,c6c4.
+    layout : Layout
+        The bit mapping for the board.
+    bits : int, optional
+        Position the game starts from. The default is None, which uses the
+        starting position.
+
+    Returns
+    -------
+    result : dict
+        The verdict, "valid" if the game is won, "incomplete" if every move
+        can be made but more than the goal peg is left, or "invalid" with
+        the step, move and reason it failed at. Also holds the number of
+        moves made and pegs left.
+
+    """
+    if bits is None:
+        bits = layout.start
+    made = 0
+    for step, word in enumerate(text.split(","), 1):
+        word = word.strip().lower()
+        if not word:
+            continue
+        index = layout.jump_names.get(word)
+        reason = None
+        if index is None:
+            if re.fullmatch(r"[a-z][0-9]+[a-z][0-9]+", word) is None:
+                reason = "badly written"
+            else:
+                reason = "not a jump on this board"
+        else:
+            from_over, to = layout.jump_checks[index]
+            if not bits >> layout.jumps[index][0] & 1:
+                reason = "no peg to move"
+            elif bits & from_over != from_over:
+                reason = "no peg to jump over"
+            elif bits & to:
+                reason = "the landing hole is not empty"
+        if reason is not None:
+            return {"verdict": "invalid", "step": step, "move": word,
+                    "reason": reason, "moves": made,
+                    "pegs": bits.bit_count()}
+        bits ^= from_over | to
+        made += 1
+
+    return {"verdict": "valid" if has_won(bits, layout) else "incomplete",
+            "moves": made, "pegs": bits.bit_count()}
+
+
+def verify_lines(lines, layout, bits=None, first=1):
+    """
+    Checks each game of an archive in turn, yielding the verdicts as they
+    are found.
+
+    Parameters
+    ----------
+    lines : iterable
+        One game per line. Blank lines are skipped.
+    layout : Layout
+        The bit mapping for the board.
+    bits : int, optional
+        Position every game starts from. The default is None, which uses the
+        starting position.
+    first : int, optional
+        Line number of the first line. The default is 1.
+
+    Yields
+    ------
+    result : dict
+        The line number of the game followed by its verdict from
+        verify_game.
+
+    """
+    for line, text in enumerate(lines, first):
+        if text.strip():
+            yield {"line": line, **verify_game(text, layout, bits)}
+
+
+def init_verifier(layout, bits):
+    """
+    Stores what every game is checked against in a worker process, so it is
+    sent to each worker once rather than with every chunk of games.
+
+    Parameters
+    ----------
+    layout : Layout
+        The bit mapping for the board.
+    bits : int
+        Position every game starts from, or None for the start.
+
+    Returns
+    -------
+    None.
+
+    """
+    VERIFIER["layout"] = layout
+    VERIFIER["bits"] = bits
+
+
+def verify_chunk(first, lines):
+    """
+    Checks a chunk of games in a worker process.
+
+    Parameters
+    ----------
+    first : int
+        Line number of the first game of the chunk.
+    lines : list
+        One game per line.
+
+    Returns
+    -------
+    results : list
+        The verdict of each game, see verify_lines.
+
+    """
+    return list(verify_lines(lines, VERIFIER["layout"], VERIFIER["bits"],
+                             first))
+
+
+def verify_stream(lines, layout, bits=None, workers=1, chunk=2000):
+    """
+    Checks every game of an archive, spreading them over worker processes
+    in chunks. Only a couple of chunks per worker are read ahead, so memory
+    use stays the same however long the archive is, and the verdicts come
+    out in the order of the games.
+
+    Parameters
+    ----------
+    lines : iterable
+        One game per line. Blank lines are skipped.
+    layout : Layout
+        The bit mapping for the board.
+    bits : int, optional
+        Position every game starts from. The default is None, which uses the
+        starting position.
+    workers : int, optional
+        Number of processes to check games in. The default is 1, which
+        checks them in this process.
+    chunk : int, optional
+        Number of lines sent to a worker at a time. The default is 2000.
+
+    Yields
+    ------
+    result : dict
+        The line number and verdict of each game, see verify_lines.
+
+    """
+    if workers <= 1:
+        yield from verify_lines(lines, layout, bits)
+        return
+
+    lines = iter(lines)
+    line = 1
+    pending = deque()
+    with ProcessPoolExecutor(workers, initializer=init_verifier,
+                             initargs=(layout, bits)) as pool:
+        while True:
+            #Keeps two chunks queued for every worker.
+            while len(pending) < 2*workers:
+                block = list(islice(lines, chunk))
+                if not block:
+                    break
+                pending.append(pool.submit(verify_chunk, line, block))
+                line += len(block)
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def verdict_text(result):
+    """
+    Writes the verdict of a game as a line of text.
+
+    Parameters
+    ----------
+    result : dict
+        The verdict from verify_lines.
+
+    Returns
+    -------
+    text : str
+        e.g. line 2: invalid at step 3 (sdfsf), badly written.
+
+    """
+    if result["verdict"] == "valid":
+        return f"line {result['line']}: valid, {result['moves']} moves"
+    if result["verdict"] == "incomplete":
+        return (f"line {result['line']}: incomplete after {result['moves']} "
+                f"moves, {result['pegs']} pegs left")
+    return (f"line {result['line']}: invalid at step {result['step']} "
+            f"({result['move']}), {result['reason']}")
+
+
+def verify_file(path, out=None, layout=None, bits=None, form="json",
+                **kwargs):
+    """
+    Checks every game of an archive file, one per line as in
+    full_solution.txt, writing each verdict as soon as it is found.
+
+    Parameters
+    ----------
+    path : str
+        The archive, or "-" to read standard input.
+    out : file, optional
+        Where the verdicts are written. The default is None, which uses
+        standard output.
+    layout : Layout, optional
+        The bit mapping for the board. The default is None, which uses the
+        current board.
+    bits : int, optional
+        Position every game starts from. The default is None, which uses the
+        starting position.
+    form : str, optional
+        "json" for a line of JSON per game or "text" for verdict_text. The
+        default is "json".
+    **kwargs
+        Passed on to verify_stream.
+
+    Returns
+    -------
+    counts : dict
+        Number of games given each verdict.
+
+    """
+    out = out or sys.stdout
+    layout = layout or get_layout()
+    counts = {"valid": 0, "incomplete": 0, "invalid": 0}
+    lines = sys.stdin if path == "-" else open(path)
+    try:
+        for result in verify_stream(lines, layout, bits, **kwargs):
+            counts[result["verdict"]] += 1
+            out.write((json.dumps(result) if form == "json" else
+                       verdict_text(result)) + "\n")
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    return counts